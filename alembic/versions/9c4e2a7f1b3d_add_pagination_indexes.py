@@ -0,0 +1,56 @@
+"""add pagination indexes
+
+Revision ID: 9c4e2a7f1b3d
+Revises: 55fabcab3130
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2a7f1b3d'
+down_revision: Union[str, Sequence[str], None] = '55fabcab3130'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_answers_question_id_created_at_id',
+            'answers',
+            ['question_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_questions_created_at_id',
+            'questions',
+            ['created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_questions_created_at_id',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_answers_question_id_created_at_id',
+            table_name='answers',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,65 @@
+"""add outbox tasks
+
+Revision ID: a3c8e6f05d17
+Revises: f7d1a5e94b23
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e6f05d17'
+down_revision: Union[str, Sequence[str], None] = 'f7d1a5e94b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'outbox_tasks',
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('key', sa.String(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column(
+            'available_at',
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('dead_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column(
+            'created_at',
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_outbox_tasks_key_id',
+        'outbox_tasks',
+        ['key', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_outbox_tasks_available_at',
+        'outbox_tasks',
+        ['available_at'],
+        unique=False,
+        postgresql_where=sa.text('dead_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_tasks_available_at', table_name='outbox_tasks')
+    op.drop_index('ix_outbox_tasks_key_id', table_name='outbox_tasks')
+    op.drop_table('outbox_tasks')
@@ -0,0 +1,84 @@
+"""add question answer counters
+
+Revision ID: d4a8f2c61e90
+Revises: b71d3e9a4c52
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f2c61e90'
+down_revision: Union[str, Sequence[str], None] = 'b71d3e9a4c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'questions',
+        sa.Column('answer_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'questions',
+        sa.Column('last_answer_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+    # Начальное заполнение; последующий дрейф чинит reconcile.py
+    op.execute(
+        """
+        UPDATE questions AS q
+        SET answer_count = a.answer_count,
+            last_answer_at = a.last_answer_at
+        FROM (
+            SELECT question_id,
+                   count(*) AS answer_count,
+                   max(created_at) AS last_answer_at
+            FROM answers
+            GROUP BY question_id
+        ) AS a
+        WHERE a.question_id = q.id
+        """
+    )
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_answer_count_id',
+            'questions',
+            ['answer_count', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_questions_last_answer_at_id',
+            'questions',
+            ['last_answer_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_questions_last_answer_at_id',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            'ix_questions_answer_count_id',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('questions', 'last_answer_at')
+    op.drop_column('questions', 'answer_count')
@@ -0,0 +1,93 @@
+"""add search vectors
+
+Revision ID: e5b9c3d72fa1
+Revises: d4a8f2c61e90
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b9c3d72fa1'
+down_revision: Union[str, Sequence[str], None] = 'd4a8f2c61e90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Должна совпадать с core.models.search.SEARCH_CONFIG
+SEARCH_CONFIG = 'simple'
+TABLES = ('questions', 'answers')
+# Строк за одну транзакцию заполнения: блокировки короткие, WAL растёт ровно
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колонка без значения по умолчанию — изменение только в каталоге, без
+    # переписывания таблицы; новые и изменённые строки заполняет триггер
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        op.execute(
+            f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := to_tsvector('{SEARCH_CONFIG}', NEW.text);
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        op.execute(
+            f"""
+            CREATE OR REPLACE TRIGGER {table}_search_vector_update
+            BEFORE INSERT OR UPDATE OF text ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()
+            """
+        )
+
+    # Старые строки — пачками по id, каждая пачка в своей транзакции
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        for table in TABLES:
+            max_id = connection.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar()
+            for start in range(0, max_id or 0, BACKFILL_BATCH_SIZE):
+                connection.execute(
+                    sa.text(
+                        f"UPDATE {table} "
+                        f"SET search_vector = to_tsvector('{SEARCH_CONFIG}', text) "
+                        f"WHERE id > :start AND id <= :end AND search_vector IS NULL"
+                    ),
+                    {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+                )
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(
+                f'ix_{table}_search_vector',
+                table,
+                ['search_vector'],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.drop_index(
+                f'ix_{table}_search_vector',
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_search_vector_update ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_search_vector_update()")
+        op.drop_column(table, 'search_vector')
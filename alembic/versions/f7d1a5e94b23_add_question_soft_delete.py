@@ -0,0 +1,50 @@
+"""add question soft delete
+
+Revision ID: f7d1a5e94b23
+Revises: e5b9c3d72fa1
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7d1a5e94b23'
+down_revision: Union[str, Sequence[str], None] = 'e5b9c3d72fa1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'questions',
+        sa.Column('deleted_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_questions_deleted_at',
+            'questions',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=sa.text('deleted_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_questions_deleted_at',
+            table_name='questions',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('questions', 'deleted_at')
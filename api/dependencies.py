@@ -1,8 +1,59 @@
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import Depends
+from fastapi import Body, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_session
+from core.config import settings
+from core.database import get_read_session, get_session
+from core.pagination import PageParams
 
-db_session = Annotated[AsyncSession, Depends(get_session)]
\ No newline at end of file
+db_session = Annotated[AsyncSession, Depends(get_session)]
+read_db_session = Annotated[AsyncSession, Depends(get_read_session)]
+# Сессия закрывается сразу после эндпоинта, а не после ответа: для долгих потоков
+short_read_db_session = Annotated[
+    AsyncSession,
+    Depends(get_read_session, scope="function"),
+]
+
+
+async def get_page_params(
+    limit: Annotated[
+        int,
+        Query(ge=1, le=settings.pagination.max_limit),
+    ] = settings.pagination.default_limit,
+    cursor: str | None = None,
+) -> PageParams:
+    return PageParams(limit=limit, cursor=cursor)
+
+
+page_params = Annotated[PageParams, Depends(get_page_params)]
+
+# Элементы не проверяются здесь: не-объект — ошибка своего индекса, а не 422 всей пачки
+bulk_items = Annotated[
+    list[Any],
+    Body(min_length=1, max_length=settings.bulk.max_batch_size),
+]
+
+
+async def get_batch_ids(
+    ids: Annotated[list[str], Query(min_length=1)],
+) -> list[int]:
+    # Принимаем и ids=1,2,3, и ids=1&ids=2; порядок сохраняется, повторы убираются
+    try:
+        parsed = [int(part) for value in ids for part in value.split(",") if part]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="ids must be integers",
+        )
+
+    unique_ids = list(dict.fromkeys(parsed))
+    if not 1 <= len(unique_ids) <= settings.bulk.max_get_ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Expected from 1 to {settings.bulk.max_get_ids} ids",
+        )
+    return unique_ids
+
+
+batch_ids = Annotated[list[int], Depends(get_batch_ids)]
@@ -0,0 +1,38 @@
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """JSON-ответ, который сериализует pydantic-модели сразу в байты.
+
+    FastAPI для возвращённой модели сначала строит dict через
+    ``model_dump`` и только потом кодирует его в JSON. Здесь сериализатор
+    pydantic-core проходит по модели один раз.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
+
+
+def json_response(
+    content: Any,
+    response: Response | None = None,
+    status_code: int = 200,
+) -> PydanticJSONResponse:
+    """Оборачивает готовую модель в ответ, минуя сериализацию FastAPI.
+
+    Возвращённый из эндпоинта Response отдаётся как есть, поэтому заголовки
+    и куки, выставленные на ``response`` (ETag, закрепление за primary),
+    переносятся вручную.
+    """
+    json = PydanticJSONResponse(content, status_code=status_code)
+    if response is not None:
+        json.raw_headers.extend(
+            (name, value)
+            for name, value in response.raw_headers
+            if name != b"content-length"
+        )
+    return json
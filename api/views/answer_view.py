@@ -1,32 +1,141 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
+from api.conditional import conditional_response, make_etag
 from core.services.answer_service import AnswerService
-from api.dependencies import db_session
+from api.dependencies import (
+    batch_ids,
+    bulk_items,
+    db_session,
+    page_params,
+    read_db_session,
+)
+from api.responses import json_response
+from core.config import settings
+from core.schemas.batch_schema import BatchDeleteResult, BatchResult
+from core.schemas.bulk_schema import BulkResult
 from core.schemas.answer_schema import AnswerSchema, CreateAnswerSchema
+from core.schemas.page_schema import Page
 
 router = APIRouter(prefix="/api", tags=["Answer CRUD"])
 
 
-@router.post("/questions/{question_id}/answers/")
+@router.post("/questions/{question_id}/answers/", response_model=AnswerSchema)
 async def create_answer(
     question_id: int,
     answer_data: CreateAnswerSchema,
+    response: Response,
     session: db_session,
-) -> AnswerSchema:
+) -> Response:
     answer_service = AnswerService(session=session)
-    return await answer_service.create_answer(
+    await answer_service.check_question(question_id=question_id)
+    if settings.write_batch.enabled:
+        # Ответ пишет соединение пачки: соединение запроса отдаём в пул
+        # до ожидания, иначе одна запись держала бы два соединения
+        await session.close()
+    answer = await answer_service.add_answer(
         question_id=question_id,
         answer_data=answer_data,
     )
+    return json_response(answer, response)
 
 
-@router.get("/answers/{answer_id}")
+@router.post(
+    "/questions/{question_id}/answers/bulk",
+    response_model=BulkResult[AnswerSchema],
+)
+async def create_answers(
+    question_id: int,
+    answers_data: bulk_items,
+    response: Response,
+    session: db_session,
+) -> Response:
+    answer_service = AnswerService(session=session)
+    result = await answer_service.create_answers(
+        question_id=question_id,
+        answers_data=answers_data,
+    )
+    return json_response(result, response)
+
+
+@router.get("/questions/{question_id}/answers/", response_model=Page[AnswerSchema])
+async def get_answers(
+    question_id: int,
+    request: Request,
+    response: Response,
+    session: read_db_session,
+    page: page_params,
+) -> Response:
+    answer_service = AnswerService(session=session)
+    answers = await answer_service.get_answers(
+        question_id=question_id,
+        limit=page.limit,
+        cursor=page.cursor,
+    )
+    # Ответы не изменяются, поэтому странице достаточно списка id и курсоров
+    etag = make_etag(
+        "answers",
+        question_id,
+        *(answer.id for answer in answers.items),
+        answers.next_cursor,
+        answers.prev_cursor,
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return json_response(answers, response)
+
+
+# Объявлен раньше /answers/{answer_id}, иначе "batch" попадёт в {answer_id}
+@router.get("/answers/batch", response_model=BatchResult[AnswerSchema])
+async def get_answers_batch(
+    ids: batch_ids,
+    request: Request,
+    response: Response,
+    session: read_db_session,
+) -> Response:
+    answer_service = AnswerService(session=session)
+    result = await answer_service.get_answers_batch(ids=ids)
+    # Ответы не изменяются: достаточно списков найденных и отсутствующих id
+    etag = make_etag(
+        "answers-batch",
+        *(answer.id for answer in result.items),
+        "missing",
+        *result.missing,
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return json_response(result, response)
+
+
+@router.get("/answers/{answer_id}", response_model=AnswerSchema)
 async def get_answer(
     answer_id: int,
+    request: Request,
+    response: Response,
+    session: read_db_session,
+) -> Response:
+    answer_service = AnswerService(session=session)
+    answer = await answer_service.get_answer(answer_id=answer_id)
+    not_modified = conditional_response(
+        request,
+        response,
+        make_etag("answer", answer.id),
+        last_modified=answer.created_at,
+    )
+    if not_modified is not None:
+        return not_modified
+    return json_response(answer, response)
+
+
+# Объявлен раньше /answers/{answer_id}, иначе "batch" попадёт в {answer_id}
+@router.delete("/answers/batch", response_model=BatchDeleteResult)
+async def delete_answers(
+    ids: batch_ids,
+    response: Response,
     session: db_session,
-) -> AnswerSchema:
+) -> Response:
     answer_service = AnswerService(session=session)
-    return await answer_service.get_answer(answer_id=answer_id)
+    result = await answer_service.delete_answers(ids=ids)
+    return json_response(result, response)
 
 
 @router.delete("/answers/{answer_id}")
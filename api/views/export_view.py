@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import read_db_session
+from core.services.export_service import ExportService
+
+router = APIRouter(prefix="/api", tags=["Export"])
+
+
+@router.get("/export/questions")
+async def export_questions(
+    session: read_db_session,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> StreamingResponse:
+    export_service = ExportService(session=session)
+    return StreamingResponse(
+        export_service.export_questions(
+            created_from=created_from,
+            created_to=created_to,
+        ),
+        media_type="application/x-ndjson",
+    )
@@ -1,41 +1,162 @@
-from fastapi import APIRouter
+from typing import Annotated
 
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
-from api.dependencies import db_session
+from api.conditional import conditional_response, make_etag
+from api.dependencies import (
+    batch_ids,
+    bulk_items,
+    db_session,
+    page_params,
+    read_db_session,
+    short_read_db_session,
+)
+from api.responses import json_response
+from core.config import settings
+from core.schemas.batch_schema import BatchDeleteResult, BatchResult
+from core.schemas.bulk_schema import BulkResult
+from core.schemas.page_schema import Page
 from core.schemas.question_schema import (
     QuestionSchema,
     CreateQuestionSchema,
+    QuestionPreviewSchema,
     QuestionSchemaWithAnswers,
+    QuestionSort,
 )
+from core.pubsub import broker
 from core.services.question_service import QuestionService
+from core.services.stream_service import StreamService
 
 router = APIRouter(prefix="/api", tags=["Question CRUD"])
 
 
-@router.get("/questions/")
+@router.get("/questions/", response_model=Page[QuestionSchema])
 async def get_questions(
-    session: db_session,
-) -> list[QuestionSchema]:
+    request: Request,
+    response: Response,
+    session: read_db_session,
+    page: page_params,
+    sort: QuestionSort = "created_at",
+) -> Response:
     question_service = QuestionService(session=session)
-    return await question_service.get_questions()
+    questions = await question_service.get_questions(
+        limit=page.limit,
+        cursor=page.cursor,
+        sort=sort,
+    )
+    etag = make_etag(
+        "questions",
+        *(f"{question.id}.{question.version}" for question in questions.items),
+        questions.next_cursor,
+        questions.prev_cursor,
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return json_response(questions, response)
 
 
-@router.post("/questions/")
+@router.post("/questions/", response_model=QuestionSchema)
 async def create_question(
     question_data: CreateQuestionSchema,
+    response: Response,
+    session: db_session,
+) -> Response:
+    question_service = QuestionService(session=session)
+    question = await question_service.create_question(question_data=question_data)
+    return json_response(question, response)
+
+
+@router.post("/questions/bulk", response_model=BulkResult[QuestionSchema])
+async def create_questions(
+    questions_data: bulk_items,
+    response: Response,
     session: db_session,
-) -> QuestionSchema:
+) -> Response:
     question_service = QuestionService(session=session)
-    return await question_service.create_question(question_data=question_data)
+    result = await question_service.create_questions(questions_data=questions_data)
+    return json_response(result, response)
+
 
+# Объявлен раньше /questions/{id}, иначе "batch" попадёт в {id}
+@router.get("/questions/batch", response_model=BatchResult[QuestionPreviewSchema])
+async def get_questions_batch(
+    ids: batch_ids,
+    request: Request,
+    response: Response,
+    session: read_db_session,
+    preview: Annotated[
+        int,
+        Query(ge=0, le=settings.pagination.answers_preview_limit),
+    ] = 0,
+) -> Response:
+    question_service = QuestionService(session=session)
+    result = await question_service.get_questions_batch(ids=ids, preview=preview)
+    # Любое изменение ответов вопроса поднимает его версию
+    etag = make_etag(
+        "questions-batch",
+        preview,
+        *(f"{question.id}.{question.version}" for question in result.items),
+        "missing",
+        *result.missing,
+    )
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+    return json_response(result, response)
 
-@router.get("/questions/{id}")
+
+@router.get("/questions/{id}", response_model=QuestionSchemaWithAnswers)
 async def get_question(
     id: int,
+    request: Request,
+    response: Response,
+    session: read_db_session,
+) -> Response:
+    question_service = QuestionService(session=session)
+
+    # Сверяем версию до загрузки ответов: на 304 они не нужны
+    version = await question_service.get_question_version(question_id=id)
+    etag = make_etag("question", id, version)
+    if (not_modified := conditional_response(request, response, etag)) is not None:
+        return not_modified
+
+    question = await question_service.get_question(question_id=id)
+    response.headers["ETag"] = make_etag("question", id, question.version)
+    return json_response(question, response)
+
+
+@router.get("/questions/{id}/stream", response_class=StreamingResponse)
+async def stream_question(
+    id: int,
+    session: short_read_db_session,
+) -> StreamingResponse:
+    question_service = QuestionService(session=session)
+    await question_service.get_question_version(question_id=id)
+
+    if not broker.admit():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many open streams",
+            headers={"Retry-After": "5"},
+        )
+
+    return StreamingResponse(
+        StreamService().question_events(question_id=id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# Объявлен раньше /questions/{id}, иначе "batch" попадёт в {id}
+@router.delete("/questions/batch", response_model=BatchDeleteResult)
+async def delete_questions(
+    ids: batch_ids,
+    response: Response,
     session: db_session,
-) -> QuestionSchemaWithAnswers:
+) -> Response:
     question_service = QuestionService(session=session)
-    return await question_service.get_question(question_id=id)
+    result = await question_service.delete_questions(ids=ids)
+    return json_response(result, response)
 
 
 @router.delete("/questions/{id}")
@@ -0,0 +1,26 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Response
+
+from api.dependencies import page_params, read_db_session
+from api.responses import json_response
+from core.schemas.page_schema import Page
+from core.schemas.search_schema import SearchHitSchema
+from core.services.search_service import SearchService
+
+router = APIRouter(prefix="/api", tags=["Search"])
+
+
+@router.get("/search", response_model=Page[SearchHitSchema])
+async def search(
+    q: Annotated[str, Query(min_length=1, max_length=256)],
+    session: read_db_session,
+    page: page_params,
+) -> Response:
+    search_service = SearchService(session=session)
+    hits = await search_service.search(
+        q=q,
+        limit=page.limit,
+        cursor=page.cursor,
+    )
+    return json_response(hits)
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.database import async_session
+from core.metrics import Histogram
+from core.models.answer import Answer
+from core.repositories.answer_repository import AnswerRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BatchStats:
+    def __init__(self) -> None:
+        self.flushes = 0
+        self.items = 0
+        self.failed_flushes = 0
+        self.max_batch_size = 0
+        self.batch_size = Histogram(buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+
+    def record(self, batch_size: int) -> None:
+        self.flushes += 1
+        self.items += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.batch_size.observe(batch_size)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "flushes": self.flushes,
+            "items": self.items,
+            "failed_flushes": self.failed_flushes,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": self.items / self.flushes if self.flushes else 0.0,
+        }
+
+
+class AnswerWriteBatcher:
+    """Склеивает одиночные вставки ответов из конкурентных запросов в одну."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window_ms: float,
+        max_size: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self.stats = BatchStats()
+        self._pending: list[tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    async def create(self, answer_data: Dict[str, Any]) -> Answer:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((answer_data, future))
+
+        if len(self._pending) >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._start_flush)
+
+        return await future
+
+    async def close(self) -> None:
+        if self._pending:
+            self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._flush(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            async with self.session_factory() as session:
+                answers = await AnswerRepository(session=session).create_many(
+                    answers_data=[answer_data for answer_data, _ in batch],
+                )
+        except Exception:
+            logger.warning(
+                "Answer batch failed, retrying one by one, size=%s",
+                len(batch),
+            )
+            self.stats.failed_flushes += 1
+            await self._flush_one_by_one(batch)
+            return
+
+        self.stats.record(len(batch))
+        for (_, future), answer in zip(batch, answers):
+            if not future.done():
+                future.set_result(answer)
+
+    async def _flush_one_by_one(
+        self,
+        batch: list[tuple[Dict[str, Any], asyncio.Future]],
+    ) -> None:
+        # Пачка откатилась целиком: повторяем поштучно, чтобы ошибку
+        # получил только тот запрос, чьи данные её вызвали
+        for answer_data, future in batch:
+            try:
+                async with self.session_factory() as session:
+                    answer = await AnswerRepository(session=session).create(
+                        answer_data=answer_data,
+                    )
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.stats.record(1)
+                if not future.done():
+                    future.set_result(answer)
+
+
+answer_write_batcher = AnswerWriteBatcher(
+    session_factory=async_session,
+    window_ms=settings.write_batch.window_ms,
+    max_size=settings.write_batch.max_size,
+)
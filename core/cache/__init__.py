@@ -0,0 +1,49 @@
+__all__ = (
+    "CacheBackend",
+    "CacheBackendError",
+    "CacheInvalidationListener",
+    "MemoryBackend",
+    "RedisBackend",
+    "SharedCache",
+    "TTLCache",
+    "answer_cache",
+    "cache_backend",
+    "invalidation_listener",
+    "question_cache",
+)
+
+from core.cache.backends import (
+    CacheBackend,
+    CacheBackendError,
+    MemoryBackend,
+    RedisBackend,
+    create_backend,
+)
+from core.cache.local import TTLCache
+from core.cache.shared import CacheInvalidationListener, SharedCache
+from core.config import settings
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.question_schema import QuestionSchemaWithAnswers
+
+cache_backend = create_backend(settings.cache)
+
+question_cache = SharedCache(
+    namespace="question",
+    schema=QuestionSchemaWithAnswers,
+    backend=cache_backend,
+    config=settings.cache,
+)
+answer_cache = SharedCache(
+    namespace="answer",
+    schema=AnswerSchema,
+    backend=cache_backend,
+    config=settings.cache,
+    # Мягкое удаление вопроса скрывает все его ответы разом
+    scope=lambda answer: answer.question_id,
+)
+
+invalidation_listener = CacheInvalidationListener(
+    backend=cache_backend,
+    channel=settings.cache.channel,
+    caches=[question_cache, answer_cache],
+)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+from core.cache.resp import RespClient, RespError
+from core.config import CacheConfig
+
+
+class CacheBackendError(Exception):
+    pass
+
+
+class CacheBackend(ABC):
+    @abstractmethod
+    async def get_many(self, *keys: str) -> list[bytes | None]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def incr_many(self, *keys: str, ttl: float) -> None: ...
+
+    @abstractmethod
+    async def publish(self, channel: str, message: bytes) -> None: ...
+
+    @abstractmethod
+    def subscribe(self, channel: str) -> AsyncIterator[bytes]: ...
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryBackend(CacheBackend):
+    """Хранилище в памяти процесса: для одного воркера и тестов."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[float, bytes]] = {}
+        self._subscribers: dict[str, set[asyncio.Queue[bytes]]] = {}
+
+    async def get_many(self, *keys: str) -> list[bytes | None]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._data[key]
+                entry = None
+            values.append(entry[1] if entry is not None else None)
+        return values
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    async def incr_many(self, *keys: str, ttl: float) -> None:
+        for key in keys:
+            (value,) = await self.get_many(key)
+            await self.set(key, str(int(value or 0) + 1).encode(), ttl)
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        for queue in self._subscribers.get(channel, ()):
+            queue.put_nowait(message)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._subscribers.setdefault(channel, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str, timeout: float, max_connections: int = 10) -> None:
+        self.client = RespClient(url=url, timeout=timeout, max_connections=max_connections)
+
+    async def get_many(self, *keys: str) -> list[bytes | None]:
+        try:
+            return await self.client.execute("MGET", *keys)
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            raise CacheBackendError(str(e)) from e
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        try:
+            await self.client.execute("SET", key, value, "PX", int(ttl * 1000))
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            raise CacheBackendError(str(e)) from e
+
+    async def incr_many(self, *keys: str, ttl: float) -> None:
+        commands = []
+        for key in keys:
+            commands.append(("INCR", key))
+            commands.append(("PEXPIRE", key, int(ttl * 1000)))
+        try:
+            await self.client.pipeline(*commands)
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            raise CacheBackendError(str(e)) from e
+
+    async def publish(self, channel: str, message: bytes) -> None:
+        try:
+            await self.client.execute("PUBLISH", channel, message)
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            raise CacheBackendError(str(e)) from e
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        try:
+            async for message in self.client.subscribe(channel):
+                yield message
+        except (OSError, RespError, asyncio.IncompleteReadError) as e:
+            raise CacheBackendError(str(e)) from e
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def create_backend(config: CacheConfig) -> CacheBackend:
+    if config.backend == "redis":
+        return RedisBackend(
+            url=config.url,
+            timeout=config.timeout,
+            max_connections=config.max_connections,
+        )
+    return MemoryBackend()
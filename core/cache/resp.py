@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+
+class RespError(Exception):
+    pass
+
+
+def encode_command(*args: Any) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed by server")
+
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise RespError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length == -1:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length == -1:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unexpected reply: {line!r}")
+
+
+class RespClient:
+    """Минимальный клиент протокола Redis (RESP2) поверх asyncio.
+
+    Держит до max_connections соединений: вызовы не ждут друг друга,
+    а соединение возвращается в пул только после полного обмена.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0, max_connections: int = 10) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port),
+            self.timeout,
+        )
+        handshake = []
+        if self.password:
+            handshake.append(("AUTH", self.password))
+        if self.db:
+            handshake.append(("SELECT", self.db))
+        try:
+            for command in handshake:
+                writer.write(encode_command(*command))
+                await writer.drain()
+                await asyncio.wait_for(read_reply(reader), self.timeout)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def pipeline(self, *commands: tuple[Any, ...]) -> list[Any]:
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await self._open()
+            try:
+                writer.write(b"".join(encode_command(*c) for c in commands))
+                await writer.drain()
+                replies = []
+                for _ in commands:
+                    try:
+                        replies.append(
+                            await asyncio.wait_for(read_reply(reader), self.timeout)
+                        )
+                    except RespError as e:
+                        replies.append(e)
+            except BaseException:
+                # В том числе отмена: непрочитанный ответ достался бы следующему вызову
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def execute(self, *args: Any) -> Any:
+        (reply,) = await self.pipeline(args)
+        return reply
+
+    async def subscribe(self, channel: str) -> AsyncIterator[bytes]:
+        reader, writer = await self._open()
+        try:
+            writer.write(encode_command("SUBSCRIBE", channel))
+            await writer.drain()
+            while True:
+                reply = await read_reply(reader)
+                if isinstance(reply, list) and reply[0] == b"message":
+                    yield reply[2]
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
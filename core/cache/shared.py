@@ -0,0 +1,200 @@
+import asyncio
+import json
+import logging
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from pydantic import BaseModel
+
+from core.cache.backends import CacheBackend, CacheBackendError
+from core.cache.local import TTLCache
+from core.config import CacheConfig
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class SharedCache(Generic[M]):
+    """Двухуровневый кэш: локальный LRU воркера поверх общего хранилища.
+
+    Данные лежат под версионированными ключами: инвалидация увеличивает
+    версию, поэтому запись, загруженная до инвалидации, уходит под старую
+    версию и больше никем не читается.
+
+    scope — область значения (например, вопрос ответа): invalidate_scopes
+    сбрасывает все значения области, не зная их ключей.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        schema: type[M],
+        backend: CacheBackend,
+        config: CacheConfig,
+        scope: Callable[[M], Hashable] | None = None,
+    ) -> None:
+        self.namespace = namespace
+        self.scope = scope
+        self.schema = schema
+        self.backend = backend
+        self.ttl = config.ttl
+        self.version_ttl = config.version_ttl
+        self.channel = config.channel
+        self.local: TTLCache[Hashable, M] = TTLCache(
+            max_size=config.max_size,
+            ttl=config.local_ttl,
+        )
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.backend_errors = 0
+
+    def _version_key(self, key: Hashable) -> str:
+        return f"{self.namespace}:ver:{key}"
+
+    def _data_key(self, key: Hashable, version: bytes | None) -> str:
+        return f"{self.namespace}:{key}:v{int(version or 0)}"
+
+    def _scope_key(self, scope: Hashable) -> str:
+        return f"{self.namespace}:scope:{scope}"
+
+    async def _scope_invalidated(self, value: M) -> bool:
+        if self.scope is None:
+            return False
+        (marker,) = await self.backend.get_many(self._scope_key(self.scope(value)))
+        return marker is not None
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[M]],
+        local: bool = True,
+    ) -> M:
+        """Значение из кэша или из loader.
+
+        local=False — мимо локального LRU, только общий кэш: локальная копия
+        другого воркера сбрасывается по pub/sub с задержкой, а версия в общем
+        хранилище растёт ещё до ответа на запись.
+        """
+        if not local:
+            return await self._load(key, loader)
+        return await self.local.get_or_load(key, lambda: self._load(key, loader))
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[M]]) -> M:
+        try:
+            (version,) = await self.backend.get_many(self._version_key(key))
+            data_key = self._data_key(key, version)
+            (raw,) = await self.backend.get_many(data_key)
+            cached = self.schema.model_validate_json(raw) if raw is not None else None
+            if cached is not None and await self._scope_invalidated(cached):
+                cached = None
+        except CacheBackendError as e:
+            # Недоступность кэша не должна ронять чтение
+            self.backend_errors += 1
+            logger.warning("Cache backend error, namespace=%s: %s", self.namespace, e)
+            return await loader()
+
+        if cached is not None:
+            self.remote_hits += 1
+            return cached
+
+        self.remote_misses += 1
+        value = await loader()
+        try:
+            # Область могли сбросить, пока loader читал БД
+            if not await self._scope_invalidated(value):
+                await self.backend.set(data_key, value.model_dump_json().encode(), self.ttl)
+        except CacheBackendError as e:
+            self.backend_errors += 1
+            logger.warning("Cache backend error, namespace=%s: %s", self.namespace, e)
+        return value
+
+    async def invalidate(self, *keys: Hashable) -> None:
+        if not keys:
+            return
+
+        self.invalidate_local(keys)
+        message = json.dumps({"ns": self.namespace, "keys": list(keys)}).encode()
+        try:
+            await self.backend.incr_many(
+                *(self._version_key(key) for key in keys),
+                ttl=self.version_ttl,
+            )
+            await self.backend.publish(self.channel, message)
+        except CacheBackendError as e:
+            self.backend_errors += 1
+            logger.warning("Cache invalidation failed, namespace=%s: %s", self.namespace, e)
+
+    def invalidate_local(self, keys: list[Hashable] | tuple[Hashable, ...]) -> None:
+        for key in keys:
+            self.local.invalidate(key)
+
+    async def invalidate_scopes(self, *scopes: Hashable) -> None:
+        """Сбрасывает все значения областей, например ответы удалённого вопроса.
+
+        Ключи области общему кэшу неизвестны, поэтому там на ttl остаётся
+        отметка области: значение из неё считается промахом и не сохраняется.
+        """
+        if not scopes:
+            return
+
+        self.invalidate_scopes_local(scopes)
+        message = json.dumps({"ns": self.namespace, "scopes": list(scopes)}).encode()
+        try:
+            for scope in scopes:
+                await self.backend.set(self._scope_key(scope), b"1", self.ttl)
+            await self.backend.publish(self.channel, message)
+        except CacheBackendError as e:
+            self.backend_errors += 1
+            logger.warning("Cache invalidation failed, namespace=%s: %s", self.namespace, e)
+
+    def invalidate_scopes_local(self, scopes: list[Hashable] | tuple[Hashable, ...]) -> None:
+        if self.scope is None:
+            return
+        scopes = set(scopes)
+        self.local.invalidate_where(lambda value: self.scope(value) in scopes)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            **self.local.stats(),
+            "remote_hits": self.remote_hits,
+            "remote_misses": self.remote_misses,
+            "backend_errors": self.backend_errors,
+        }
+
+
+class CacheInvalidationListener:
+    """Принимает широковещательные инвалидации от других воркеров."""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        channel: str,
+        caches: list[SharedCache],
+        retry_interval: float = 1.0,
+    ) -> None:
+        self.backend = backend
+        self.channel = channel
+        self.caches = {cache.namespace: cache for cache in caches}
+        self.retry_interval = retry_interval
+
+    def handle(self, message: bytes) -> None:
+        payload = json.loads(message)
+        cache = self.caches.get(payload["ns"])
+        if cache is None:
+            return
+        if "scopes" in payload:
+            cache.invalidate_scopes_local(payload["scopes"])
+        else:
+            cache.invalidate_local(payload["keys"])
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async for message in self.backend.subscribe(self.channel):
+                    self.handle(message)
+            except CacheBackendError as e:
+                logger.warning("Cache invalidation channel lost: %s", e)
+                # Пока подписки не было, сообщения могли потеряться
+                for cache in self.caches.values():
+                    cache.local.clear()
+                await asyncio.sleep(self.retry_interval)
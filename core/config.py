@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,6 +11,14 @@ class DatabaseConfig(BaseModel):
     echo_pool: bool = False
     pool_size: int = 50
     max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    replica_urls: list[str] = []
+    replica_health_interval: float = 5.0
+    replica_health_timeout: float = 2.0
+    read_your_writes_seconds: float = 5.0
     user: str
     password: str
     host: str = "localhost"
@@ -21,6 +30,122 @@ class DatabaseConfig(BaseModel):
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
 
+class PaginationConfig(BaseModel):
+    default_limit: int = 20
+    max_limit: int = 100
+    answers_preview_limit: int = 20
+
+
+class BulkConfig(BaseModel):
+    max_batch_size: int = 1000
+    # Сколько id можно запросить разом в GET .../batch?ids=
+    max_get_ids: int = 100
+
+
+class PurgeConfig(BaseModel):
+    # Вопросы с таким числом ответов и больше удаляются мягко, ответы дочищаются в фоне
+    soft_delete_min_answers: int = 1000
+    chunk_size: int = 1000
+    # Как часто искать незавершённую очистку (после сбоя или от других воркеров)
+    poll_interval: float = 30.0
+
+
+class TasksConfig(BaseModel):
+    # Воркер задач внутри процесса приложения; False — только отдельный worker.py
+    embedded: bool = True
+    batch_size: int = 100
+    # Сколько задач выполняется одновременно: каждая держит соединение из пула
+    concurrency: int = 10
+    poll_interval: float = 1.0
+    # Взятая задача, не завершённая за это время (воркер упал), вернётся в очередь
+    lease_seconds: float = 60.0
+    max_attempts: int = 8
+    backoff_base: float = 1.0
+    backoff_max: float = 300.0
+
+
+class WriteBatchConfig(BaseModel):
+    enabled: bool = False
+    window_ms: float = 2.0
+    max_size: int = 500
+
+
+class CacheConfig(BaseModel):
+    enabled: bool = True
+    backend: Literal["memory", "redis"] = "memory"
+    url: str = "redis://localhost:6379/0"
+    timeout: float = 0.5
+    # Соединений с Redis на процесс; сверх этого вызовы ждут свободного
+    max_connections: int = 10
+    max_size: int = 10_000
+    ttl: float = 30.0
+    local_ttl: float = 5.0
+    version_ttl: float = 24 * 60 * 60
+    channel: str = "qa:cache:invalidate"
+
+
+class SearchConfig(BaseModel):
+    # Ранжируются только самые новые совпадения каждого вида: частое слово
+    # не заставляет считать rank для всей таблицы
+    max_candidates: int = 1000
+
+
+class ExportConfig(BaseModel):
+    yield_per: int = 1000
+    chunk_size: int = 64 * 1024
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = True
+    slow_request_seconds: float = 1.0
+    # Заголовки X-Query-Count / X-DB-Time в каждом ответе; только для отладки
+    debug_headers: bool = False
+
+
+class StreamConfig(BaseModel):
+    # postgres — LISTEN/NOTIFY между воркерами, memory — внутри процесса
+    backend: Literal["memory", "postgres"] = "memory"
+    channel: str = "qa_events"
+    queue_size: int = 100
+    max_connections: int = 1000
+    heartbeat_seconds: float = 15.0
+
+
+class LoggingConfig(BaseModel):
+    level: str = "INFO"
+    format: Literal["text", "json"] = "text"
+    # Записи сверх очереди отбрасываются и считаются, цикл событий не ждёт вывода
+    queue_size: int = 10_000
+    # Записей в секунду на одно сообщение горячего пути (extra=HOT_PATH)
+    hot_path_rate: float = 10.0
+
+
+class RateLimitConfig(BaseModel):
+    enabled: bool = True
+    # memory — бакеты в памяти воркера; shared — общие для всех воркеров в Redis
+    # из CACHE__URL (только при CACHE__BACKEND=redis)
+    backend: Literal["memory", "shared"] = "memory"
+    # Заголовок с ключом клиента (например, X-API-Key); без него — IP клиента
+    key_header: str | None = None
+    # Токенов в секунду и размер всплеска; GET/HEAD — чтение, остальное — запись
+    read_rate: float = 50.0
+    read_burst: int = 100
+    write_rate: float = 10.0
+    write_burst: int = 20
+    # Сколько клиентов помнит бакет в памяти (LRU)
+    max_keys: int = 100_000
+    exempt_paths: list[str] = ["/health", "/metrics", "/docs", "/openapi.json"]
+
+
+class AdmissionConfig(BaseModel):
+    enabled: bool = True
+    # Больше запросов одновременно процесс не принимает, а сразу отвечает 503
+    max_in_flight: int = 200
+    # Порог недавнего ожидания соединения из пула, секунд
+    max_pool_wait: float = 0.5
+    retry_after: int = 1
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=BASE_DIR / ".env",
@@ -28,6 +153,19 @@ class Settings(BaseSettings):
         env_nested_delimiter="__",
     )
     db: DatabaseConfig
+    pagination: PaginationConfig = PaginationConfig()
+    bulk: BulkConfig = BulkConfig()
+    write_batch: WriteBatchConfig = WriteBatchConfig()
+    purge: PurgeConfig = PurgeConfig()
+    tasks: TasksConfig = TasksConfig()
+    export: ExportConfig = ExportConfig()
+    search: SearchConfig = SearchConfig()
+    cache: CacheConfig = CacheConfig()
+    metrics: MetricsConfig = MetricsConfig()
+    logging: LoggingConfig = LoggingConfig()
+    stream: StreamConfig = StreamConfig()
+    rate_limit: RateLimitConfig = RateLimitConfig()
+    admission: AdmissionConfig = AdmissionConfig()
 
 
 settings = Settings()
\ No newline at end of file
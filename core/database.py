@@ -1,15 +1,120 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from fastapi import Request, Response
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from core.config import settings
+from core.pool import InstrumentedAsyncQueuePool
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "qa_primary_until"
+
+
+def create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if make_url(url).get_backend_name() == "postgresql":
+        # Кэш prepared statements самого asyncpg и адаптера SQLAlchemy
+        connect_args = {
+            "statement_cache_size": settings.db.statement_cache_size,
+            "prepared_statement_cache_size": settings.db.statement_cache_size,
+        }
+    return create_async_engine(
+        url=url,
+        echo=settings.db.echo,
+        echo_pool=settings.db.echo_pool,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+        pool_timeout=settings.db.pool_timeout,
+        pool_recycle=settings.db.pool_recycle,
+        pool_pre_ping=settings.db.pool_pre_ping,
+        connect_args=connect_args,
+    )
+
+
+class ReplicaRouter:
+    """Round-robin по здоровым репликам с откатом на primary."""
+
+    def __init__(
+        self,
+        primary: AsyncEngine,
+        replicas: list[AsyncEngine],
+        health_interval: float,
+        health_timeout: float = 2.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._healthy = set(range(len(replicas)))
+        self._counter = itertools.count()
+
+    @property
+    def healthy_replicas(self) -> list[AsyncEngine]:
+        return [
+            replica
+            for index, replica in enumerate(self.replicas)
+            if index in self._healthy
+        ]
+
+    def choose(self) -> AsyncEngine:
+        replicas = self.healthy_replicas
+        if not replicas:
+            return self.primary
+        return replicas[next(self._counter) % len(replicas)]
+
+    async def _ping(self, replica: AsyncEngine) -> None:
+        async with replica.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def check_health(self) -> None:
+        for index, replica in enumerate(self.replicas):
+            try:
+                # Зависшая реплика не должна останавливать проверку остальных
+                await asyncio.wait_for(self._ping(replica), self.health_timeout)
+            except Exception:
+                if index in self._healthy:
+                    logger.warning("Replica is down, url=%s", replica.url)
+                self._healthy.discard(index)
+            else:
+                if index not in self._healthy:
+                    logger.info("Replica is back, url=%s", replica.url)
+                self._healthy.add(index)
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check_health()
+            await asyncio.sleep(self.health_interval)
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
 
-engine = create_async_engine(
-    url=settings.db.url,
+
+engine = create_engine(settings.db.url)
+
+replica_router = ReplicaRouter(
+    primary=engine,
+    replicas=[create_engine(url) for url in settings.db.replica_urls],
+    health_interval=settings.db.replica_health_interval,
+    health_timeout=settings.db.replica_health_timeout,
 )
 
 
 async def dispose() -> None:
+    await replica_router.dispose()
     await engine.dispose()
 
 
@@ -20,9 +125,60 @@ async_session = async_sessionmaker(
 )
 
 
-async def get_session() -> AsyncIterator[AsyncSession]:
+def is_primary_pinned(request: Request) -> bool:
+    # Без реплик все чтения и так на primary, а cookie не даёт обойти кэш
+    if not replica_router.replicas:
+        return False
+    try:
+        until = float(request.cookies[PRIMARY_PIN_COOKIE])
+    except (KeyError, ValueError):
+        return False
+    # Cookie ставит клиент: срок дальше read_your_writes_seconds не принимаем
+    now = time.time()
+    return now < until <= now + settings.db.read_your_writes_seconds
+
+
+async def get_session(response: Response) -> AsyncIterator[AsyncSession]:
+    # После записи клиент какое-то время читает с primary (read-your-writes)
+    if replica_router.replicas and settings.db.read_your_writes_seconds > 0:
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE,
+            str(time.time() + settings.db.read_your_writes_seconds),
+            max_age=int(settings.db.read_your_writes_seconds) + 1,
+            httponly=True,
+        )
+
     async with async_session() as session:
         yield session
 
 
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    pinned = is_primary_pinned(request)
+    bind = replica_router.primary if pinned else replica_router.choose()
+    info = {"primary_pinned": pinned, "replica": bind is not replica_router.primary}
+    async with async_session(bind=bind, info=info) as session:
+        yield session
+
+
+def reads_from_replica(session: AsyncSession) -> bool:
+    """Сессия читает с реплики, которая может отставать от primary."""
+    return session.info.get("replica", False)
+
+
+@asynccontextmanager
+async def primary_session(session: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """Сама session, если она на primary, иначе отдельная сессия primary.
+
+    Через неё кэш заполняется при промахе: данные отстающей реплики
+    легли бы под версию, созданную уже после инвалидации.
+    """
+    if not reads_from_replica(session):
+        yield session
+        return
+    async with async_session() as primary:
+        yield primary
+
 
+def is_primary_pinned_session(session: AsyncSession) -> bool:
+    """Клиент только что писал и должен видеть свою запись."""
+    return session.info.get("primary_pinned", False)
@@ -0,0 +1,158 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from core.config import LoggingConfig
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(name)s:%(lineno)d | %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Частые сообщения горячих путей помечаются так и проходят через ограничитель:
+#     logger.info("Answer created, answer_id=%s", answer.id, extra=HOT_PATH)
+HOT_PATH = {"hot_path": True}
+
+# Стандартные атрибуты LogRecord; всё остальное пришло через extra
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "hot_path"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись; поля из extra попадают в объект."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        payload.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class HotPathFilter(logging.Filter):
+    """Пропускает не больше rate записей в секунду на каждое сообщение горячего пути.
+
+    Отброшенные считаются; их число приписывается к следующей пропущенной
+    записи того же сообщения (поле suppressed).
+    """
+
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate = rate
+        self.suppressed = 0
+        # (логгер, шаблон) -> (начало окна, записей в окне, отброшено в окне)
+        self._windows: dict[tuple[str, Any], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot_path", False):
+            return True
+
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= 1.0:
+            if window is not None and window[2]:
+                record.suppressed = window[2]
+            self._windows[key] = [now, 1, 0]
+            return True
+        if window[1] < self.rate:
+            window[1] += 1
+            return True
+        window[2] += 1
+        self.suppressed += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler, который не ждёт: при полной очереди запись отбрасывается."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # При остановке очередь может быть полна: ждём, пока поток её разберёт
+        self.queue.put(self._sentinel)
+
+
+class LoggingPipeline:
+    """Запись в лог кладётся в очередь, ввод-вывод делает поток QueueListener."""
+
+    def __init__(self, config: LoggingConfig) -> None:
+        output = logging.StreamHandler()
+        if config.format == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            output.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+        self.queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.hot_path_filter = HotPathFilter(rate=config.hot_path_rate)
+        self.handler.addFilter(self.hot_path_filter)
+        self.listener = _Listener(self.queue, output, respect_handler_level=True)
+        self.level = config.level
+        self._started = False
+
+    def start(self) -> None:
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+
+        # У uvicorn свои синхронные обработчики; пусть его записи идут через очередь
+        for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers.clear()
+            uvicorn_logger.propagate = True
+
+        self.listener.start()
+        self._started = True
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        # Дописывает всё, что осталось в очереди
+        if self._started:
+            self._started = False
+            self.listener.stop()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "dropped": self.handler.dropped,
+            "suppressed": self.hot_path_filter.suppressed,
+        }
+
+
+def setup_logging(config: LoggingConfig) -> LoggingPipeline:
+    pipeline = LoggingPipeline(config)
+    pipeline.start()
+    return pipeline
@@ -0,0 +1,288 @@
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, Iterator, Mapping
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryStats:
+    """SQL-запросы одного HTTP-запроса."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats",
+    default=None,
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._qa_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is None or context is None:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - context._qa_started
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    # SQLAlchemy копирует контекст задачи в greenlet драйвера, поэтому
+    # обработчики событий видят статистику текущего запроса
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def count_queries(engine: AsyncEngine) -> Iterator[QueryStats]:
+    """Считает все SQL-запросы движка внутри блока, независимо от запроса HTTP."""
+    stats = QueryStats()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("qa_count_started", []).append(time.perf_counter())
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        stats.queries += 1
+        # Запрос мог начаться до входа в блок
+        started = conn.info.get("qa_count_started")
+        if started:
+            stats.db_seconds += time.perf_counter() - started.pop()
+
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before)
+    event.listen(sync_engine, "after_cursor_execute", after)
+    try:
+        yield stats
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before)
+        event.remove(sync_engine, "after_cursor_execute", after)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RouteStats:
+    __slots__ = ("latency", "statuses", "queries", "db_seconds")
+
+    def __init__(self) -> None:
+        self.latency = Histogram()
+        self.statuses: dict[int, int] = {}
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+def _labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+def render_gauges(
+    prefix: str,
+    samples: Iterable[tuple[Mapping[str, Any], Mapping[str, Any]]],
+) -> list[str]:
+    """Числовые поля словарей статистики как gauge в формате Prometheus.
+
+    samples — пары (метки, статистика); одноимённые поля разных источников
+    попадают в одно семейство метрик.
+    """
+    families: dict[str, list[str]] = {}
+    for labels, values in samples:
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            families.setdefault(f"{prefix}_{key}", []).append(
+                f"{prefix}_{key}{_labels(labels)} {value}"
+            )
+
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.extend(family)
+    return lines
+
+
+def render_histograms(
+    name: str,
+    samples: Iterable[tuple[Mapping[str, Any], Histogram]],
+) -> list[str]:
+    """Гистограммы Prometheus: накопительные _bucket{le=...}, _sum и _count."""
+    lines = [f"# TYPE {name} histogram"]
+    for labels, histogram in samples:
+        cumulative = 0
+        for bound, count in zip((*histogram.buckets, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+    return lines
+
+
+class RequestMetrics:
+    def __init__(self) -> None:
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self.slow_requests = 0
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        stats: QueryStats,
+    ) -> None:
+        route_stats = self.routes.get((method, route))
+        if route_stats is None:
+            route_stats = self.routes[(method, route)] = RouteStats()
+        route_stats.latency.observe(duration)
+        route_stats.statuses[status] = route_stats.statuses.get(status, 0) + 1
+        route_stats.queries += stats.queries
+        route_stats.db_seconds += stats.db_seconds
+
+    def render(self) -> list[str]:
+        routes = sorted(self.routes.items())
+        lines = render_histograms(
+            "qa_http_request_duration_seconds",
+            (
+                ({"method": method, "route": route}, route_stats.latency)
+                for (method, route), route_stats in routes
+            ),
+        )
+        requests, queries, db_seconds = [], [], []
+        for (method, route), route_stats in routes:
+            labels = {"method": method, "route": route}
+            for status, count in sorted(route_stats.statuses.items()):
+                requests.append(
+                    f"qa_http_requests_total{_labels({**labels, 'status': status})} {count}"
+                )
+            queries.append(f"qa_db_queries_total{_labels(labels)} {route_stats.queries}")
+            db_seconds.append(
+                f"qa_db_seconds_total{_labels(labels)} {route_stats.db_seconds}"
+            )
+
+        lines += ["# TYPE qa_http_requests_total counter", *requests]
+        lines += ["# TYPE qa_db_queries_total counter", *queries]
+        lines += ["# TYPE qa_db_seconds_total counter", *db_seconds]
+        lines += [
+            "# TYPE qa_http_slow_requests_total counter",
+            f"qa_http_slow_requests_total {self.slow_requests}",
+        ]
+        return lines
+
+
+def render_exposition(sections: Iterable[list[str]]) -> str:
+    return "\n".join(line for section in sections for line in section) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI-middleware: задержка по маршрутам, число и время SQL-запросов."""
+
+    def __init__(
+        self,
+        app,
+        metrics: RequestMetrics,
+        slow_request_seconds: float,
+        debug_headers: bool = False,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.slow_request_seconds = slow_request_seconds
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status = 500
+        response_started: float | None = None
+        streaming = False
+
+        async def send_with_status(message) -> None:
+            nonlocal status, response_started, streaming
+            if message["type"] == "http.response.body" and message.get("more_body"):
+                streaming = True
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = time.perf_counter()
+                if self.debug_headers:
+                    # Запросы после начала ответа (стриминг) сюда не попадут
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"x-query-count", str(stats.queries).encode()),
+                            (b"x-db-time", f"{stats.db_seconds * 1000:.3f}ms".encode()),
+                        ],
+                    }
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            finished = time.perf_counter()
+            # У потоков (SSE, выгрузка NDJSON) задержка — до начала ответа:
+            # сам поток идёт сколько угодно долго и не говорит о медленном запросе
+            if streaming and response_started is not None:
+                finished = response_started
+            duration = finished - started
+            current_query_stats.reset(token)
+
+            # Шаблон пути маршрута, чтобы не плодить метки на каждый id
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            self.metrics.observe(scope["method"], route_path, status, duration, stats)
+
+            if duration >= self.slow_request_seconds:
+                self.metrics.slow_requests += 1
+                logger.warning(
+                    "Slow request %s %s status=%s duration=%.3fs queries=%s db_time=%.3fs",
+                    scope["method"],
+                    route_path,
+                    status,
+                    duration,
+                    stats.queries,
+                    stats.db_seconds,
+                )
+
+
+request_metrics = RequestMetrics()
@@ -1,7 +1,10 @@
 __all__ = (
     "Question",
     "Answer",
+    "OutboxTask",
 )
 
 from .question import Question
 from .answer import Answer
+from .task import OutboxTask
+from . import search
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from core.models.base import Base
@@ -11,6 +11,11 @@ if TYPE_CHECKING:
 
 
 class Answer(Base):
+    __table_args__ = (
+        # Покрывает FK (каскадное удаление) и keyset-пагинацию ответов вопроса
+        Index("ix_answers_question_id_created_at_id", "question_id", "created_at", "id"),
+    )
+
     question_id: Mapped[int] = mapped_column(
         ForeignKey(
             "questions.id",
@@ -1,9 +1,18 @@
 from datetime import datetime
 
 from sqlalchemy import TIMESTAMP, func
+from sqlalchemy.dialects.sqlite import DATETIME
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, declared_attr
 
 
+# SQLite заполняет server_default через CURRENT_TIMESTAMP без микросекунд,
+# поэтому параметры сравнения (курсоры, фильтры) пишем в том же формате
+SQLiteTimestamp = DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d",
+)
+Timestamp = TIMESTAMP(timezone=True).with_variant(SQLiteTimestamp, "sqlite")
+
+
 class Base(DeclarativeBase):
 
     @declared_attr
@@ -13,7 +22,7 @@ class Base(DeclarativeBase):
     id: Mapped[int] = mapped_column(primary_key=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True),
+        Timestamp,
         server_default=func.now(),
         nullable=False,
     )
@@ -1,8 +1,10 @@
+from datetime import datetime
 from typing import TYPE_CHECKING
 
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from core.models.base import Base
+from core.models.base import Base, Timestamp
 
 
 if TYPE_CHECKING:
@@ -10,7 +12,37 @@ if TYPE_CHECKING:
 
 
 class Question(Base):
+    __table_args__ = (
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        # Сортировки по популярности и активности без GROUP BY по ответам
+        Index("ix_questions_answer_count_id", "answer_count", "id"),
+        Index("ix_questions_last_answer_at_id", "last_answer_at", "id"),
+        # Очередь фоновой очистки: частичный индекс только по удалённым вопросам
+        Index(
+            "ix_questions_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+            sqlite_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
     text: Mapped[str] = mapped_column(nullable=False)
+    # Увеличивается при каждом изменении ответов; используется для ETag
+    version: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Денормализованные счётчики, обновляются вместе с ответами
+    answer_count: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    last_answer_at: Mapped[datetime | None] = mapped_column(Timestamp)
+    # Мягкое удаление вопроса с большим числом ответов: чтения его уже не видят,
+    # ответы и саму строку удаляет фоновая очистка (core/purge.py)
+    deleted_at: Mapped[datetime | None] = mapped_column(Timestamp)
 
     answers: Mapped[list["Answer"]] = relationship(
         back_populates="question",
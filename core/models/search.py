@@ -0,0 +1,67 @@
+from sqlalchemy import DDL, Table, event
+
+from core.models.answer import Answer
+from core.models.question import Question
+
+# Конфигурация текстового поиска Postgres; должна совпадать с миграцией
+SEARCH_CONFIG = "simple"
+
+
+def _postgres_ddl(table: Table) -> list[str]:
+    # Как в миграции: обычная колонка, которую заполняет триггер
+    name = table.name
+    return [
+        f"ALTER TABLE {name} ADD COLUMN search_vector tsvector",
+        f"CREATE FUNCTION {name}_search_vector_update() RETURNS trigger AS $$ "
+        f"BEGIN NEW.search_vector := to_tsvector('{SEARCH_CONFIG}', NEW.text); "
+        f"RETURN NEW; END $$ LANGUAGE plpgsql",
+        f"CREATE TRIGGER {name}_search_vector_update "
+        f"BEFORE INSERT OR UPDATE OF text ON {name} "
+        f"FOR EACH ROW EXECUTE FUNCTION {name}_search_vector_update()",
+        f"CREATE INDEX ix_{name}_search_vector ON {name} USING gin (search_vector)",
+    ]
+
+
+def _sqlite_ddl(table: Table) -> list[str]:
+    # Внешний FTS5-индекс хранит только токены, текст берётся из самой таблицы
+    name = table.name
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {name}_fts "
+        f"USING fts5(text, content='{name}', content_rowid='id')",
+        f"CREATE TRIGGER {name}_fts_ai AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {name}_fts(rowid, text) VALUES (new.id, new.text); END",
+        f"CREATE TRIGGER {name}_fts_ad AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {name}_fts({name}_fts, rowid, text) "
+        f"VALUES ('delete', old.id, old.text); END",
+        f"CREATE TRIGGER {name}_fts_au AFTER UPDATE OF text ON {name} BEGIN "
+        f"INSERT INTO {name}_fts({name}_fts, rowid, text) "
+        f"VALUES ('delete', old.id, old.text); "
+        f"INSERT INTO {name}_fts(rowid, text) VALUES (new.id, new.text); END",
+    ]
+
+
+for searchable in (Question.__table__, Answer.__table__):
+    for statement in _postgres_ddl(searchable):
+        event.listen(
+            searchable,
+            "after_create",
+            DDL(statement).execute_if(dialect="postgresql"),
+        )
+    for statement in _sqlite_ddl(searchable):
+        event.listen(
+            searchable,
+            "after_create",
+            DDL(statement).execute_if(dialect="sqlite"),
+        )
+    event.listen(
+        searchable,
+        "before_drop",
+        DDL(f"DROP TABLE IF EXISTS {searchable.name}_fts").execute_if(dialect="sqlite"),
+    )
+    event.listen(
+        searchable,
+        "after_drop",
+        DDL(
+            f"DROP FUNCTION IF EXISTS {searchable.name}_search_vector_update()"
+        ).execute_if(dialect="postgresql"),
+    )
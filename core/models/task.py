@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Index, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models.base import Base, Timestamp
+
+
+class OutboxTask(Base):
+    """Побочный эффект записи, сохранённый в той же транзакции.
+
+    Строку выполняет TaskWorker (core/tasks.py) и удаляет после успеха.
+    """
+
+    __tablename__ = "outbox_tasks"
+    __table_args__ = (
+        # Проверка более ранних задач того же ключа при выборке
+        Index("ix_outbox_tasks_key_id", "key", "id"),
+        # Поиск готовых задач: мёртвые строки в индекс не попадают
+        Index(
+            "ix_outbox_tasks_available_at",
+            "available_at",
+            postgresql_where=text("dead_at IS NULL"),
+            sqlite_where=text("dead_at IS NULL"),
+        ),
+    )
+
+    kind: Mapped[str] = mapped_column(nullable=False)
+    # Задачи с одним ключом выполняются по порядку id (например, события вопроса)
+    key: Mapped[str | None]
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    attempts: Mapped[int] = mapped_column(
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Раньше этого времени задачу не берут: ожидание повтора или аренда воркером
+    available_at: Mapped[datetime] = mapped_column(
+        Timestamp,
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_error: Mapped[str | None]
+    # Попытки исчерпаны; строка остаётся для разбора
+    dead_at: Mapped[datetime | None] = mapped_column(Timestamp)
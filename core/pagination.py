@@ -0,0 +1,165 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, Sequence, TypeVar
+
+from sqlalchemy import BigInteger, Select, SmallInteger, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Cursor:
+    values: tuple[Any, ...]
+    backward: bool = False
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    cursor: str | None = None
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _int_bits(column: Any) -> int:
+    # Целое за пределами типа колонки asyncpg не отправит: была бы 500, а не 400
+    column_type = getattr(column, "type", None)
+    if isinstance(column_type, SmallInteger):
+        return 16
+    if isinstance(column_type, BigInteger):
+        return 64
+    return 32
+
+
+def _matches(value: Any, python_type: type, column: Any) -> bool:
+    if value is None:
+        return getattr(column, "nullable", True)
+    if isinstance(value, bool):
+        return python_type is bool
+    if python_type is float and isinstance(value, float):
+        return True
+    if python_type in (int, float) and isinstance(value, int):
+        bound = 2 ** (_int_bits(column) - 1) if python_type is int else 2**63
+        return -bound <= value < bound
+    return isinstance(value, python_type)
+
+
+class Keyset:
+    """Keyset-пагинация по уникальному набору колонок (последняя — id)."""
+
+    def __init__(
+        self,
+        name: str,
+        *columns: InstrumentedAttribute,
+        descending: bool = False,
+    ) -> None:
+        self.name = name
+        self.columns = columns
+        self.descending = descending
+        # Тип значения каждой колонки: подделанный курсор не должен дойти до БД
+        self.types = tuple(column.type.python_type for column in columns)
+
+    def encode(self, cursor: Cursor) -> str:
+        payload = {
+            "k": self.name,
+            "v": [_dump_value(value) for value in cursor.values],
+            "b": cursor.backward,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode(self, token: str) -> Cursor:
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            values = tuple(_load_value(value) for value in payload["v"])
+            backward = bool(payload["b"])
+            name = payload["k"]
+        except (binascii.Error, ValueError, TypeError, KeyError) as e:
+            raise InvalidCursorError(token) from e
+
+        if name != self.name or len(values) != len(self.columns):
+            raise InvalidCursorError(token)
+        if not all(
+            _matches(value, python_type, column)
+            for value, python_type, column in zip(values, self.types, self.columns)
+        ):
+            raise InvalidCursorError(token)
+        return Cursor(values=values, backward=backward)
+
+    def apply(self, query: Select, limit: int, cursor: Cursor | None) -> Select:
+        backward = cursor is not None and cursor.backward
+        # Для предыдущей страницы идём от курсора в обратном порядке
+        ascending = self.descending == backward
+
+        if cursor is not None:
+            key = tuple_(*self.columns)
+            query = query.where(
+                key > cursor.values if ascending else key < cursor.values
+            )
+
+        order_by = [
+            column.asc() if ascending else column.desc() for column in self.columns
+        ]
+        # Лишняя строка показывает, есть ли что-то за пределами страницы
+        return query.order_by(*order_by).limit(limit + 1)
+
+    def page(
+        self,
+        rows: Sequence[T],
+        limit: int,
+        cursor: Cursor | None,
+    ) -> KeysetPage[T]:
+        items = list(rows[:limit])
+        has_more = len(rows) > limit
+        backward = cursor is not None and cursor.backward
+        if backward:
+            items.reverse()
+
+        if not items:
+            return KeysetPage()
+
+        has_next = cursor is not None if backward else has_more
+        has_prev = has_more if backward else cursor is not None
+
+        return KeysetPage(
+            items=items,
+            next_cursor=(
+                self.encode(Cursor(values=self._key(items[-1])))
+                if has_next
+                else None
+            ),
+            prev_cursor=(
+                self.encode(Cursor(values=self._key(items[0]), backward=True))
+                if has_prev
+                else None
+            ),
+        )
+
+    def _key(self, row: Any) -> tuple[Any, ...]:
+        return tuple(getattr(row, column.key) for column in self.columns)
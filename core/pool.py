@@ -0,0 +1,86 @@
+import time
+from typing import Any, Callable
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+class PoolWaitStats:
+    # Вес нового замера в скользящем среднем и период полураспада без замеров
+    smoothing = 0.2
+    half_life = 1.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._recent = 0.0
+        self._recent_at = clock()
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.wait_seconds_total += wait
+        self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        self._recent = self.recent_wait() * (1 - self.smoothing) + wait * self.smoothing
+        self._recent_at = self.clock()
+
+    def record_timeout(self, wait: float) -> None:
+        self.timeouts += 1
+        self._recent = max(self.recent_wait(), wait)
+        self._recent_at = self.clock()
+
+    def recent_wait(self) -> float:
+        """Недавнее время ожидания соединения.
+
+        Без новых замеров значение затухает: когда нагрузку режут и
+        соединения никто не берёт, оценка не застревает на пике.
+        """
+        idle = self.clock() - self._recent_at
+        return self._recent * 0.5 ** (idle / self.half_life)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Пул, замеряющий время ожидания свободного соединения."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.wait_stats.record_timeout(time.perf_counter() - started)
+            raise
+        self.wait_stats.record(time.perf_counter() - started)
+        return connection
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+    wait_stats = getattr(pool, "wait_stats", None)
+    if wait_stats is not None:
+        stats.update(
+            checkouts=wait_stats.checkouts,
+            timeouts=wait_stats.timeouts,
+            wait_seconds_total=wait_stats.wait_seconds_total,
+            wait_seconds_max=wait_stats.wait_seconds_max,
+            wait_seconds_recent=wait_stats.recent_wait(),
+            wait_seconds_avg=(
+                wait_stats.wait_seconds_total / wait_stats.checkouts
+                if wait_stats.checkouts
+                else 0.0
+            ),
+        )
+    return stats
@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.config import StreamConfig, settings
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY принимает payload до 8000 байт
+NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    data: bytes = b"{}"
+    id: int | None = None
+
+
+# Подписчик отстал или события могли потеряться: клиенту нужно перечитать вопрос
+RESYNC = Event("resync")
+
+
+def question_channel(question_id: int) -> str:
+    return f"question:{question_id}"
+
+
+class Subscription:
+    """Ограниченная очередь событий одного соединения.
+
+    Если клиент не успевает читать, накопленное выбрасывается и вместо него
+    кладётся RESYNC: память на соединение не растёт, а клиент знает, что
+    часть событий пропустил.
+    """
+
+    def __init__(self, channel: str, queue_size: int) -> None:
+        self.channel = channel
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def put(self, event: Event) -> bool:
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+
+class Broker(ABC):
+    """Раздаёт события подписчикам своего процесса."""
+
+    def __init__(self, queue_size: int, max_connections: int) -> None:
+        self.queue_size = queue_size
+        self.max_connections = max_connections
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self.connections = 0
+        self.connections_total = 0
+        self.rejected_connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+        self.publish_errors = 0
+
+    @abstractmethod
+    async def publish(self, channel: str, *events: Event) -> None: ...
+
+    async def run(self) -> None:
+        """Фоновая задача доставки между воркерами; в памяти не нужна."""
+
+    def admit(self) -> bool:
+        """Есть ли место для ещё одного соединения; отказ считается."""
+        if self.connections >= self.max_connections:
+            self.rejected_connections += 1
+            return False
+        return True
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+        subscription = Subscription(channel, self.queue_size)
+        self._subscriptions.setdefault(channel, set()).add(subscription)
+        self.connections += 1
+        self.connections_total += 1
+        try:
+            yield subscription
+        finally:
+            self.connections -= 1
+            subscribers = self._subscriptions[channel]
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscriptions[channel]
+
+    def has_subscribers(self, channel: str) -> bool:
+        return channel in self._subscriptions
+
+    def deliver(self, channel: str, events: list[Event]) -> None:
+        for subscription in self._subscriptions.get(channel, ()):
+            for event in events:
+                if subscription.put(event):
+                    self.delivered += 1
+                else:
+                    self.overflows += 1
+
+    def resync_all(self) -> None:
+        for channel in list(self._subscriptions):
+            self.deliver(channel, [RESYNC])
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "connections": self.connections,
+            "connections_total": self.connections_total,
+            "rejected_connections": self.rejected_connections,
+            "channels": len(self._subscriptions),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "publish_errors": self.publish_errors,
+        }
+
+
+class MemoryBroker(Broker):
+    """Pub/sub внутри процесса: для одного воркера и тестов."""
+
+    async def publish(self, channel: str, *events: Event) -> None:
+        self.published += len(events)
+        self.deliver(channel, list(events))
+
+
+class PostgresBroker(Broker):
+    """Раздача событий всем воркерам через LISTEN/NOTIFY.
+
+    Публикация — pg_notify через пул приложения, приём — одно соединение
+    из того же пула с LISTEN на весь процесс.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        channel: str,
+        queue_size: int,
+        max_connections: int,
+        retry_interval: float = 1.0,
+    ) -> None:
+        super().__init__(queue_size=queue_size, max_connections=max_connections)
+        self.engine = engine
+        self.channel = channel
+        self.retry_interval = retry_interval
+
+    @staticmethod
+    def encode(channel: str, events: tuple[Event, ...]) -> str:
+        payload = json.dumps({
+            "ch": channel,
+            "ev": [
+                {"e": event.name, "id": event.id, "d": event.data.decode()}
+                for event in events
+            ],
+        })
+        if len(payload.encode()) > NOTIFY_PAYLOAD_LIMIT:
+            # Не влезает в NOTIFY: подписчики перечитают вопрос сами
+            return PostgresBroker.encode(channel, (RESYNC,))
+        return payload
+
+    def handle(self, payload: str) -> None:
+        message = json.loads(payload)
+        self.deliver(
+            message["ch"],
+            [
+                Event(name=event["e"], id=event["id"], data=event["d"].encode())
+                for event in message["ev"]
+            ],
+        )
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.handle(payload)
+
+    async def publish(self, channel: str, *events: Event) -> None:
+        self.published += len(events)
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(
+                    select(func.pg_notify(self.channel, self.encode(channel, events)))
+                )
+                await conn.commit()
+        except SQLAlchemyError as e:
+            # Запись уже закоммичена; подписчики увидят её при следующем чтении
+            self.publish_errors += 1
+            logger.warning("Event publish failed, channel=%s: %s", channel, e)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    listener = raw.driver_connection
+                    lost = asyncio.Event()
+                    listener.add_termination_listener(lambda _: lost.set())
+                    await listener.add_listener(self.channel, self._on_notify)
+                    try:
+                        await lost.wait()
+                    finally:
+                        # Соединение вернётся в пул: LISTEN на нём больше не нужен
+                        if not lost.is_set():
+                            await listener.remove_listener(self.channel, self._on_notify)
+                raise ConnectionError("LISTEN connection closed")
+            except Exception as e:
+                logger.warning("Event channel lost: %s", e)
+                # Пока LISTEN не было, события могли потеряться
+                self.resync_all()
+                await asyncio.sleep(self.retry_interval)
+
+
+def create_broker(config: StreamConfig) -> Broker:
+    if config.backend == "postgres":
+        return PostgresBroker(
+            engine=engine,
+            channel=config.channel,
+            queue_size=config.queue_size,
+            max_connections=config.max_connections,
+        )
+    return MemoryBroker(
+        queue_size=config.queue_size,
+        max_connections=config.max_connections,
+    )
+
+
+broker = create_broker(settings.stream)
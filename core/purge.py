@@ -0,0 +1,116 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import answer_cache
+from core.config import settings
+from core.database import async_session
+from core.repositories.question_repository import QuestionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class QuestionPurger:
+    """Дочищает ответы мягко удалённых вопросов пачками по chunk_size.
+
+    Очередь — сами строки вопросов с deleted_at: после падения процесса
+    работа продолжается со следующего опроса без отдельного состояния.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        chunk_size: int,
+        poll_interval: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self.purged_answers = 0
+        self.purged_questions = 0
+        self.chunks = 0
+        self.failures = 0
+        self.pending_questions = 0
+        self.pending_answers = 0
+
+    def wake(self) -> None:
+        """Начать очистку сразу, не дожидаясь следующего опроса."""
+        self._wakeup.set()
+
+    async def purge_question(self, question_id: int) -> bool:
+        """Удаляет ответы вопроса до конца; False — пачку заняли или вопрос остался."""
+        while True:
+            async with self.session_factory() as session:
+                repository = QuestionRepository(session=session)
+                answer_ids, finished = await repository.purge_answers(
+                    q_id=question_id,
+                    limit=self.chunk_size,
+                )
+            self.chunks += 1
+            self.purged_answers += len(answer_ids)
+            self.pending_answers = max(self.pending_answers - len(answer_ids), 0)
+            await answer_cache.invalidate(*answer_ids)
+            if finished:
+                self.purged_questions += 1
+                logger.info("Question purged, question_id=%s", question_id)
+                return True
+            if len(answer_ids) < self.chunk_size:
+                return False
+            logger.info(
+                "Purging question, question_id=%s, purged_answers=%s",
+                question_id,
+                len(answer_ids),
+            )
+
+    async def run_once(self) -> int:
+        """Один проход по всем ожидающим вопросам; возвращает число дочищенных."""
+        purged = 0
+        while True:
+            async with self.session_factory() as session:
+                repository = QuestionRepository(session=session)
+                pending = await repository.get_purge_pending(limit=self.chunk_size)
+            self.pending_questions = len(pending)
+            self.pending_answers = sum(row.answer_count for row in pending)
+            if not pending:
+                return purged
+
+            progressed = False
+            for row in pending:
+                if await self.purge_question(row.id):
+                    purged += 1
+                    progressed = True
+            if not progressed:
+                # Остальное держат другие воркеры: вернёмся на следующем опросе
+                return purged
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                self.failures += 1
+                logger.exception("Question purge failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "purged_answers": self.purged_answers,
+            "purged_questions": self.purged_questions,
+            "chunks": self.chunks,
+            "failures": self.failures,
+            "pending_questions": self.pending_questions,
+            "pending_answers": self.pending_answers,
+        }
+
+
+question_purger = QuestionPurger(
+    session_factory=async_session,
+    chunk_size=settings.purge.chunk_size,
+    poll_interval=settings.purge.poll_interval,
+)
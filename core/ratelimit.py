@@ -0,0 +1,330 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Any, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import JSONResponse
+
+from core.cache import RedisBackend, cache_backend
+from core.cache.local import TTLCache
+from core.cache.resp import RespClient, RespError
+from core.config import AdmissionConfig, RateLimitConfig, settings
+from core.database import engine, replica_router
+
+logger = logging.getLogger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class BucketStoreError(Exception):
+    pass
+
+
+def take_tokens(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    cost: float = 1.0,
+) -> tuple[float, float]:
+    """Шаг token bucket: пополнение за прошедшее время и списание cost.
+
+    Возвращает остаток токенов и сколько секунд ждать (0 — запрос разрешён).
+    Скрипт TOKEN_BUCKET_SCRIPT делает то же самое в Redis.
+    """
+    tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= cost:
+        return tokens - cost, 0.0
+    return tokens, (cost - tokens) / rate
+
+
+# Атомарно в Redis; время берётся у Redis, чтобы воркеры не расходились часами
+TOKEN_BUCKET_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return tostring(wait)
+"""
+
+
+class LocalBuckets:
+    """Token bucket на ключ в памяти процесса; давно не виденные ключи вытесняются."""
+
+    def __init__(self, max_keys: int, ttl: float) -> None:
+        # Через ttl бакет полон, поэтому забытый ключ равен новому
+        self.buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            max_size=max_keys,
+            ttl=ttl,
+        )
+
+    def take(self, key: str, rate: float, capacity: float) -> float:
+        now = time.monotonic()
+        state = self.buckets.get(key)
+        tokens, updated = state if state is not None else (capacity, now)
+        tokens, wait = take_tokens(tokens, updated, now, rate, capacity)
+        self.buckets.set(key, (tokens, now))
+        return wait
+
+
+class RedisBuckets:
+    """Token bucket в Redis, общий для всех воркеров."""
+
+    def __init__(self, client: RespClient) -> None:
+        self.client = client
+
+    async def take(self, key: str, rate: float, capacity: float, ttl: float) -> float:
+        try:
+            wait = await self.client.execute(
+                "EVAL",
+                TOKEN_BUCKET_SCRIPT,
+                1,
+                key,
+                rate,
+                capacity,
+                1,
+                int(ttl * 1000),
+            )
+        except (OSError, RespError, asyncio.TimeoutError) as e:
+            raise BucketStoreError(str(e)) from e
+        return float(wait)
+
+
+class RateLimiter:
+    """Ограничение частоты запросов клиента, раздельно для чтений и записей.
+
+    С общим хранилищем бакеты видят все воркеры; если оно недоступно,
+    считаем в памяти процесса, а не отказываем всем подряд.
+    """
+
+    def __init__(
+        self,
+        config: RateLimitConfig,
+        store: RedisBuckets | None = None,
+    ) -> None:
+        self.config = config
+        self.budgets = {
+            "read": (config.read_rate, config.read_burst),
+            "write": (config.write_rate, config.write_burst),
+        }
+        self.store = store
+        self.ttl = max(burst / rate for rate, burst in self.budgets.values())
+        self.local = LocalBuckets(max_keys=config.max_keys, ttl=self.ttl)
+        self.allowed = {budget: 0 for budget in self.budgets}
+        self.limited = {budget: 0 for budget in self.budgets}
+        self.backend_errors = 0
+
+    async def check(self, client_key: str, method: str) -> float:
+        """Списывает токен; возвращает, сколько секунд ждать (0 — можно)."""
+        budget = "read" if method in READ_METHODS else "write"
+        rate, burst = self.budgets[budget]
+        key = f"{budget}:{client_key}"
+
+        if self.store is not None:
+            try:
+                wait = await self.store.take(
+                    f"ratelimit:{key}",
+                    rate=rate,
+                    capacity=burst,
+                    ttl=self.ttl,
+                )
+            except BucketStoreError as e:
+                self.backend_errors += 1
+                logger.warning("Rate limit backend error: %s", e)
+                wait = self.local.take(key, rate, burst)
+        else:
+            wait = self.local.take(key, rate, burst)
+
+        if wait > 0:
+            self.limited[budget] += 1
+        else:
+            self.allowed[budget] += 1
+        return wait
+
+    def clear(self) -> None:
+        self.local.buckets.clear()
+
+    def stats(self) -> list[tuple[Mapping[str, str], Mapping[str, Any]]]:
+        return [
+            *(
+                (
+                    {"budget": budget},
+                    {"allowed": self.allowed[budget], "limited": self.limited[budget]},
+                )
+                for budget in self.budgets
+            ),
+            ({}, {"keys": len(self.local.buckets), "backend_errors": self.backend_errors}),
+        ]
+
+
+class AdmissionController:
+    """Сбрасывает нагрузку, пока БД не справляется, вместо бесконечной очереди.
+
+    Новый запрос получает 503, если процесс уже обрабатывает max_in_flight
+    запросов или недавнее ожидание соединения из пула выше max_pool_wait.
+    """
+
+    def __init__(
+        self,
+        config: AdmissionConfig,
+        engines: list[AsyncEngine],
+    ) -> None:
+        self.config = config
+        self.max_in_flight = config.max_in_flight
+        self.max_pool_wait = config.max_pool_wait
+        self.retry_after = config.retry_after
+        self.engines = engines
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed_in_flight = 0
+        self.shed_pool_wait = 0
+
+    def pool_wait(self) -> float:
+        waits = [
+            wait_stats.recent_wait()
+            for db_engine in self.engines
+            if (wait_stats := getattr(db_engine.pool, "wait_stats", None)) is not None
+        ]
+        return max(waits, default=0.0)
+
+    def admit(self) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            self.shed_in_flight += 1
+            return False
+        if self.pool_wait() >= self.max_pool_wait:
+            self.shed_pool_wait += 1
+            return False
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "pool_wait_seconds": self.pool_wait(),
+            "admitted": self.admitted,
+            "shed_in_flight": self.shed_in_flight,
+            "shed_pool_wait": self.shed_pool_wait,
+        }
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _is_event_stream(message) -> bool:
+    for name, value in message.get("headers", []):
+        if name.lower() == b"content-type":
+            return value.startswith(b"text/event-stream")
+    return False
+
+
+class RateLimitMiddleware:
+    """ASGI-middleware: 429 сверх бюджета клиента, 503 при перегрузке БД."""
+
+    def __init__(
+        self,
+        app,
+        limiter: RateLimiter,
+        admission: AdmissionController,
+        exempt_paths: list[str],
+        key_header: str | None = None,
+    ) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.admission = admission
+        self.exempt_paths = tuple(exempt_paths)
+        self.key_header = key_header.lower().encode() if key_header else None
+
+    def client_key(self, scope) -> str:
+        if self.key_header is not None:
+            for name, value in scope["headers"]:
+                if name == self.key_header:
+                    return "key:" + value.decode("latin-1")
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        # enabled проверяется на каждый запрос, как settings.cache.enabled
+        if self.limiter.config.enabled:
+            wait = await self.limiter.check(self.client_key(scope), scope["method"])
+            if wait > 0:
+                await _reject(429, "Too many requests", wait)(scope, receive, send)
+                return
+
+        if not self.admission.config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        if not self.admission.admit():
+            await _reject(
+                503,
+                "Server is overloaded",
+                self.admission.retry_after,
+            )(scope, receive, send)
+            return
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.admission.release()
+
+        async def send_releasing(message) -> None:
+            # Поток SSE после начала ответа БД не держит и слот не занимает;
+            # выгрузка NDJSON держит соединение и курсор до конца тела
+            if message["type"] == "http.response.start" and _is_event_stream(message):
+                release()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_releasing)
+        finally:
+            release()
+
+
+def create_bucket_store(config: RateLimitConfig) -> RedisBuckets | None:
+    # Общие бакеты живут в Redis кэша; с кэшем в памяти делить их не с кем
+    if config.backend == "shared" and isinstance(cache_backend, RedisBackend):
+        return RedisBuckets(cache_backend.client)
+    return None
+
+
+rate_limiter = RateLimiter(
+    settings.rate_limit,
+    store=create_bucket_store(settings.rate_limit),
+)
+admission_controller = AdmissionController(
+    settings.admission,
+    engines=[engine, *replica_router.replicas],
+)
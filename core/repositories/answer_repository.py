@@ -1,15 +1,47 @@
 import logging
+from collections import Counter
 from typing import Dict, Any
 
-from sqlalchemy import delete
+from sqlalchemy import (
+    Row,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.models.answer import Answer
+from core.models.question import Question
+from core.pagination import Keyset, KeysetPage
+from core.pubsub import question_channel
+from core.repositories.task_repository import TaskRepository
 
 logger = logging.getLogger(__name__)
 
 
 class AnswerRepository:
+    # Страницы ответов читают только колонки, без ORM-объектов
+    columns = (
+        Answer.id,
+        Answer.question_id,
+        Answer.user_id,
+        Answer.text,
+        Answer.created_at,
+    )
+    keyset = Keyset("answers", Answer.created_at, Answer.id)
+    # Ответы мягко удалённого вопроса скрыты, пока их не дочистили
+    live = exists().where(
+        Question.id == Answer.question_id,
+        Question.deleted_at.is_(None),
+    )
+
     def __init__(
         self,
         session: AsyncSession,
@@ -17,15 +49,197 @@ class AnswerRepository:
         self.session = session
 
     async def get(self, a_id: int) -> Answer | None:
-        return await self.session.get(Answer, a_id)
+        query = (
+            select(Answer)
+            .join(Question, Question.id == Answer.question_id)
+            .where(Answer.id == a_id, Question.deleted_at.is_(None))
+        )
+        result = await self.session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    async def get_many(self, ids: list[int]) -> list[Row]:
+        query = (
+            select(*self.columns)
+            .join(Question, Question.id == Answer.question_id)
+            .where(Answer.id.in_(ids), Question.deleted_at.is_(None))
+        )
+        result = await self.session.execute(query)
+
+        return list(result.all())
+
+    async def get_previews(
+        self,
+        q_ids: list[int],
+        limit: int,
+    ) -> dict[int, KeysetPage[Row]]:
+        """Первые limit ответов каждого вопроса одним запросом.
+
+        Берём limit + 1 строку на вопрос, чтобы страница знала про курсор дальше.
+        """
+        if self.session.bind.dialect.name == "postgresql":
+            # LATERAL с LIMIT идёт по индексу и не читает все ответы горячего вопроса
+            questions = select(Question.id).where(Question.id.in_(q_ids)).subquery()
+            preview = (
+                select(*self.columns)
+                .where(Answer.question_id == questions.c.id)
+                .order_by(Answer.created_at, Answer.id)
+                .limit(limit + 1)
+                .lateral("preview")
+            )
+            query = (
+                select(preview)
+                .select_from(questions)
+                .join(preview, true())
+                .order_by(preview.c.question_id, preview.c.created_at, preview.c.id)
+            )
+        else:
+            position = (
+                func.row_number()
+                .over(
+                    partition_by=Answer.question_id,
+                    order_by=(Answer.created_at, Answer.id),
+                )
+                .label("position")
+            )
+            numbered = (
+                select(*self.columns, position)
+                .where(Answer.question_id.in_(q_ids))
+                .subquery("numbered")
+            )
+            query = (
+                select(*(numbered.c[column.key] for column in self.columns))
+                .where(numbered.c.position <= limit + 1)
+                .order_by(numbered.c.question_id, numbered.c.position)
+            )
+        result = await self.session.execute(query)
+
+        rows: dict[int, list[Row]] = {q_id: [] for q_id in q_ids}
+        for row in result.all():
+            rows[row.question_id].append(row)
+        return {
+            q_id: self.keyset.page(question_rows, limit, None)
+            for q_id, question_rows in rows.items()
+        }
+
+    async def get_page(
+        self,
+        q_id: int,
+        limit: int,
+        cursor: str | None = None,
+    ) -> KeysetPage[Row]:
+        decoded_cursor = self.keyset.decode(cursor) if cursor else None
+        query = self.keyset.apply(
+            select(*self.columns).where(Answer.question_id == q_id),
+            limit,
+            decoded_cursor,
+        )
+        result = await self.session.execute(query)
+
+        return self.keyset.page(result.all(), limit, decoded_cursor)
 
     async def create(self, answer_data: Dict[str, Any]) -> Answer:
         question_model = Answer(**answer_data)
         self.session.add(question_model)
-        await self.session.commit()
+        try:
+            # id ответа нужен задаче outbox до коммита
+            await self.session.flush()
+            await self._touch_questions(Counter([answer_data["question_id"]]))
+            await self._enqueue_created([question_model])
+            await self.session.commit()
+        except IntegrityError:
+            await self.session.rollback()
+            raise
         return question_model
 
-    async def delete(self, a_id: int) -> None:
-        query = delete(Answer).where(Answer.id == a_id)
-        await self.session.execute(query)
+    async def create_many(
+        self,
+        answers_data: list[Dict[str, Any]],
+    ) -> list[Answer]:
+        if not answers_data:
+            return []
+
+        # Один многострочный INSERT ... RETURNING и один коммит на всю пачку
+        query = insert(Answer).returning(Answer, sort_by_parameter_order=True)
+        result = await self.session.scalars(query, answers_data)
+        answers = list(result.all())
+        await self._touch_questions(
+            Counter(answer_data["question_id"] for answer_data in answers_data)
+        )
+        await self._enqueue_created(answers)
         await self.session.commit()
+        return answers
+
+    async def delete(self, a_id: int) -> int | None:
+        deleted = await self.delete_many([a_id])
+        return deleted.get(a_id)
+
+    async def delete_many(self, ids: list[int]) -> dict[int, int]:
+        """Удаляет ответы одним запросом; возвращает {id ответа: id вопроса}."""
+        query = (
+            delete(Answer)
+            .where(Answer.id.in_(ids), self.live)
+            .returning(Answer.id, Answer.question_id)
+        )
+        result = await self.session.execute(query)
+        deleted = {answer_id: question_id for answer_id, question_id in result.all()}
+        if deleted:
+            answers_per_question = Counter()
+            answers_per_question.subtract(deleted.values())
+            await self._touch_questions(answers_per_question)
+            await TaskRepository(session=self.session).add(
+                "answer_deleted",
+                [
+                    (
+                        question_channel(question_id),
+                        {"id": answer_id, "question_id": question_id},
+                    )
+                    for answer_id, question_id in deleted.items()
+                ],
+            )
+        await self.session.commit()
+        return deleted
+
+    async def _enqueue_created(self, answers: list[Answer]) -> None:
+        # События потока вопроса уходят через outbox: запрос их не ждёт
+        await TaskRepository(session=self.session).add(
+            "answer_created",
+            [
+                (question_channel(answer.question_id), {"id": answer.id})
+                for answer in answers
+            ],
+        )
+
+    async def _touch_questions(self, answers_per_question: Counter) -> None:
+        # Версия и счётчики вопроса меняются в той же транзакции, что и его ответы
+        for question_id in sorted(answers_per_question):
+            delta = answers_per_question[question_id]
+            if delta > 0:
+                # now() совпадает с created_at вставленных ответов; CASE вместо
+                # GREATEST (нет в SQLite) читает уже заблокированную строку
+                last_answer_at = case(
+                    (
+                        or_(
+                            Question.last_answer_at.is_(None),
+                            Question.last_answer_at < func.now(),
+                        ),
+                        func.now(),
+                    ),
+                    else_=Question.last_answer_at,
+                )
+            else:
+                last_answer_at = (
+                    select(func.max(Answer.created_at))
+                    .where(Answer.question_id == question_id)
+                    .scalar_subquery()
+                )
+            query = (
+                update(Question)
+                .where(Question.id == question_id)
+                .values(
+                    version=Question.version + 1,
+                    answer_count=Question.answer_count + delta,
+                    last_answer_at=last_answer_at,
+                )
+            )
+            await self.session.execute(query)
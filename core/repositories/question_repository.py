@@ -1,17 +1,53 @@
 import logging
-from typing import Dict, Any
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator
 
-from sqlalchemy import select, delete
+from sqlalchemy import Row, select, delete, insert, exists, func, or_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Bundle
 
+from core.config import settings
+from core.models.answer import Answer
 from core.models.question import Question
+from core.pagination import Keyset, KeysetPage
+from core.pubsub import question_channel
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.task_repository import TaskRepository
 
 
 logger = logging.getLogger(__name__)
 
 
 class QuestionRepository:
+    # Списки и выгрузка читают только эти колонки: строки Core без identity map
+    columns = (
+        Question.id,
+        Question.text,
+        Question.created_at,
+        Question.version,
+        Question.answer_count,
+        Question.last_answer_at,
+    )
+    keyset = Keyset("questions", Question.created_at, Question.id)
+    keysets = {
+        "created_at": keyset,
+        "answer_count": Keyset(
+            "questions_by_answer_count",
+            Question.answer_count,
+            Question.id,
+            descending=True,
+        ),
+        "last_answer_at": Keyset(
+            "questions_by_last_answer_at",
+            Question.last_answer_at,
+            Question.id,
+            descending=True,
+        ),
+    }
+
+    # Мягко удалённые вопросы не видны ни одному чтению
+    live = Question.deleted_at.is_(None)
+
     def __init__(
         self,
         session: AsyncSession,
@@ -19,28 +55,279 @@ class QuestionRepository:
         self.session = session
 
     async def get_all(self) -> list[Question]:
-        query = select(Question)
+        query = select(Question).where(self.live)
         result = await self.session.execute(query)
 
         return list(result.scalars().all())
 
-    async def get(self, q_id: int) -> Question | None:
+    async def get_page(
+        self,
+        limit: int,
+        cursor: str | None = None,
+        sort: str = "created_at",
+    ) -> KeysetPage[Row]:
+        keyset = self.keysets[sort]
+        decoded_cursor = keyset.decode(cursor) if cursor else None
+        query = select(*self.columns).where(self.live)
+        if sort == "last_answer_at":
+            # Вопросы без ответов в ленту активности не попадают
+            query = query.where(Question.last_answer_at.is_not(None))
+        query = keyset.apply(query, limit, decoded_cursor)
+        result = await self.session.execute(query)
+
+        return keyset.page(result.all(), limit, decoded_cursor)
+
+    async def stream_with_answers(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> AsyncIterator[tuple[Row, Row]]:
+        # У вопроса без ответов все поля ответа равны None
         query = (
-            select(Question)
-            .options(selectinload(Question.answers))
-            .where(Question.id == q_id)
+            select(
+                Bundle("question", *self.columns),
+                Bundle("answer", *AnswerRepository.columns),
+            )
+            .outerjoin(Answer, Answer.question_id == Question.id)
+            .where(self.live)
+            .order_by(
+                Question.created_at,
+                Question.id,
+                Answer.created_at,
+                Answer.id,
+            )
+            .execution_options(yield_per=settings.export.yield_per)
         )
+        if created_from is not None:
+            query = query.where(Question.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(Question.created_at < created_to)
+
+        result = await self.session.stream(query)
+        async for question, answer in result:
+            yield question, answer
+
+    async def get(self, q_id: int) -> Question | None:
+        query = select(Question).where(Question.id == q_id, self.live)
         result = await self.session.execute(query)
 
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: list[int]) -> list[Row]:
+        query = select(*self.columns).where(Question.id.in_(ids), self.live)
+        result = await self.session.execute(query)
+
+        return list(result.all())
+
+    async def get_version(self, q_id: int) -> int | None:
+        query = select(Question.version).where(Question.id == q_id, self.live)
+        result = await self.session.execute(query)
+
+        return result.scalar_one_or_none()
+
+    async def exists(self, q_id: int) -> bool:
+        query = select(exists().where(Question.id == q_id, self.live))
+        result = await self.session.execute(query)
+
+        return bool(result.scalar())
+
     async def create(self, question_data: Dict[str, Any]) -> Question:
         question_model = Question(**question_data)
         self.session.add(question_model)
         await self.session.commit()
         return question_model
 
-    async def delete(self, q_id: int) -> None:
-        query = delete(Question).where(Question.id == q_id)
-        await self.session.execute(query)
+    async def create_many(
+        self,
+        questions_data: list[Dict[str, Any]],
+    ) -> list[Question]:
+        if not questions_data:
+            return []
+
+        # Один многострочный INSERT ... RETURNING и один коммит на всю пачку
+        query = insert(Question).returning(Question, sort_by_parameter_order=True)
+        result = await self.session.scalars(query, questions_data)
+        questions = list(result.all())
+        await self.session.commit()
+        return questions
+
+    async def delete(self, q_id: int) -> list[int]:
+        _, answer_ids = await self.delete_many([q_id])
+        return answer_ids
+
+    async def delete_many(self, ids: list[int]) -> tuple[list[int], list[int]]:
+        """Удаляет вопросы вместе с ответами сразу.
+
+        Возвращает id удалённых вопросов и их ответов (для инвалидации кэша).
+        """
+        if not ids:
+            return [], []
+
+        # Ответы мягко удалённого вопроса дочищает фоновая очистка
+        live_ids = select(Question.id).where(Question.id.in_(ids), self.live)
+        answers_query = (
+            delete(Answer)
+            .where(Answer.question_id.in_(live_ids))
+            .returning(Answer.id)
+        )
+        result = await self.session.execute(answers_query)
+        answer_ids = list(result.scalars().all())
+
+        query = (
+            delete(Question)
+            .where(Question.id.in_(ids), self.live)
+            .returning(Question.id)
+        )
+        result = await self.session.execute(query)
+        deleted_ids = list(result.scalars().all())
+        await self._enqueue_deleted(deleted_ids)
+        await self.session.commit()
+        return deleted_ids, answer_ids
+
+    async def soft_delete_many(
+        self,
+        ids: list[int],
+        min_answers: int,
+    ) -> list[int]:
+        """Помечает удалёнными вопросы, у которых не меньше min_answers ответов.
+
+        Одно UPDATE без чтения ответов: вопрос пропадает из чтений сразу,
+        ответы удаляет purge_answers. Возвращает id помеченных вопросов.
+        """
+        query = (
+            update(Question)
+            .where(
+                Question.id.in_(ids),
+                self.live,
+                Question.answer_count >= min_answers,
+            )
+            .values(deleted_at=func.now(), version=Question.version + 1)
+            .returning(Question.id)
+        )
+        result = await self.session.execute(query)
+        soft_deleted_ids = list(result.scalars().all())
+        await self._enqueue_deleted(soft_deleted_ids)
+        await self.session.commit()
+        return soft_deleted_ids
+
+    async def _enqueue_deleted(self, ids: list[int]) -> None:
+        await TaskRepository(session=self.session).add(
+            "question_deleted",
+            [(question_channel(question_id), {"id": question_id}) for question_id in ids],
+        )
+
+    async def get_purge_pending(self, limit: int) -> list[Row]:
+        """Мягко удалённые вопросы, чьи ответы ещё не дочищены, старые первыми."""
+        query = (
+            select(Question.id, Question.answer_count)
+            .where(Question.deleted_at.is_not(None))
+            .order_by(Question.deleted_at, Question.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+
+        return list(result.all())
+
+    async def purge_answers(
+        self,
+        q_id: int,
+        limit: int,
+    ) -> tuple[list[int], bool]:
+        """Удаляет очередную пачку ответов мягко удалённого вопроса.
+
+        Каждая пачка — своя короткая транзакция, поэтому после падения
+        очистка продолжается с того же места. Когда ответов не осталось,
+        удаляется и сама строка вопроса. Возвращает id удалённых ответов
+        и признак того, что вопрос удалён полностью.
+        """
+        chunk = (
+            select(Answer.id)
+            .where(Answer.question_id == q_id)
+            .order_by(Answer.id)
+            .limit(limit)
+        )
+        if self.session.bind.dialect.name == "postgresql":
+            # Несколько воркеров чистят разные пачки, а не ждут друг друга
+            chunk = chunk.with_for_update(skip_locked=True)
+        query = delete(Answer).where(Answer.id.in_(chunk)).returning(Answer.id)
+        result = await self.session.execute(query)
+        answer_ids = list(result.scalars().all())
+
+        finished = False
+        if answer_ids:
+            query = (
+                update(Question)
+                .where(Question.id == q_id)
+                .values(answer_count=Question.answer_count - len(answer_ids))
+            )
+            await self.session.execute(query)
+        if len(answer_ids) < limit:
+            query = (
+                delete(Question)
+                .where(Question.id == q_id, Question.deleted_at.is_not(None))
+                .where(~exists().where(Answer.question_id == q_id))
+                .returning(Question.id)
+            )
+            result = await self.session.execute(query)
+            finished = result.scalar_one_or_none() is not None
+        await self.session.commit()
+        return answer_ids, finished
+
+    async def reconcile_counters(
+        self,
+        after_id: int,
+        batch_size: int,
+    ) -> tuple[int | None, list[int]]:
+        """Пересчитывает счётчики ответов для следующей пачки вопросов.
+
+        Возвращает id, с которого продолжать (None — вопросы закончились),
+        и id вопросов, у которых счётчики разошлись с ответами.
+        """
+        ids_query = (
+            select(Question.id)
+            .where(Question.id > after_id)
+            .order_by(Question.id)
+            .limit(batch_size)
+        )
+        if self.session.bind.dialect.name == "postgresql":
+            # Строки вопросов блокируются до пересчёта и в порядке id, как в
+            # AnswerRepository._touch_questions. Пересчёт видит все ответы,
+            # чей +1 уже применён, а новый ответ ждёт блокировку и прибавит
+            # свой +1 к пересчитанному значению. NO KEY: вставка ответа держит
+            # KEY SHARE на вопросе, с FOR UPDATE была бы взаимоблокировка
+            ids_query = ids_query.with_for_update(key_share=True)
+        result = await self.session.execute(ids_query)
+        ids = list(result.scalars().all())
+        if not ids:
+            return None, []
+
+        answer_count = (
+            select(func.count(Answer.id))
+            .where(Answer.question_id == Question.id)
+            .scalar_subquery()
+        )
+        last_answer_at = (
+            select(func.max(Answer.created_at))
+            .where(Answer.question_id == Question.id)
+            .scalar_subquery()
+        )
+        query = (
+            update(Question)
+            .where(Question.id.between(ids[0], ids[-1]))
+            .where(
+                or_(
+                    Question.answer_count != answer_count,
+                    Question.last_answer_at.is_distinct_from(last_answer_at),
+                )
+            )
+            .values(
+                answer_count=answer_count,
+                last_answer_at=last_answer_at,
+                version=Question.version + 1,
+            )
+            .returning(Question.id)
+        )
+        result = await self.session.execute(query)
+        fixed_ids = list(result.scalars().all())
         await self.session.commit()
+        return ids[-1], fixed_ids
@@ -0,0 +1,145 @@
+import re
+
+from sqlalchemy import (
+    Float,
+    Row,
+    Select,
+    String,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.models.answer import Answer
+from core.models.question import Question
+from core.models.search import SEARCH_CONFIG
+from core.pagination import Keyset, KeysetPage
+
+
+class SearchRepository:
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        self.session = session
+
+    async def search(
+        self,
+        q: str,
+        limit: int,
+        cursor: str | None = None,
+    ) -> KeysetPage[Row]:
+        if self.session.bind.dialect.name == "postgresql":
+            hits = self._postgres_hits(q)
+        else:
+            # Каждое слово в кавычках: синтаксис запросов FTS5 пользователю недоступен
+            tokens = re.findall(r"\w+", q)
+            if not tokens:
+                return KeysetPage()
+            hits = self._sqlite_hits(" ".join(f'"{token}"' for token in tokens))
+
+        hits_subquery = hits.subquery("hits")
+        keyset = Keyset(
+            "search",
+            hits_subquery.c.rank,
+            hits_subquery.c.kind,
+            hits_subquery.c.id,
+            descending=True,
+        )
+        decoded_cursor = keyset.decode(cursor) if cursor else None
+        query = keyset.apply(select(hits_subquery), limit, decoded_cursor)
+        result = await self.session.execute(query)
+
+        return keyset.page(result.all(), limit, decoded_cursor)
+
+    @staticmethod
+    def _hits(model, kind: str, question_id, rank) -> Select:
+        return select(
+            literal(kind, String()).label("kind"),
+            model.id.label("id"),
+            question_id.label("question_id"),
+            model.text.label("text"),
+            model.created_at.label("created_at"),
+            rank.label("rank"),
+        )
+
+    @staticmethod
+    def _live(query: Select, model) -> Select:
+        # Мягко удалённый вопрос и его ответы из поиска пропадают сразу
+        if model is Answer:
+            query = query.join(Question, Question.id == Answer.question_id)
+        return query.where(Question.deleted_at.is_(None))
+
+    @staticmethod
+    def _candidates(query: Select, model, kind: str):
+        # Сначала отбираем не больше max_candidates самых новых совпадений,
+        # и только их ранжируем: иначе rank считается для каждого совпадения
+        return (
+            query.order_by(model.id.desc())
+            .limit(settings.search.max_candidates)
+            .subquery(f"{kind}_candidates")
+        )
+
+    def _postgres_hits(self, q: str) -> Select:
+        # Конфигурация литералом: так планировщик сопоставит её с индексом
+        config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+        ts_query = func.websearch_to_tsquery(config, q)
+        selects = []
+        for model, kind, question_id in (
+            (Question, "question", Question.id),
+            (Answer, "answer", Answer.question_id),
+        ):
+            vector = literal_column(f"{model.__tablename__}.search_vector")
+            candidates = self._candidates(
+                self._live(
+                    select(
+                        model.id,
+                        question_id.label("question_id"),
+                        model.text,
+                        model.created_at,
+                        vector.label("search_vector"),
+                    ).where(vector.op("@@")(ts_query)),
+                    model,
+                ),
+                model,
+                kind,
+            )
+            selects.append(
+                self._hits(
+                    candidates.c,
+                    kind,
+                    candidates.c.question_id,
+                    func.ts_rank_cd(candidates.c.search_vector, ts_query, type_=Float),
+                )
+            )
+        return union_all(*selects)
+
+    def _sqlite_hits(self, match: str) -> Select:
+        selects = []
+        for model, kind, question_id in (
+            (Question, "question", Question.id),
+            (Answer, "answer", Answer.question_id),
+        ):
+            fts_name = f"{model.__tablename__}_fts"
+            fts = table(fts_name, column("rowid"))
+            fts_ref = literal_column(fts_name)
+            # bm25 тем меньше, чем релевантнее документ
+            rank = -func.bm25(fts_ref, type_=Float)
+            candidates = self._candidates(
+                self._live(
+                    self._hits(model, kind, question_id, rank)
+                    .select_from(fts.join(model, model.id == fts.c.rowid))
+                    .where(fts_ref.op("MATCH")(match)),
+                    model,
+                ),
+                model,
+                kind,
+            )
+            selects.append(select(candidates))
+        return union_all(*selects)
@@ -0,0 +1,118 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, delete, exists, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from core.models.task import OutboxTask
+
+
+class TaskRepository:
+    columns = (
+        OutboxTask.id,
+        OutboxTask.kind,
+        OutboxTask.key,
+        OutboxTask.payload,
+        OutboxTask.attempts,
+        OutboxTask.created_at,
+    )
+
+    def __init__(
+        self,
+        session: AsyncSession,
+    ) -> None:
+        self.session = session
+
+    async def add(
+        self,
+        kind: str,
+        tasks: list[tuple[str | None, dict[str, Any]]],
+    ) -> None:
+        """Добавляет задачи (ключ, payload) в транзакцию вызывающего; без коммита."""
+        if not tasks:
+            return
+
+        await self.session.execute(
+            insert(OutboxTask),
+            [{"kind": kind, "key": key, "payload": payload} for key, payload in tasks],
+        )
+
+    async def claim(
+        self,
+        limit: int,
+        now: datetime,
+        lease_until: datetime,
+    ) -> list[Row]:
+        """Берёт готовые задачи в аренду до lease_until, в порядке id.
+
+        От каждого ключа берётся только самая ранняя живая задача, поэтому
+        задачи одного ключа выполняются строго по очереди и при нескольких
+        воркерах: следующая станет кандидатом, лишь когда предыдущую удалят.
+        """
+        # Кандидат ключа — всегда самая ранняя задача, даже если она в аренде
+        # у другого воркера: SKIP LOCKED пропустит её, но не возьмёт следующую.
+        # Если другой воркер уже закоммитил аренду, Postgres перепроверит
+        # available_at у заблокированной строки и тоже её отбросит
+        earlier = aliased(OutboxTask)
+        blocked = exists().where(
+            earlier.key == OutboxTask.key,
+            earlier.id < OutboxTask.id,
+            earlier.dead_at.is_(None),
+        )
+        ready = (
+            select(OutboxTask.id)
+            .where(OutboxTask.dead_at.is_(None), OutboxTask.available_at <= now)
+            .where(~blocked)
+            .order_by(OutboxTask.id)
+            .limit(limit)
+        )
+        if self.session.bind.dialect.name == "postgresql":
+            # Несколько воркеров берут разные задачи, а не ждут друг друга
+            ready = ready.with_for_update(skip_locked=True)
+        query = (
+            update(OutboxTask)
+            .where(OutboxTask.id.in_(ready))
+            .values(available_at=lease_until)
+            .returning(*self.columns)
+        )
+        result = await self.session.execute(query)
+        tasks = sorted(result.all(), key=lambda task: task.id)
+        await self.session.commit()
+        return tasks
+
+    async def complete(self, ids: list[int]) -> None:
+        if not ids:
+            return
+
+        await self.session.execute(delete(OutboxTask).where(OutboxTask.id.in_(ids)))
+        await self.session.commit()
+
+    async def retry(
+        self,
+        task_id: int,
+        available_at: datetime,
+        error: str,
+        dead: bool = False,
+    ) -> None:
+        values = {
+            "attempts": OutboxTask.attempts + 1,
+            "available_at": available_at,
+            "last_error": error,
+        }
+        if dead:
+            values["dead_at"] = func.now()
+        await self.session.execute(
+            update(OutboxTask).where(OutboxTask.id == task_id).values(**values)
+        )
+        await self.session.commit()
+
+    async def get_depth(self) -> tuple[int, datetime | None]:
+        """Число ждущих задач и время создания самой старой."""
+        query = select(func.count(), func.min(OutboxTask.created_at)).where(
+            OutboxTask.dead_at.is_(None)
+        )
+        result = await self.session.execute(query)
+        count, oldest = result.one()
+
+        return count, oldest
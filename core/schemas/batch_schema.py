@@ -0,0 +1,18 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class BatchResult(BaseModel, Generic[T]):
+    # Найденные записи в порядке запрошенных id
+    items: list[T]
+    missing: list[int]
+
+
+class BatchDeleteResult(BaseModel):
+    deleted: list[int]
+    missing: list[int]
+    # Удалены для чтений, ответы дочищаются в фоне
+    purging: list[int] = []
@@ -0,0 +1,37 @@
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+T = TypeVar("T")
+
+
+class BulkItemError(BaseModel):
+    index: int
+    errors: list[dict[str, Any]]
+
+
+class BulkResult(BaseModel, Generic[T]):
+    items: list[T]
+    errors: list[BulkItemError]
+
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def validate_bulk_items(
+    schema: type[M],
+    items: list[Any],
+) -> tuple[list[M], list[BulkItemError]]:
+    valid_items = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            valid_items.append(schema.model_validate(item))
+        except ValidationError as e:
+            errors.append(
+                BulkItemError(
+                    index=index,
+                    errors=e.errors(include_url=False, include_context=False),
+                )
+            )
+    return valid_items, errors
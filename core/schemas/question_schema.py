@@ -1,10 +1,14 @@
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from core.schemas.answer_schema import AnswerSchema
 
 
+QuestionSort = Literal["created_at", "answer_count", "last_answer_at"]
+
+
 class BaseQuestionSchema(BaseModel):
     text: str = Field(min_length=3)
 
@@ -16,10 +20,19 @@ class CreateQuestionSchema(BaseQuestionSchema):
 class QuestionSchema(BaseQuestionSchema):
     id: int
     created_at: datetime
+    version: int = 0
+    answer_count: int = 0
+    last_answer_at: datetime | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class QuestionSchemaWithAnswers(QuestionSchema):
     answers: list[AnswerSchema]
+    next_answers_cursor: str | None = None
+
 
+class QuestionPreviewSchema(QuestionSchema):
+    # None, если превью ответов не запрашивали
+    answers: list[AnswerSchema] | None = None
+    next_answers_cursor: str | None = None
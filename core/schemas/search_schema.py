@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchHitSchema(BaseModel):
+    kind: Literal["question", "answer"]
+    id: int
+    question_id: int
+    text: str
+    created_at: datetime
+    rank: float
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,12 +1,24 @@
 import logging
+from typing import Any
 
 from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.batching import answer_write_batcher
+from core.cache import answer_cache, question_cache
+from core.config import settings
+from core.database import is_primary_pinned_session, primary_session
+from core.logging import HOT_PATH
+from core.pagination import InvalidCursorError
 from core.repositories.answer_repository import AnswerRepository
 from core.repositories.question_repository import QuestionRepository
 
 from core.schemas.answer_schema import CreateAnswerSchema, AnswerSchema
+from core.schemas.batch_schema import BatchDeleteResult, BatchResult
+from core.schemas.bulk_schema import BulkResult, validate_bulk_items
+from core.schemas.page_schema import Page
+from core.tasks import task_worker
 
 
 logger = logging.getLogger(__name__)
@@ -14,6 +26,7 @@ logger = logging.getLogger(__name__)
 
 class AnswerService:
     def __init__(self, session: AsyncSession) -> None:
+        self.session = session
         self.answer_repository = AnswerRepository(session=session)
         self.question_repository = QuestionRepository(session=session)
 
@@ -22,35 +35,147 @@ class AnswerService:
         question_id: int,
         answer_data: CreateAnswerSchema,
     ) -> AnswerSchema:
-        question = await self.question_repository.get(q_id=question_id)
+        await self.check_question(question_id=question_id)
+        return await self.add_answer(question_id=question_id, answer_data=answer_data)
 
-        if not question:
+    async def check_question(
+        self,
+        question_id: int,
+    ) -> None:
+        if not await self.question_repository.exists(q_id=question_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Question not found",
             )
 
+    async def add_answer(
+        self,
+        question_id: int,
+        answer_data: CreateAnswerSchema,
+    ) -> AnswerSchema:
+        """Записывает ответ к вопросу, уже проверенному check_question.
+
+        С пакетной записью сессия сервиса не используется: ответ пишет
+        соединение пачки.
+        """
+        # Текст пользователя в лог не пишем: только длину
         logger.info(
-            "Creating answer, text=%s",
-            answer_data.text,
+            "Creating answer, question_id=%s, text_length=%s",
+            question_id,
+            len(answer_data.text),
+            extra=HOT_PATH,
         )
         answer_data_dict = answer_data.model_dump()
         answer_data_dict["question_id"] = question_id
 
-        answer = await self.answer_repository.create(
-            answer_data=answer_data_dict,
+        try:
+            if settings.write_batch.enabled:
+                answer = await answer_write_batcher.create(
+                    answer_data=answer_data_dict,
+                )
+            else:
+                answer = await self.answer_repository.create(
+                    answer_data=answer_data_dict,
+                )
+        except IntegrityError:
+            # Вопрос удалили между проверкой и вставкой
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found",
+            )
+        # Событие потока уже в outbox; кэш сбрасываем сразу ради чтения своей записи
+        task_worker.wake()
+        await question_cache.invalidate(question_id)
+        result = AnswerSchema.model_validate(answer)
+        logger.info(
+            "Answer created successfully, answer_id=%s",
+            answer.id,
+            extra=HOT_PATH,
+        )
+
+        return result
+
+    async def create_answers(
+        self,
+        question_id: int,
+        answers_data: list[Any],
+    ) -> BulkResult[AnswerSchema]:
+        if not await self.question_repository.exists(q_id=question_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found",
+            )
+
+        valid_answers, errors = validate_bulk_items(
+            CreateAnswerSchema,
+            answers_data,
         )
         logger.info(
-            "Answer created successfully",
+            "Creating answers in bulk, count=%s, invalid=%s",
+            len(valid_answers),
+            len(errors),
+            extra=HOT_PATH,
         )
 
-        return AnswerSchema.model_validate(answer)
+        answers = await self.answer_repository.create_many(
+            answers_data=[
+                {**answer.model_dump(), "question_id": question_id}
+                for answer in valid_answers
+            ],
+        )
+
+        if answers:
+            task_worker.wake()
+        await question_cache.invalidate(question_id)
+        items = [AnswerSchema.model_validate(answer) for answer in answers]
+        logger.info(
+            "Answers created successfully",
+            extra=HOT_PATH,
+        )
+        return BulkResult[AnswerSchema](items=items, errors=errors)
 
     async def get_answer(
         self,
         answer_id: int,
     ) -> AnswerSchema:
-        answer = await self.answer_repository.get(a_id=answer_id)
+        if not settings.cache.enabled:
+            return await self._load_answer(self.session, answer_id=answer_id)
+
+        return await answer_cache.get_or_load(
+            answer_id,
+            lambda: self._fill_answer(answer_id=answer_id),
+            local=not is_primary_pinned_session(self.session),
+        )
+
+    async def get_answers_batch(
+        self,
+        ids: list[int],
+    ) -> BatchResult[AnswerSchema]:
+        rows = {row.id: row for row in await self.answer_repository.get_many(ids)}
+
+        return BatchResult[AnswerSchema](
+            items=[
+                AnswerSchema.model_validate(rows[answer_id])
+                for answer_id in ids
+                if answer_id in rows
+            ],
+            missing=[answer_id for answer_id in ids if answer_id not in rows],
+        )
+
+    async def _fill_answer(
+        self,
+        answer_id: int,
+    ) -> AnswerSchema:
+        # Как и вопрос, кэш заполняется только с primary
+        async with primary_session(self.session) as session:
+            return await self._load_answer(session, answer_id=answer_id)
+
+    async def _load_answer(
+        self,
+        session: AsyncSession,
+        answer_id: int,
+    ) -> AnswerSchema:
+        answer = await AnswerRepository(session=session).get(a_id=answer_id)
 
         if answer is None:
             raise HTTPException(
@@ -60,10 +185,54 @@ class AnswerService:
 
         return AnswerSchema.model_validate(answer)
 
+    async def get_answers(
+        self,
+        question_id: int,
+        limit: int,
+        cursor: str | None = None,
+    ) -> Page[AnswerSchema]:
+        if not await self.question_repository.exists(q_id=question_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found",
+            )
+
+        try:
+            page = await self.answer_repository.get_page(
+                q_id=question_id,
+                limit=limit,
+                cursor=cursor,
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        return Page[AnswerSchema](
+            items=[AnswerSchema.model_validate(answer) for answer in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
+
     async def delete_answer(
         self,
         answer_id: int,
     ) -> None:
-        logger.warning("Deleting answer, answer_id=%s", answer_id)
-        await self.answer_repository.delete(a_id=answer_id)
-        logger.info("Answer deleted")
+        await self.delete_answers(ids=[answer_id])
+
+    async def delete_answers(
+        self,
+        ids: list[int],
+    ) -> BatchDeleteResult:
+        logger.warning("Deleting answers, count=%s", len(ids))
+        deleted = await self.answer_repository.delete_many(ids=ids)
+        if deleted:
+            task_worker.wake()
+        await answer_cache.invalidate(*ids)
+        await question_cache.invalidate(*set(deleted.values()))
+        logger.info("Answers deleted, deleted=%s", len(deleted))
+        return BatchDeleteResult(
+            deleted=[answer_id for answer_id in ids if answer_id in deleted],
+            missing=[answer_id for answer_id in ids if answer_id not in deleted],
+        )
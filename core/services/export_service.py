@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime
+from typing import AsyncIterator
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.repositories.question_repository import QuestionRepository
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.question_schema import QuestionSchema
+
+logger = logging.getLogger(__name__)
+
+
+class ExportService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.question_repository = QuestionRepository(session=session)
+
+    async def export_questions(
+        self,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> AsyncIterator[bytes]:
+        logger.info(
+            "Exporting questions, created_from=%s, created_to=%s",
+            created_from,
+            created_to,
+        )
+        buffer = bytearray()
+        current_question_id = None
+
+        rows = self.question_repository.stream_with_answers(
+            created_from=created_from,
+            created_to=created_to,
+        )
+        async for question, answer in rows:
+            if question.id != current_question_id:
+                current_question_id = question.id
+                buffer += b'{"type":"question","data":'
+                buffer += to_json(QuestionSchema.model_validate(question))
+                buffer += b"}\n"
+
+            if answer.id is not None:
+                buffer += b'{"type":"answer","data":'
+                buffer += to_json(AnswerSchema.model_validate(answer))
+                buffer += b"}\n"
+
+            # Отдаем данные крупными кусками, а не по строке на каждую запись
+            if len(buffer) >= settings.export.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+        logger.info("Export finished")
@@ -1,29 +1,48 @@
 import logging
+from typing import Any
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import answer_cache, question_cache
+from core.config import settings
+from core.database import is_primary_pinned_session, primary_session
+from core.logging import HOT_PATH
+from core.pagination import InvalidCursorError
+from core.purge import question_purger
+from core.repositories.answer_repository import AnswerRepository
 from core.repositories.question_repository import QuestionRepository
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.batch_schema import BatchDeleteResult, BatchResult
+from core.schemas.bulk_schema import BulkResult, validate_bulk_items
+from core.schemas.page_schema import Page
 from core.schemas.question_schema import (
     CreateQuestionSchema,
+    QuestionPreviewSchema,
     QuestionSchema,
     QuestionSchemaWithAnswers,
+    QuestionSort,
 )
+from core.tasks import task_worker
 
 logger = logging.getLogger(__name__)
 
 
 class QuestionService:
     def __init__(self, session: AsyncSession) -> None:
+        self.session = session
         self.question_repository = QuestionRepository(session=session)
+        self.answer_repository = AnswerRepository(session=session)
 
     async def create_question(
         self,
         question_data: CreateQuestionSchema,
     ) -> QuestionSchema:
+        # Текст пользователя в лог не пишем: только длину
         logger.info(
-            "Creating question text=%s",
-            question_data.text,
+            "Creating question, text_length=%s",
+            len(question_data.text),
+            extra=HOT_PATH,
         )
         question_data_dict = question_data.model_dump()
 
@@ -32,15 +51,118 @@ class QuestionService:
         )
 
         logger.info(
-            "Question created successfully",
+            "Question created successfully, question_id=%s",
+            question.id,
+            extra=HOT_PATH,
         )
         return QuestionSchema.model_validate(question)
 
+    async def create_questions(
+        self,
+        questions_data: list[Any],
+    ) -> BulkResult[QuestionSchema]:
+        valid_questions, errors = validate_bulk_items(
+            CreateQuestionSchema,
+            questions_data,
+        )
+        logger.info(
+            "Creating questions in bulk, count=%s, invalid=%s",
+            len(valid_questions),
+            len(errors),
+            extra=HOT_PATH,
+        )
+
+        questions = await self.question_repository.create_many(
+            questions_data=[question.model_dump() for question in valid_questions],
+        )
+
+        logger.info(
+            "Questions created successfully",
+            extra=HOT_PATH,
+        )
+        return BulkResult[QuestionSchema](
+            items=[QuestionSchema.model_validate(question) for question in questions],
+            errors=errors,
+        )
+
     async def get_question(
         self,
         question_id: int,
     ) -> QuestionSchemaWithAnswers:
-        question = await self.question_repository.get(
+        if not settings.cache.enabled:
+            return await self._load_question(self.session, question_id=question_id)
+
+        # Только что писавший клиент не читает локальные копии: их сброс
+        # с других воркеров приходит с задержкой
+        return await question_cache.get_or_load(
+            question_id,
+            lambda: self._fill_question(question_id=question_id),
+            local=not is_primary_pinned_session(self.session),
+        )
+
+    async def get_questions_batch(
+        self,
+        ids: list[int],
+        preview: int = 0,
+    ) -> BatchResult[QuestionPreviewSchema]:
+        rows = {row.id: row for row in await self.question_repository.get_many(ids)}
+        found = [question_id for question_id in ids if question_id in rows]
+
+        previews = {}
+        if preview and found:
+            previews = await self.answer_repository.get_previews(found, limit=preview)
+
+        items = []
+        for question_id in found:
+            question = QuestionPreviewSchema.model_validate(rows[question_id])
+            if question_id in previews:
+                page = previews[question_id]
+                question.answers = [
+                    AnswerSchema.model_validate(answer) for answer in page.items
+                ]
+                question.next_answers_cursor = page.next_cursor
+            items.append(question)
+
+        return BatchResult[QuestionPreviewSchema](
+            items=items,
+            missing=[question_id for question_id in ids if question_id not in rows],
+        )
+
+    async def get_question_version(
+        self,
+        question_id: int,
+    ) -> int:
+        # Версия из локального кэша не требует запроса в БД
+        if settings.cache.enabled and not is_primary_pinned_session(self.session):
+            cached = question_cache.local.get(question_id)
+            if cached is not None:
+                return cached.version
+
+        version = await self.question_repository.get_version(q_id=question_id)
+
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found",
+            )
+
+        return version
+
+    async def _fill_question(
+        self,
+        question_id: int,
+    ) -> QuestionSchemaWithAnswers:
+        # Промах кэша читаем с primary: с реплики в кэш попали бы данные
+        # старше инвалидации, а кэшем пользуются все клиенты
+        async with primary_session(self.session) as session:
+            return await self._load_question(session, question_id=question_id)
+
+    async def _load_question(
+        self,
+        session: AsyncSession,
+        question_id: int,
+    ) -> QuestionSchemaWithAnswers:
+        question = await QuestionRepository(session=session).get(
             q_id=question_id,
         )
 
@@ -50,18 +172,83 @@ class QuestionService:
                 detail="Question not found",
             )
 
-        return QuestionSchemaWithAnswers.model_validate(question)
+        answers = await AnswerRepository(session=session).get_page(
+            q_id=question_id,
+            limit=settings.pagination.answers_preview_limit,
+        )
+
+        return QuestionSchemaWithAnswers(
+            **QuestionSchema.model_validate(question).model_dump(),
+            answers=[AnswerSchema.model_validate(answer) for answer in answers.items],
+            next_answers_cursor=answers.next_cursor,
+        )
 
     async def get_questions(
         self,
-    ) -> list[QuestionSchema]:
-        questions = await self.question_repository.get_all()
-        return [QuestionSchema.model_validate(question) for question in questions]
+        limit: int,
+        cursor: str | None = None,
+        sort: QuestionSort = "created_at",
+    ) -> Page[QuestionSchema]:
+        try:
+            page = await self.question_repository.get_page(
+                limit=limit,
+                cursor=cursor,
+                sort=sort,
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        return Page[QuestionSchema](
+            items=[QuestionSchema.model_validate(question) for question in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
 
     async def delete_question(
         self,
         question_id: int,
     ) -> None:
-        logger.warning("Deleting question, question_id=%s", question_id)
-        await self.question_repository.delete(q_id=question_id)
-        logger.info("Question deleted")
+        await self.delete_questions(ids=[question_id])
+
+    async def delete_questions(
+        self,
+        ids: list[int],
+    ) -> BatchDeleteResult:
+        """Удаляет вопросы; с большим числом ответов — мягко.
+
+        Такие вопросы пропадают из чтений сразу, а их ответы удаляет
+        фоновая очистка пачками: один запрос не держит блокировки на
+        всех ответах горячего вопроса.
+        """
+        logger.warning("Deleting questions, count=%s", len(ids))
+        purging = await self.question_repository.soft_delete_many(
+            ids=ids,
+            min_answers=settings.purge.soft_delete_min_answers,
+        )
+        purging_set = set(purging)
+        deleted, answer_ids = await self.question_repository.delete_many(
+            ids=[question_id for question_id in ids if question_id not in purging_set],
+        )
+        if purging:
+            question_purger.wake()
+
+        gone = purging_set.union(deleted)
+        if gone:
+            task_worker.wake()
+        await question_cache.invalidate(*gone)
+        await answer_cache.invalidate(*answer_ids)
+        # Ответы мягко удалённых вопросов ещё в БД: сбрасываем их по вопросу
+        await answer_cache.invalidate_scopes(*purging)
+        logger.info(
+            "Questions deleted, deleted=%s, purging=%s",
+            len(gone),
+            len(purging),
+        )
+        return BatchDeleteResult(
+            deleted=[question_id for question_id in ids if question_id in gone],
+            missing=[question_id for question_id in ids if question_id not in gone],
+            purging=[question_id for question_id in ids if question_id in purging_set],
+        )
@@ -0,0 +1,40 @@
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.pagination import InvalidCursorError
+from core.repositories.search_repository import SearchRepository
+from core.schemas.page_schema import Page
+from core.schemas.search_schema import SearchHitSchema
+
+logger = logging.getLogger(__name__)
+
+
+class SearchService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.search_repository = SearchRepository(session=session)
+
+    async def search(
+        self,
+        q: str,
+        limit: int,
+        cursor: str | None = None,
+    ) -> Page[SearchHitSchema]:
+        try:
+            page = await self.search_repository.search(
+                q=q,
+                limit=limit,
+                cursor=cursor,
+            )
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+        return Page[SearchHitSchema](
+            items=[SearchHitSchema.model_validate(hit) for hit in page.items],
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
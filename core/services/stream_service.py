@@ -0,0 +1,51 @@
+import asyncio
+import logging
+from typing import AsyncIterator
+
+from core.config import settings
+from core.pubsub import Broker, Event, broker, question_channel
+
+logger = logging.getLogger(__name__)
+
+# Через сколько мс браузерный EventSource переподключается после обрыва
+RETRY_MS = 3000
+
+
+def encode_sse(event: Event) -> bytes:
+    lines = [b"event: " + event.name.encode()]
+    if event.id is not None:
+        lines.append(b"id: %d" % event.id)
+    lines.append(b"data: " + event.data)
+    return b"\n".join(lines) + b"\n\n"
+
+
+class StreamService:
+    def __init__(
+        self,
+        event_broker: Broker = broker,
+        heartbeat: float = settings.stream.heartbeat_seconds,
+    ) -> None:
+        self.broker = event_broker
+        self.heartbeat = heartbeat
+
+    async def question_events(self, question_id: int) -> AsyncIterator[bytes]:
+        """События вопроса в формате text/event-stream.
+
+        Первое событие — ready: после него клиенту стоит перечитать вопрос,
+        дальше изменения приходят сами. Комментарии-пинги держат соединение
+        через прокси и позволяют заметить ушедшего клиента.
+        """
+        async with self.broker.subscribe(question_channel(question_id)) as subscription:
+            logger.debug("Stream opened, question_id=%s", question_id)
+            yield b"retry: %d\n\n" % RETRY_MS + encode_sse(Event("ready"))
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+
+                yield encode_sse(event)
+                if event.name == "question_deleted":
+                    return
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from pydantic_core import to_json
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import TasksConfig, settings
+from core.database import async_session
+from core.pubsub import Event, broker, question_channel
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.task_repository import TaskRepository
+from core.schemas.answer_schema import AnswerSchema
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[AsyncSession, dict[str, Any]], Awaitable[None]]
+
+
+def answer_created(answer: AnswerSchema) -> Event:
+    return Event("answer_created", id=answer.id, data=to_json(answer))
+
+
+async def publish_answer_created(session: AsyncSession, payload: dict[str, Any]) -> None:
+    rows = await AnswerRepository(session=session).get_many([payload["id"]])
+    # Ответ успели удалить: об этом скажет следующее событие вопроса
+    for row in rows:
+        await broker.publish(
+            question_channel(row.question_id),
+            answer_created(AnswerSchema.model_validate(row)),
+        )
+
+
+async def publish_answer_deleted(session: AsyncSession, payload: dict[str, Any]) -> None:
+    await broker.publish(
+        question_channel(payload["question_id"]),
+        Event("answer_deleted", id=payload["id"], data=to_json(payload)),
+    )
+
+
+async def publish_question_deleted(session: AsyncSession, payload: dict[str, Any]) -> None:
+    await broker.publish(
+        question_channel(payload["id"]),
+        Event("question_deleted", id=payload["id"], data=to_json(payload)),
+    )
+
+
+HANDLERS: dict[str, TaskHandler] = {
+    "answer_created": publish_answer_created,
+    "answer_deleted": publish_answer_deleted,
+    "question_deleted": publish_question_deleted,
+}
+
+
+def backoff(attempts: int, base: float, maximum: float) -> float:
+    """Пауза перед повтором: base, 2·base, 4·base... но не больше maximum."""
+    return min(base * 2 ** (attempts - 1), maximum)
+
+
+class TaskWorker:
+    """Выполняет задачи из таблицы outbox_tasks.
+
+    Задачи пишутся в той же транзакции, что и основная запись, поэтому
+    ни одна не теряется, а запрос не ждёт их выполнения. Воркер берёт
+    пачку в аренду, выполняет не больше concurrency задач одновременно
+    (задачи одного ключа — строго по очереди) и удаляет выполненные. Упавшая
+    задача повторяется с экспоненциальной паузой, после max_attempts
+    остаётся в таблице с dead_at.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        config: TasksConfig,
+        handlers: dict[str, TaskHandler] = HANDLERS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.config = config
+        self.handlers = handlers
+        self._semaphore = asyncio.Semaphore(config.concurrency)
+        self._wakeup = asyncio.Event()
+        self.processed = 0
+        self.failed = 0
+        self.dead = 0
+        self.batches = 0
+        self.running = 0
+        self.pending = 0
+        self.oldest_pending_seconds = 0.0
+        self.last_lag_seconds = 0.0
+        self.max_lag_seconds = 0.0
+
+    def wake(self) -> None:
+        """Взять новые задачи сразу, не дожидаясь следующего опроса."""
+        self._wakeup.set()
+
+    async def run_once(self) -> int:
+        """Выполняет все готовые задачи; возвращает число выполненных."""
+        done = 0
+        while True:
+            now = datetime.now(timezone.utc)
+            async with self.session_factory() as session:
+                tasks = await TaskRepository(session=session).claim(
+                    limit=self.config.batch_size,
+                    now=now,
+                    lease_until=now + timedelta(seconds=self.config.lease_seconds),
+                )
+            if not tasks:
+                return done
+
+            self.batches += 1
+            # В пачке не больше одной задачи на ключ, их можно выполнять вместе
+            errors = await asyncio.gather(*(self._run_task(task) for task in tasks))
+            completed_ids = []
+            for task, error in zip(tasks, errors):
+                if error is None:
+                    completed_ids.append(task.id)
+                else:
+                    await self._fail(task, error)
+            async with self.session_factory() as session:
+                await TaskRepository(session=session).complete(completed_ids)
+            done += len(completed_ids)
+
+    async def _run_task(self, task: Row) -> str | None:
+        handler = self.handlers.get(task.kind)
+        if handler is None:
+            return f"Unknown task kind: {task.kind}"
+
+        async with self._semaphore:
+            self.running += 1
+            try:
+                async with self.session_factory() as session:
+                    await handler(session, task.payload)
+            except Exception as e:
+                logger.warning(
+                    "Task failed, task_id=%s, kind=%s, attempt=%s: %s",
+                    task.id,
+                    task.kind,
+                    task.attempts + 1,
+                    e,
+                )
+                return repr(e)
+            finally:
+                self.running -= 1
+
+        self.processed += 1
+        lag = (datetime.now(timezone.utc) - _as_utc(task.created_at)).total_seconds()
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        return None
+
+    async def _fail(self, task: Row, error: str) -> None:
+        attempts = task.attempts + 1
+        dead = attempts >= self.config.max_attempts
+        retry_at = datetime.now(timezone.utc) + timedelta(
+            seconds=backoff(attempts, self.config.backoff_base, self.config.backoff_max)
+        )
+        self.failed += 1
+        if dead:
+            self.dead += 1
+            logger.error(
+                "Task gave up after %s attempts, task_id=%s, kind=%s",
+                attempts,
+                task.id,
+                task.kind,
+            )
+        async with self.session_factory() as session:
+            await TaskRepository(session=session).retry(
+                task.id,
+                available_at=retry_at,
+                error=error,
+                dead=dead,
+            )
+
+    async def update_depth(self) -> None:
+        """Обновляет pending и oldest_pending_seconds.
+
+        count(*) по очереди — только по запросу /metrics или отчёта воркера,
+        а не на каждом пустом опросе.
+        """
+        try:
+            async with self.session_factory() as session:
+                self.pending, oldest = await TaskRepository(session=session).get_depth()
+        except Exception as e:
+            logger.warning("Task queue depth query failed: %s", e)
+            return
+        self.oldest_pending_seconds = (
+            (datetime.now(timezone.utc) - _as_utc(oldest)).total_seconds()
+            if oldest is not None
+            else 0.0
+        )
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Task worker iteration failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.config.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "dead": self.dead,
+            "batches": self.batches,
+            "running": self.running,
+            "pending": self.pending,
+            "oldest_pending_seconds": self.oldest_pending_seconds,
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+        }
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite возвращает время без зоны; хранится оно в UTC
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+task_worker = TaskWorker(session_factory=async_session, config=settings.tasks)
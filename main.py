@@ -1,34 +1,86 @@
-import logging
+import asyncio
 
 import uvicorn
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 
+from api.responses import PydanticJSONResponse
 from api.views.answer_view import router as answer_router
+from api.views.export_view import router as export_router
 from api.views.question_view import router as question_router
-from core.database import dispose
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s:%(lineno)d | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[
-        # logging.FileHandler("/app/logs/bot.log", encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
+from api.views.search_view import router as search_router
+from core.batching import answer_write_batcher
+from core.cache import answer_cache, cache_backend, invalidation_listener, question_cache
+from core.config import settings
+from core.database import dispose, engine, replica_router
+from core.logging import setup_logging
+from core.metrics import (
+    MetricsMiddleware,
+    instrument_engine,
+    render_exposition,
+    render_gauges,
+    render_histograms,
+    request_metrics,
 )
+from core.pool import pool_stats
+from core.pubsub import broker
+from core.purge import question_purger
+from core.ratelimit import RateLimitMiddleware, admission_controller, rate_limiter
+from core.tasks import task_worker
+
+# Вывод логов — в отдельном потоке, обработчики запросов только кладут запись в очередь
+log_pipeline = setup_logging(settings.logging)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    background_tasks = [
+        asyncio.create_task(invalidation_listener.run()),
+        asyncio.create_task(broker.run()),
+        asyncio.create_task(question_purger.run()),
+    ]
+    if settings.tasks.embedded:
+        background_tasks.append(asyncio.create_task(task_worker.run()))
+    if replica_router.replicas:
+        background_tasks.append(
+            asyncio.create_task(replica_router.run_health_checks())
+        )
+
     yield
+
+    for task in background_tasks:
+        task.cancel()
+    await answer_write_batcher.close()
+    await cache_backend.close()
     await dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=PydanticJSONResponse)
+
+# Добавляется раньше метрик, чтобы 429/503 тоже попадали в счётчики запросов
+app.add_middleware(
+    RateLimitMiddleware,
+    limiter=rate_limiter,
+    admission=admission_controller,
+    exempt_paths=settings.rate_limit.exempt_paths,
+    key_header=settings.rate_limit.key_header,
+)
+
+if settings.metrics.enabled:
+    for db_engine in (engine, *replica_router.replicas):
+        instrument_engine(db_engine)
+    app.add_middleware(
+        MetricsMiddleware,
+        metrics=request_metrics,
+        slow_request_seconds=settings.metrics.slow_request_seconds,
+        debug_headers=settings.metrics.debug_headers,
+    )
 
 app.include_router(question_router)
 app.include_router(answer_router)
+app.include_router(export_router)
+app.include_router(search_router)
 
 
 @app.get("/health")
@@ -36,6 +88,42 @@ def healthcheck():
     return {"msg": "healthy"}
 
 
+@app.get("/health/pool")
+def pool_healthcheck():
+    return pool_stats(engine)
+
+
+# async: статистику меняет цикл событий, читать её из пула потоков нельзя
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    pools = [({"engine": "primary"}, pool_stats(engine))]
+    for index, replica in enumerate(replica_router.replicas):
+        pools.append(({"engine": f"replica{index}"}, pool_stats(replica)))
+    await task_worker.update_depth()
+    caches = [
+        ({"cache": "question"}, question_cache.stats()),
+        ({"cache": "answer"}, answer_cache.stats()),
+    ]
+    sections = [
+        request_metrics.render(),
+        render_gauges("qa_db_pool", pools),
+        render_gauges("qa_cache", caches),
+        render_gauges("qa_write_batch", [({}, answer_write_batcher.stats.snapshot())]),
+        render_histograms("qa_write_batch_size", [({}, answer_write_batcher.stats.batch_size)]),
+        render_gauges("qa_logging", [({}, log_pipeline.stats())]),
+        render_gauges("qa_stream", [({}, broker.stats())]),
+        render_gauges("qa_purge", [({}, question_purger.stats())]),
+        render_gauges("qa_tasks", [({}, task_worker.stats())]),
+        render_gauges("qa_rate_limit", rate_limiter.stats()),
+        render_gauges("qa_admission", [({}, admission_controller.stats())]),
+    ]
+
+    return PlainTextResponse(
+        render_exposition(sections),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
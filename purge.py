@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import logging
+
+from core.cache import cache_backend
+from core.config import settings
+from core.database import async_session, dispose
+from core.logging import setup_logging
+from core.purge import QuestionPurger
+
+logger = logging.getLogger(__name__)
+
+
+async def main(chunk_size: int) -> None:
+    purger = QuestionPurger(
+        session_factory=async_session,
+        chunk_size=chunk_size,
+        poll_interval=settings.purge.poll_interval,
+    )
+    try:
+        purged = await purger.run_once()
+        logger.info(
+            "Purge finished, questions=%d, answers=%d",
+            purged,
+            purger.purged_answers,
+        )
+    finally:
+        await cache_backend.close()
+        await dispose()
+
+
+if __name__ == "__main__":
+    setup_logging(settings.logging)
+    parser = argparse.ArgumentParser(
+        description="Дочистка ответов мягко удалённых вопросов",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.purge.chunk_size,
+    )
+    args = parser.parse_args()
+    asyncio.run(main(chunk_size=args.chunk_size))
@@ -0,0 +1,63 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.cache import cache_backend, question_cache
+from core.config import settings
+from core.database import async_session, dispose
+from core.logging import setup_logging
+from core.repositories.question_repository import QuestionRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile_question_counters(
+    session_factory: async_sessionmaker[AsyncSession],
+    batch_size: int,
+) -> list[int]:
+    """Чинит answer_count/last_answer_at по фактическим ответам, пачками по id."""
+    fixed_ids: list[int] = []
+    after_id: int | None = 0
+
+    while after_id is not None:
+        async with session_factory() as session:
+            repository = QuestionRepository(session=session)
+            after_id, batch_fixed_ids = await repository.reconcile_counters(
+                after_id=after_id,
+                batch_size=batch_size,
+            )
+        if batch_fixed_ids:
+            logger.warning(
+                "Reconciled answer counters for %d questions up to id=%s",
+                len(batch_fixed_ids),
+                after_id,
+            )
+            await question_cache.invalidate(*batch_fixed_ids)
+            fixed_ids.extend(batch_fixed_ids)
+
+    return fixed_ids
+
+
+async def main(batch_size: int) -> None:
+    try:
+        fixed_ids = await reconcile_question_counters(async_session, batch_size)
+        logger.info("Reconciliation finished, fixed %d questions", len(fixed_ids))
+    finally:
+        await cache_backend.close()
+        await dispose()
+
+
+if __name__ == "__main__":
+    setup_logging(settings.logging)
+    parser = argparse.ArgumentParser(
+        description="Пересчёт денормализованных счётчиков ответов у вопросов",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.bulk.max_batch_size,
+    )
+    args = parser.parse_args()
+    asyncio.run(main(batch_size=args.batch_size))
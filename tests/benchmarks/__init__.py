@@ -0,0 +1 @@
+# Бенчмарки: запускаются вручную, pytest их не собирает
@@ -0,0 +1,72 @@
+"""Сравнение отчёта бенчмарка с сохранённым baseline.
+
+Отчёт — JSON с разделом "results": {имя: {"p50_ms": ..., ...}}.
+Регрессия — метрика выросла больше чем на tolerance (0.2 = +20%).
+"""
+import json
+from pathlib import Path
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def save(path: Path, report: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+
+def compare(
+    report: dict,
+    baseline: dict,
+    metric: str = "p50_ms",
+    tolerance: float = 0.2,
+) -> dict:
+    rows = {}
+    regressions = []
+    for name, current in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or not previous.get(metric):
+            rows[name] = {"current": current[metric], "baseline": None}
+            continue
+
+        ratio = current[metric] / previous[metric]
+        rows[name] = {
+            "current": current[metric],
+            "baseline": previous[metric],
+            "ratio": ratio,
+        }
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+
+    return {
+        "metric": metric,
+        "tolerance": tolerance,
+        "results": rows,
+        "missing": sorted(set(baseline["results"]) - set(report["results"])),
+        "regressions": regressions,
+    }
+
+
+def check(report: dict, args) -> int:
+    """Общая обработка --save-baseline / --baseline; возвращает код выхода."""
+    if args.save_baseline:
+        save(Path(args.save_baseline), report)
+    if not args.baseline:
+        return 0
+
+    comparison = compare(
+        report,
+        load(Path(args.baseline)),
+        metric=args.metric,
+        tolerance=args.tolerance,
+    )
+    report["comparison"] = comparison
+    return 1 if comparison["regressions"] else 0
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--baseline", help="JSON-отчёт, с которым сравнить прогон")
+    parser.add_argument("--save-baseline", help="Сохранить отчёт как baseline")
+    parser.add_argument("--metric", default="p50_ms")
+    parser.add_argument("--tolerance", type=float, default=0.2)
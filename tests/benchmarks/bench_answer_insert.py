@@ -0,0 +1,107 @@
+"""Задержка вставки ответа в зависимости от числа уже существующих ответов.
+
+    python -m tests.benchmarks.bench_answer_insert --sizes 0,1000,10000,50000
+"""
+import argparse
+import asyncio
+import json
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from core.models.question import Question
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+from core.schemas.answer_schema import CreateAnswerSchema
+from core.services.answer_service import AnswerService
+from tests.benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    make_engine,
+    reset_schema,
+    summarize,
+    timer,
+)
+
+
+async def seed_question(session_factory, answers_count: int) -> int:
+    async with session_factory() as session:
+        question = await QuestionRepository(session=session).create(
+            {"text": "Benchmark question"}
+        )
+        answer_repository = AnswerRepository(session=session)
+        for start in range(0, answers_count, 1000):
+            await answer_repository.create_many([
+                {
+                    "question_id": question.id,
+                    "user_id": "bench",
+                    "text": f"Answer {i}",
+                }
+                for i in range(start, min(start + 1000, answers_count))
+            ])
+        return question.id
+
+
+async def insert_with_exists(session_factory, question_id: int, samples: list[float]):
+    async with session_factory() as session:
+        with timer(samples):
+            await AnswerService(session=session).create_answer(
+                question_id=question_id,
+                answer_data=CreateAnswerSchema(text="New answer", user_id="bench"),
+            )
+
+
+async def insert_with_eager_load(session_factory, question_id: int, samples: list[float]):
+    # Прежний путь: проверка вопроса через загрузку всех его ответов
+    async with session_factory() as session:
+        with timer(samples):
+            query = (
+                select(Question)
+                .options(selectinload(Question.answers))
+                .where(Question.id == question_id)
+            )
+            (await session.execute(query)).scalar_one()
+            await AnswerRepository(session=session).create({
+                "question_id": question_id,
+                "user_id": "bench",
+                "text": "New answer",
+            })
+
+
+async def main(url: str, sizes: list[int], inserts: int) -> None:
+    engine = make_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await reset_schema(engine)
+
+    report = []
+    for size in sizes:
+        question_id = await seed_question(session_factory, size)
+        exists_samples: list[float] = []
+        eager_samples: list[float] = []
+        for _ in range(inserts):
+            await insert_with_exists(session_factory, question_id, exists_samples)
+            await insert_with_eager_load(session_factory, question_id, eager_samples)
+        report.append({
+            "answers_per_question": size,
+            "exists": summarize(exists_samples),
+            "eager_load": summarize(eager_samples),
+        })
+
+    await engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--sizes", default="0,1000,10000,50000")
+    parser.add_argument("--inserts", type=int, default=100)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(
+            url=args.url,
+            sizes=[int(size) for size in args.sizes.split(",")],
+            inserts=args.inserts,
+        )
+    )
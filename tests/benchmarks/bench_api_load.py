@@ -0,0 +1,396 @@
+"""Нагрузка на все маршруты api/views конкурентными асинхронными клиентами.
+
+    python -m tests.benchmarks.bench_api_load --questions 10000 --answers-mean 5 \\
+        --distribution zipf --requests 500 --concurrency 20
+
+По умолчанию приложение вызывается в процессе (httpx + ASGITransport) поверх
+временного файла SQLite; Postgres — через --url. С --base-url запросы идут
+в запущенный сервер, а --url должен указывать на его БД (схема не пересоздаётся).
+Отчёт — JSON с пропускной способностью и p50/p95/p99 по каждому маршруту.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.batching import answer_write_batcher
+from core.config import settings
+from core.database import get_read_session, get_session
+from core.pubsub import Event, broker, question_channel
+from core.purge import question_purger
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+from core.tasks import task_worker
+from main import app
+from tests.benchmarks import baseline
+from tests.benchmarks.common import make_engine, reset_schema, summarize
+from tests.benchmarks.seed import DISTRIBUTIONS, SeedResult, WORDS, seed
+
+
+@dataclass
+class LoadContext:
+    session_factory: async_sessionmaker[AsyncSession]
+    seeded: SeedResult
+    rng: random.Random
+    # id, которые можно удалить: создаются перед фазой DELETE
+    disposable: list[int] = field(default_factory=list)
+
+    def question_id(self) -> int:
+        return self.rng.choice(self.seeded.question_ids)
+
+    def answer_id(self) -> int:
+        return self.rng.choice(self.seeded.answer_ids)
+
+
+Request = Callable[[AsyncClient, LoadContext], Awaitable[Response]]
+Setup = Callable[[LoadContext, int], Awaitable[None]]
+
+
+@dataclass
+class Scenario:
+    method: str
+    path: str
+    request: Request
+    setup: Setup | None = None
+    # Доля от --requests: выгрузка целиком намного тяжелее остальных запросов
+    share: float = 1.0
+    # Сценарий использует брокер событий этого процесса
+    in_process: bool = False
+    # Сколько записей из setup расходует один запрос
+    per_request: int = 1
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def _answer(ctx: LoadContext) -> dict:
+    return {"text": " ".join(ctx.rng.choices(WORDS, k=12)), "user_id": "bench"}
+
+
+async def _create_disposable_questions(ctx: LoadContext, count: int) -> None:
+    async with ctx.session_factory() as session:
+        questions = await QuestionRepository(session=session).create_many(
+            [{"text": f"Disposable question {i}"} for i in range(count)]
+        )
+    ctx.disposable = [question.id for question in questions]
+
+
+async def _create_disposable_answers(ctx: LoadContext, count: int) -> None:
+    async with ctx.session_factory() as session:
+        answers = await AnswerRepository(session=session).create_many(
+            [{**_answer(ctx), "question_id": ctx.question_id()} for _ in range(count)]
+        )
+    ctx.disposable = [answer.id for answer in answers]
+
+
+def _pop_ids(ctx: LoadContext, count: int) -> str:
+    return ",".join(str(ctx.disposable.pop()) for _ in range(count))
+
+
+async def _stream_until_deleted(client: AsyncClient, ctx: LoadContext) -> Response:
+    # Открытие потока и доставка события до клиента; вопрос дальше не нужен
+    question_id = ctx.disposable.pop()
+    channel = question_channel(question_id)
+    stream = asyncio.create_task(client.get(f"/api/questions/{question_id}/stream"))
+    while not broker.has_subscribers(channel) and not stream.done():
+        await asyncio.sleep(0)
+    await broker.publish(channel, Event("question_deleted", id=question_id))
+    return await stream
+
+
+BATCH_DELETE_SIZE = 50
+
+# Порядок важен: сначала чтения, потом записи, удаления — в конце
+SCENARIOS = [
+    Scenario(
+        "GET", "/api/questions/",
+        lambda client, ctx: client.get(
+            "/api/questions/",
+            params={"sort": ctx.rng.choice(["created_at", "answer_count", "last_answer_at"])},
+        ),
+    ),
+    Scenario(
+        "GET", "/api/questions/{id}",
+        lambda client, ctx: client.get(f"/api/questions/{ctx.question_id()}"),
+    ),
+    Scenario(
+        "GET", "/api/questions/batch",
+        lambda client, ctx: client.get(
+            "/api/questions/batch",
+            params={
+                "ids": ",".join(str(ctx.question_id()) for _ in range(50)),
+                "preview": 3,
+            },
+        ),
+    ),
+    Scenario(
+        "GET", "/api/questions/{question_id}/answers/",
+        lambda client, ctx: client.get(f"/api/questions/{ctx.question_id()}/answers/"),
+    ),
+    Scenario(
+        "GET", "/api/answers/{answer_id}",
+        lambda client, ctx: client.get(f"/api/answers/{ctx.answer_id()}"),
+    ),
+    Scenario(
+        "GET", "/api/answers/batch",
+        lambda client, ctx: client.get(
+            "/api/answers/batch",
+            params={"ids": ",".join(str(ctx.answer_id()) for _ in range(50))},
+        ),
+    ),
+    Scenario(
+        "GET", "/api/search",
+        lambda client, ctx: client.get(
+            "/api/search", params={"q": " ".join(ctx.rng.sample(WORDS, 2))}
+        ),
+    ),
+    Scenario(
+        "GET", "/api/export/questions",
+        lambda client, ctx: client.get("/api/export/questions"),
+        share=0.02,
+    ),
+    Scenario(
+        "GET", "/api/questions/{id}/stream",
+        _stream_until_deleted,
+        setup=_create_disposable_questions,
+        in_process=True,
+    ),
+    Scenario(
+        "POST", "/api/questions/",
+        lambda client, ctx: client.post(
+            "/api/questions/", json={"text": " ".join(ctx.rng.choices(WORDS, k=6))}
+        ),
+    ),
+    Scenario(
+        "POST", "/api/questions/bulk",
+        lambda client, ctx: client.post(
+            "/api/questions/bulk",
+            json=[{"text": f"Bulk question {i}"} for i in range(100)],
+        ),
+        share=0.1,
+    ),
+    Scenario(
+        "POST", "/api/questions/{question_id}/answers/",
+        lambda client, ctx: client.post(
+            f"/api/questions/{ctx.question_id()}/answers/", json=_answer(ctx)
+        ),
+    ),
+    Scenario(
+        "POST", "/api/questions/{question_id}/answers/bulk",
+        lambda client, ctx: client.post(
+            f"/api/questions/{ctx.question_id()}/answers/bulk",
+            json=[_answer(ctx) for _ in range(100)],
+        ),
+        share=0.1,
+    ),
+    Scenario(
+        "DELETE", "/api/answers/{answer_id}",
+        lambda client, ctx: client.delete(f"/api/answers/{ctx.disposable.pop()}"),
+        setup=_create_disposable_answers,
+    ),
+    Scenario(
+        "DELETE", "/api/answers/batch",
+        lambda client, ctx: client.delete(
+            "/api/answers/batch", params={"ids": _pop_ids(ctx, BATCH_DELETE_SIZE)}
+        ),
+        setup=_create_disposable_answers,
+        share=0.1,
+        per_request=BATCH_DELETE_SIZE,
+    ),
+    Scenario(
+        "DELETE", "/api/questions/{id}",
+        lambda client, ctx: client.delete(f"/api/questions/{ctx.disposable.pop()}"),
+        setup=_create_disposable_questions,
+    ),
+    Scenario(
+        "DELETE", "/api/questions/batch",
+        lambda client, ctx: client.delete(
+            "/api/questions/batch", params={"ids": _pop_ids(ctx, BATCH_DELETE_SIZE)}
+        ),
+        setup=_create_disposable_questions,
+        share=0.1,
+        per_request=BATCH_DELETE_SIZE,
+    ),
+]
+
+
+def check_coverage(app) -> None:
+    """Каждый маршрут из api/views должен иметь сценарий."""
+    covered = {scenario.name for scenario in SCENARIOS}
+    missing = [
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.endpoint.__module__.startswith("api.views")
+        for method in route.methods
+        if f"{method} {route.path}" not in covered
+    ]
+    if missing:
+        raise SystemExit(f"No load scenario for routes: {', '.join(sorted(missing))}")
+
+
+async def run_scenario(
+    client: AsyncClient,
+    ctx: LoadContext,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+) -> dict:
+    requests = max(1, int(requests * scenario.share))
+    if scenario.setup is not None:
+        await scenario.setup(ctx, requests * scenario.per_request)
+
+    samples: list[float] = []
+    errors: dict[str, int] = {}
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await scenario.request(client, ctx)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            samples.append(time.perf_counter() - started)
+            if not status.startswith("2"):
+                errors[status] = errors.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        **summarize(samples),
+        "errors": errors,
+        "throughput_rps": len(samples) / elapsed,
+    }
+
+
+async def main(args) -> int:
+    if args.base_url and not args.url:
+        raise SystemExit("--base-url requires --url of the server database for seeding")
+    url = args.url or f"sqlite+aiosqlite:///{Path(tempfile.mkdtemp()) / 'qa_bench.db'}"
+    engine = make_engine(url)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    check_coverage(app)
+    settings.cache.enabled = not args.no_cache
+    settings.write_batch.enabled = args.write_batch
+    # Все запросы нагрузки идут от одного клиента: лимиты включаются явно
+    settings.rate_limit.enabled = args.rate_limit
+    settings.admission.enabled = args.rate_limit
+
+    background_tasks = []
+    if args.base_url:
+        client = AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        await reset_schema(engine)
+
+        async def override_get_session():
+            async with session_factory() as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_read_session] = override_get_session
+        answer_write_batcher.session_factory = session_factory
+        # Фоновые задачи приложения работают в том же процессе, как в lifespan
+        task_worker.session_factory = session_factory
+        question_purger.session_factory = session_factory
+        background_tasks = [
+            asyncio.create_task(task_worker.run()),
+            asyncio.create_task(question_purger.run()),
+        ]
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://bench")
+
+    seeded = await seed(
+        session_factory,
+        questions=args.questions,
+        answers_mean=args.answers_mean,
+        distribution=args.distribution,
+        max_answers=args.max_answers,
+        seed=args.seed,
+    )
+    ctx = LoadContext(
+        session_factory=session_factory,
+        seeded=seeded,
+        rng=random.Random(args.seed),
+    )
+
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if not args.routes or any(part in scenario.name for part in args.routes)
+        if not (scenario.in_process and args.base_url)
+    ]
+    results = {}
+    async with client:
+        # Прогрев: компиляция запросов и кэш схем FastAPI не должны попасть в замер
+        for scenario in scenarios:
+            if scenario.setup is None:
+                await scenario.request(client, ctx)
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(
+                client, ctx, scenario, args.requests, args.concurrency
+            )
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await engine.dispose()
+
+    report = {
+        "config": {
+            "url": engine.url.render_as_string(hide_password=True),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "cache": not args.no_cache,
+            "write_batch": args.write_batch,
+            "rate_limit": args.rate_limit,
+            "seed": seeded.summary(),
+        },
+        "results": results,
+    }
+    if background_tasks:
+        # Отставание событий от записи: задачи outbox выполняются вне запроса
+        report["tasks"] = task_worker.stats()
+    exit_code = baseline.check(report, args)
+    print(json.dumps(report, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="БД; по умолчанию временный файл SQLite")
+    parser.add_argument("--base-url", help="Адрес запущенного сервера")
+    parser.add_argument("--questions", type=int, default=1000)
+    parser.add_argument("--answers-mean", type=float, default=5)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="zipf")
+    parser.add_argument("--max-answers", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--routes", nargs="*", help="Подстроки имён маршрутов")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--write-batch", action="store_true")
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="Включить лимиты клиента и admission control (429/503 попадут в errors)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main(args)))
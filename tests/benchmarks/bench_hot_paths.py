@@ -0,0 +1,176 @@
+"""Микробенчмарки горячих путей репозиториев и сериализации.
+
+    python -m tests.benchmarks.bench_hot_paths --questions 10000
+    python -m tests.benchmarks.bench_hot_paths --baseline tests/benchmarks/baselines/hot_paths_sqlite.json
+
+Время — на одну операцию: каждая серия из --iterations вызовов даёт один замер.
+С --baseline отчёт сравнивается с сохранённым, при регрессии код выхода 1.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import sys
+import time
+from typing import Callable
+
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.conditional import make_etag
+from core.config import settings
+from core.pagination import Cursor
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+from core.repositories.search_repository import SearchRepository
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.page_schema import Page
+from core.schemas.question_schema import QuestionSchema
+from core.services.question_service import QuestionService
+from tests.benchmarks import baseline
+from tests.benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    make_engine,
+    reset_schema,
+    summarize,
+)
+from tests.benchmarks.seed import DISTRIBUTIONS, seed
+
+PAGE_SIZE = 20
+
+
+async def build_benchmarks(session_factory, seeded) -> dict[str, Callable]:
+    # Самый «горячий» вопрос — с наибольшим числом ответов
+    hot_id = max(
+        zip(seeded.answers_per_question, seeded.question_ids),
+    )[1]
+
+    async with session_factory() as session:
+        page = await QuestionRepository(session=session).get_page(limit=PAGE_SIZE)
+        answers = await AnswerRepository(session=session).get_page(
+            q_id=hot_id, limit=PAGE_SIZE
+        )
+    rows = page.items
+    schemas = [QuestionSchema.model_validate(row) for row in rows]
+    answer_schemas = [AnswerSchema.model_validate(row) for row in answers.items]
+    keyset = QuestionRepository.keyset
+    token = keyset.encode(Cursor(values=keyset._key(rows[-1])))
+
+    async def with_session(call):
+        async with session_factory() as session:
+            await call(session)
+
+    return {
+        "keyset_encode": lambda: keyset.encode(Cursor(values=keyset._key(rows[-1]))),
+        "keyset_decode": lambda: keyset.decode(token),
+        "question_rows_validate": lambda: [
+            QuestionSchema.model_validate(row) for row in rows
+        ],
+        "answer_rows_validate": lambda: [
+            AnswerSchema.model_validate(row) for row in answers.items
+        ],
+        "question_page_to_json": lambda: to_json(
+            Page[QuestionSchema](items=schemas, next_cursor=token)
+        ),
+        "answer_page_to_json": lambda: to_json(
+            Page[AnswerSchema](items=answer_schemas, next_cursor=token)
+        ),
+        "page_etag": lambda: make_etag(
+            "questions", *(f"{q.id}.{q.version}" for q in schemas), token, None
+        ),
+        "repo_questions_page": lambda: with_session(
+            lambda s: QuestionRepository(session=s).get_page(limit=PAGE_SIZE)
+        ),
+        "repo_questions_page_cursor": lambda: with_session(
+            lambda s: QuestionRepository(session=s).get_page(limit=PAGE_SIZE, cursor=token)
+        ),
+        "repo_questions_by_answer_count": lambda: with_session(
+            lambda s: QuestionRepository(session=s).get_page(
+                limit=PAGE_SIZE, sort="answer_count"
+            )
+        ),
+        "repo_hot_answers_page": lambda: with_session(
+            lambda s: AnswerRepository(session=s).get_page(q_id=hot_id, limit=PAGE_SIZE)
+        ),
+        "repo_question_version": lambda: with_session(
+            lambda s: QuestionRepository(session=s).get_version(hot_id)
+        ),
+        "service_question_uncached": lambda: with_session(
+            lambda s: QuestionService(session=s).get_question(question_id=hot_id)
+        ),
+        "repo_search": lambda: with_session(
+            lambda s: SearchRepository(session=s).search("python cache", PAGE_SIZE)
+        ),
+    }
+
+
+async def measure(call, iterations: int, repeats: int) -> dict:
+    samples: list[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            result = call()
+            if inspect.isawaitable(result):
+                await result
+        samples.append((time.perf_counter() - started) / iterations)
+    return summarize(samples)
+
+
+async def main(args) -> int:
+    engine = make_engine(args.url)
+    session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    await reset_schema(engine)
+    seeded = await seed(
+        session_factory,
+        questions=args.questions,
+        answers_mean=args.answers_mean,
+        distribution=args.distribution,
+        seed=args.seed,
+    )
+    settings.cache.enabled = False
+
+    benchmarks = await build_benchmarks(session_factory, seeded)
+    results = {}
+    for name, call in benchmarks.items():
+        if args.only and not any(part in name for part in args.only):
+            continue
+        # Прогрев: кэш компиляции запросов и схем сериализации
+        await measure(call, iterations=10, repeats=1)
+        # Быстрым операциям нужно больше итераций, чтобы серия не была шумом
+        iterations = args.iterations
+        if not name.startswith(("repo_", "service_")):
+            iterations *= 100
+        results[name] = await measure(call, iterations, args.repeats)
+
+    await engine.dispose()
+
+    report = {
+        "config": {
+            "url": engine.url.render_as_string(hide_password=True),
+            "iterations": args.iterations,
+            "repeats": args.repeats,
+            "seed": seeded.summary(),
+        },
+        "results": results,
+    }
+    exit_code = baseline.check(report, args)
+    print(json.dumps(report, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--questions", type=int, default=10000)
+    parser.add_argument("--answers-mean", type=float, default=5)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="zipf")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--only", nargs="*", help="Подстроки имён бенчмарков")
+    parser.add_argument("--seed", type=int, default=0)
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main(args)))
@@ -0,0 +1,89 @@
+"""Сериализация страницы из 1000 ответов: путь FastAPI против PydanticJSONResponse.
+
+    python -m tests.benchmarks.bench_json_response --items 1000 --requests 200
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from api.responses import json_response
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.page_schema import Page
+from tests.benchmarks.common import summarize, timer
+
+
+def make_page(items: int) -> Page[AnswerSchema]:
+    created_at = datetime.now(timezone.utc)
+    return Page[AnswerSchema](
+        items=[
+            AnswerSchema(
+                id=i,
+                question_id=1,
+                user_id="bench",
+                text=f"Answer number {i} with some text",
+                created_at=created_at,
+            )
+            for i in range(items)
+        ],
+        next_cursor="cursor",
+    )
+
+
+def make_app(page: Page[AnswerSchema]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default")
+    async def default() -> Page[AnswerSchema]:
+        return page
+
+    @app.get("/fast", response_model=Page[AnswerSchema])
+    async def fast() -> Response:
+        return json_response(page)
+
+    return app
+
+
+async def measure(client: AsyncClient, path: str, requests: int) -> list[float]:
+    samples: list[float] = []
+    for _ in range(requests):
+        with timer(samples):
+            response = await client.get(path)
+        response.raise_for_status()
+    return samples
+
+
+async def main(items: int, requests: int) -> None:
+    page = make_page(items)
+    transport = ASGITransport(app=make_app(page))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        default_body = (await client.get("/default")).json()
+        fast_body = (await client.get("/fast")).json()
+        assert default_body == fast_body
+
+        # Прогрев, затем попеременные замеры
+        await measure(client, "/default", 10)
+        await measure(client, "/fast", 10)
+        default_samples = await measure(client, "/default", requests)
+        fast_samples = await measure(client, "/fast", requests)
+
+    default_summary = summarize(default_samples)
+    fast_summary = summarize(fast_samples)
+    print(json.dumps({
+        "items": items,
+        "fastapi_default": default_summary,
+        "pydantic_json_response": fast_summary,
+        "speedup_p50": default_summary["p50_ms"] / fast_summary["p50_ms"],
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(items=args.items, requests=args.requests))
@@ -0,0 +1,95 @@
+"""Листинг вопросов: ORM-объекты против строк Core с нужными колонками.
+
+    python -m tests.benchmarks.bench_list_rows --questions 10000 --repeats 20
+"""
+import argparse
+import asyncio
+import json
+import tracemalloc
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core.models.question import Question
+from core.repositories.question_repository import QuestionRepository
+from core.schemas.question_schema import QuestionSchema
+from tests.benchmarks.common import (
+    DEFAULT_DATABASE_URL,
+    make_engine,
+    reset_schema,
+    summarize,
+    timer,
+)
+
+
+async def seed_questions(session_factory, count: int) -> None:
+    async with session_factory() as session:
+        repository = QuestionRepository(session=session)
+        for start in range(0, count, 1000):
+            await repository.create_many([
+                {"text": f"Benchmark question {i}"}
+                for i in range(start, min(start + 1000, count))
+            ])
+
+
+async def list_orm(session_factory, limit: int) -> list[QuestionSchema]:
+    # Прежний путь: ORM-сущности и from_attributes по каждому атрибуту
+    async with session_factory() as session:
+        query = QuestionRepository.keyset.apply(select(Question), limit, None)
+        result = await session.execute(query)
+        questions = result.scalars().all()[:limit]
+        return [QuestionSchema.model_validate(question) for question in questions]
+
+
+async def list_rows(session_factory, limit: int) -> list[QuestionSchema]:
+    async with session_factory() as session:
+        page = await QuestionRepository(session=session).get_page(limit=limit)
+        return [QuestionSchema.model_validate(row) for row in page.items]
+
+
+async def measure(list_questions, session_factory, limit: int, repeats: int) -> dict:
+    samples: list[float] = []
+    for _ in range(repeats):
+        with timer(samples):
+            items = await list_questions(session_factory, limit)
+        assert len(items) == limit
+
+    tracemalloc.start()
+    await list_questions(session_factory, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {**summarize(samples), "peak_alloc_kib": peak / 1024}
+
+
+async def main(url: str, questions: int, repeats: int) -> None:
+    engine = make_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    await reset_schema(engine)
+    await seed_questions(session_factory, questions)
+
+    # Прогрев кэшей компиляции запросов
+    await list_orm(session_factory, questions)
+    await list_rows(session_factory, questions)
+
+    report = {
+        "questions": questions,
+        "orm": await measure(list_orm, session_factory, questions, repeats),
+        "rows": await measure(list_rows, session_factory, questions, repeats),
+    }
+    report["speedup_p50"] = report["orm"]["p50_ms"] / report["rows"]["p50_ms"]
+
+    await engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--questions", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(url=args.url, questions=args.questions, repeats=args.repeats)
+    )
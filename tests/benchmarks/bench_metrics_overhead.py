@@ -0,0 +1,89 @@
+"""Накладные расходы MetricsMiddleware и обработчиков событий движка.
+
+    python -m tests.benchmarks.bench_metrics_overhead --requests 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from sqlalchemy import text
+
+from core.metrics import (
+    MetricsMiddleware,
+    QueryStats,
+    RequestMetrics,
+    current_query_stats,
+    instrument_engine,
+)
+from tests.benchmarks.common import make_engine
+
+
+class Route:
+    path = "/api/questions/{id}"
+
+
+async def app(scope, receive, send):
+    scope["route"] = Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def send(message):
+    pass
+
+
+async def per_request_seconds(asgi_app, requests: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/api/questions/1"}
+    started = time.perf_counter()
+    for _ in range(requests):
+        await asgi_app(dict(scope), None, send)
+    return (time.perf_counter() - started) / requests
+
+
+async def per_query_seconds(engine, queries: int) -> float:
+    async with engine.connect() as conn:
+        started = time.perf_counter()
+        for _ in range(queries):
+            await conn.execute(text("SELECT 1"))
+        return (time.perf_counter() - started) / queries
+
+
+async def main(requests: int, queries: int, rounds: int) -> None:
+    middleware = MetricsMiddleware(app, metrics=RequestMetrics(), slow_request_seconds=10.0)
+    # Прогрев
+    await per_request_seconds(app, 1000)
+    await per_request_seconds(middleware, 1000)
+    bare = await per_request_seconds(app, requests)
+    instrumented = await per_request_seconds(middleware, requests)
+
+    # Запросы через aiosqlite шумят сильнее самих обработчиков, поэтому
+    # движки чередуются, а из раундов берётся минимум
+    plain_engine, instrumented_engine = make_engine(), make_engine()
+    instrument_engine(instrumented_engine)
+    token = current_query_stats.set(QueryStats())
+    plain_rounds, instrumented_rounds = [], []
+    for _ in range(rounds):
+        plain_rounds.append(await per_query_seconds(plain_engine, queries))
+        instrumented_rounds.append(await per_query_seconds(instrumented_engine, queries))
+    current_query_stats.reset(token)
+    await plain_engine.dispose()
+    await instrumented_engine.dispose()
+    plain_query, instrumented_query = min(plain_rounds), min(instrumented_rounds)
+
+    print(json.dumps({
+        "middleware_overhead_us": (instrumented - bare) * 1e6,
+        "bare_request_us": bare * 1e6,
+        "query_event_overhead_us": (instrumented_query - plain_query) * 1e6,
+        "plain_query_us": plain_query * 1e6,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=7)
+    args = parser.parse_args()
+
+    asyncio.run(main(requests=args.requests, queries=args.queries, rounds=args.rounds))
@@ -0,0 +1,118 @@
+"""Наполнение БД для бенчмарков: N вопросов и распределение числа ответов."""
+import random
+from dataclasses import dataclass, field
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.models.task import OutboxTask
+
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+
+DISTRIBUTIONS = ("fixed", "uniform", "zipf")
+
+CHUNK_SIZE = 1000
+
+WORDS = (
+    "python", "database", "index", "query", "cache", "async", "pool",
+    "latency", "cursor", "replica", "search", "export", "schema", "token",
+)
+
+
+@dataclass
+class SeedResult:
+    question_ids: list[int] = field(default_factory=list)
+    answer_ids: list[int] = field(default_factory=list)
+    answers_per_question: list[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        counts = sorted(self.answers_per_question)
+        return {
+            "questions": len(self.question_ids),
+            "answers": len(self.answer_ids),
+            "max_answers_per_question": counts[-1] if counts else 0,
+            "median_answers_per_question": counts[len(counts) // 2] if counts else 0,
+        }
+
+
+def answer_counts(
+    questions: int,
+    mean: float,
+    distribution: str,
+    max_answers: int,
+    rng: random.Random,
+) -> list[int]:
+    """Число ответов на каждый вопрос.
+
+    fixed — ровно mean, uniform — от 0 до 2*mean,
+    zipf — тяжёлый хвост: большинство вопросов почти без ответов, немногие «горячие».
+    """
+    if distribution == "fixed":
+        counts = [round(mean)] * questions
+    elif distribution == "uniform":
+        counts = [rng.randint(0, round(2 * mean)) for _ in range(questions)]
+    elif distribution == "zipf":
+        # Парето с alpha=1.5 и средним alpha/(alpha-1) = 3, масштабируем к mean
+        alpha = 1.5
+        scale = mean / (alpha / (alpha - 1))
+        counts = [int(rng.paretovariate(alpha) * scale) for _ in range(questions)]
+    else:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    return [min(count, max_answers) for count in counts]
+
+
+def _text(rng: random.Random, prefix: str, index: int) -> str:
+    return f"{prefix} {index}: " + " ".join(rng.choices(WORDS, k=8))
+
+
+async def seed(
+    session_factory: async_sessionmaker[AsyncSession],
+    questions: int,
+    answers_mean: float = 5,
+    distribution: str = "zipf",
+    max_answers: int = 1000,
+    seed: int = 0,
+) -> SeedResult:
+    rng = random.Random(seed)
+    result = SeedResult(
+        answers_per_question=answer_counts(
+            questions, answers_mean, distribution, max_answers, rng
+        ),
+    )
+
+    async with session_factory() as session:
+        last_task_id = await session.scalar(select(func.max(OutboxTask.id)))
+
+    async with session_factory() as session:
+        repository = QuestionRepository(session=session)
+        for start in range(0, questions, CHUNK_SIZE):
+            created = await repository.create_many([
+                {"text": _text(rng, "Question", i)}
+                for i in range(start, min(start + CHUNK_SIZE, questions))
+            ])
+            result.question_ids.extend(question.id for question in created)
+
+    answers = [
+        {
+            "question_id": question_id,
+            "user_id": f"user-{rng.randrange(1000)}",
+            "text": _text(rng, "Answer", index),
+        }
+        for question_id, count in zip(result.question_ids, result.answers_per_question)
+        for index in range(count)
+    ]
+    async with session_factory() as session:
+        repository = AnswerRepository(session=session)
+        for start in range(0, len(answers), CHUNK_SIZE):
+            created = await repository.create_many(answers[start:start + CHUNK_SIZE])
+            result.answer_ids.extend(answer.id for answer in created)
+
+    # События о наполнении никому не нужны и не должны нагружать воркер во время замера
+    async with session_factory() as session:
+        await session.execute(
+            delete(OutboxTask).where(OutboxTask.id > (last_task_id or 0))
+        )
+        await session.commit()
+
+    return result
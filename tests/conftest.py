@@ -1,4 +1,5 @@
 import pytest
+from contextlib import contextmanager
 from typing import AsyncGenerator
 
 import pytest_asyncio
@@ -10,10 +11,14 @@ from sqlalchemy.ext.asyncio import (
 )
 from httpx import AsyncClient
 
+from core.cache import MemoryBackend, answer_cache, cache_backend, question_cache
+from core.metrics import count_queries, instrument_engine
 from core.models.base import Base
+from core.ratelimit import admission_controller, rate_limiter
 
-from core.database import get_session
+from core.database import get_read_session, get_session
 from main import app
+from tests.fake_redis import FakeRedisServer
 
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -31,12 +36,72 @@ test_engine = create_async_engine(
     TEST_DATABASE_URL,
 )
 
+# Метрики запроса (число и время SQL) считаются и на тестовом движке
+instrument_engine(test_engine)
+
 TestSessionLocal = async_sessionmaker(
     test_engine,
     expire_on_commit=False,
 )
 
 
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest_asyncio.fixture
+async def redis_server() -> AsyncGenerator[FakeRedisServer, None]:
+    server = FakeRedisServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    question_cache.local.clear()
+    answer_cache.local.clear()
+    if isinstance(cache_backend, MemoryBackend):
+        cache_backend.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # Все тесты ходят с одного адреса: без сброса бюджет кончится посреди прогона
+    yield
+    rate_limiter.clear()
+    admission_controller.in_flight = 0
+
+
+@pytest.fixture
+def max_queries():
+    """Проверяет, что блок выполнил не больше limit SQL-запросов.
+
+        with max_queries(2):
+            await client.get("/api/questions/1")
+    """
+
+    @contextmanager
+    def guard(limit: int):
+        with count_queries(test_engine) as stats:
+            yield stats
+        assert stats.queries <= limit, (
+            f"Expected at most {limit} SQL statements, got {stats.queries}"
+        )
+
+    return guard
+
+
 @pytest_asyncio.fixture
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
@@ -50,12 +115,20 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest_asyncio.fixture
+async def session_factory(
+    db_session: AsyncSession,
+) -> async_sessionmaker[AsyncSession]:
+    return TestSessionLocal
+
+
 @pytest_asyncio.fixture
 async def client(db_session: AsyncSession) -> AsyncClient:
     async def override_get_session():
         yield db_session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+from core.cache.resp import read_reply
+from core.ratelimit import TOKEN_BUCKET_SCRIPT, take_tokens
+
+
+def encode_reply(value) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, bool):
+        return b"+OK\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(v) for v in value)
+    raise TypeError(value)
+
+
+class FakeRedisServer:
+    """Внутрипроцессный сервер с подмножеством команд Redis для тестов.
+
+    Lua здесь нет: EVAL выполняет только известные скрипты их копией на Python.
+    Сам Lua-скрипт проверяется на настоящем Redis (TEST_REDIS_URL).
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, tuple[float | None, bytes]] = {}
+        self.subscribers: dict[bytes, set[asyncio.StreamWriter]] = {}
+        self.commands: list[bytes] = []
+        self.password: bytes | None = None
+        # Пауза перед ответом: имитация медленной сети
+        self.delay = 0.0
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        for writers in self.subscribers.values():
+            for writer in writers:
+                writer.close()
+        await self.server.wait_closed()
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _token_bucket(self, keys: list[bytes], argv: list[bytes]) -> bytes:
+        rate, capacity, cost = (float(arg) for arg in argv[:3])
+        now = time.time()
+        state = self._get(keys[0])
+        tokens, updated = map(float, state.split(b":")) if state else (capacity, now)
+        tokens, wait = take_tokens(tokens, updated, now, rate, capacity, cost)
+        expires_at = time.monotonic() + int(argv[3]) / 1000
+        self.data[keys[0]] = (expires_at, b"%r:%r" % (tokens, now))
+        return repr(wait).encode()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                command = await read_reply(reader)
+                name, args = command[0].upper(), command[1:]
+                self.commands.append(name)
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(self._execute(name, args, writer))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            for writers in self.subscribers.values():
+                writers.discard(writer)
+            writer.close()
+
+    def _execute(self, name: bytes, args: list[bytes], writer) -> bytes:
+        if name == b"AUTH" and self.password is not None and args[-1] != self.password:
+            return b"-WRONGPASS invalid password\r\n"
+        if name in (b"PING", b"SELECT", b"AUTH"):
+            return encode_reply(True)
+        if name == b"GET":
+            return encode_reply(self._get(args[0]))
+        if name == b"MGET":
+            return encode_reply([self._get(key) for key in args])
+        if name == b"SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expires_at = time.monotonic() + int(args[3]) / 1000
+            self.data[args[0]] = (expires_at, args[1])
+            return encode_reply(True)
+        if name == b"INCR":
+            entry = self.data.get(args[0], (None, b"0"))
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (entry[0], str(value).encode())
+            return encode_reply(value)
+        if name == b"PEXPIRE":
+            value = self._get(args[0])
+            if value is None:
+                return encode_reply(0)
+            self.data[args[0]] = (time.monotonic() + int(args[1]) / 1000, value)
+            return encode_reply(1)
+        if name == b"EVAL":
+            script = {TOKEN_BUCKET_SCRIPT.encode(): self._token_bucket}.get(args[0])
+            if script is None:
+                return b"-ERR fake server does not run this script\r\n"
+            keys_count = int(args[1])
+            keys, argv = args[2:2 + keys_count], args[2 + keys_count:]
+            return encode_reply(script(keys, argv))
+        if name == b"DEL":
+            return encode_reply(sum(self.data.pop(key, None) is not None for key in args))
+        if name == b"PUBLISH":
+            subscribers = self.subscribers.get(args[0], set())
+            for subscriber in subscribers:
+                subscriber.write(encode_reply([b"message", args[0], args[1]]))
+            return encode_reply(len(subscribers))
+        if name == b"SUBSCRIBE":
+            self.subscribers.setdefault(args[0], set()).add(writer)
+            return encode_reply([b"subscribe", args[0], 1])
+        return b"-ERR unknown command\r\n"
@@ -1,9 +1,12 @@
 import pytest
 from httpx import AsyncClient
 
+from core.batching import answer_write_batcher
+from core.config import settings
+
 
 @pytest.mark.asyncio
-async def test_create_answer_api(client: AsyncClient):
+async def test_create_answer_api(client: AsyncClient, max_queries):
     """Тест создания ответа через API"""
 
     # Сначала создаем вопрос
@@ -13,11 +16,12 @@ async def test_create_answer_api(client: AsyncClient):
     )
     question_id = question_response.json()["id"]
     
-    # Создаем ответ
-    response = await client.post(
-        f"/api/questions/{question_id}/answers/",
-        json={"text": "Python is a programming language", "user_id": "user-123"}
-    )
+    # Создаем ответ: проверка вопроса, INSERT, счётчики, задача outbox
+    with max_queries(4):
+        response = await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={"text": "Python is a programming language", "user_id": "user-123"}
+        )
     
     assert response.status_code == 200
     data = response.json()
@@ -29,19 +33,51 @@ async def test_create_answer_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_create_answer_nonexistent_question_api(client: AsyncClient):
+async def test_create_answer_nonexistent_question_api(client: AsyncClient, max_queries):
     """Тест создания ответа к несуществующему вопросу через API"""
-    response = await client.post(
-        "/api/questions/999/answers/",
-        json={"text": "Some answer", "user_id": "user-123"}
-    )
+    with max_queries(1):
+        response = await client.post(
+            "/api/questions/999/answers/",
+            json={"text": "Some answer", "user_id": "user-123"}
+        )
     
     assert response.status_code == 404
     assert "Question not found" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_get_answer_api(client: AsyncClient):
+async def test_create_answer_with_write_batching_api(
+    client: AsyncClient,
+    db_session,
+    session_factory,
+    monkeypatch,
+):
+    """Тест: пока запрос ждёт пачку, его сессия не держит соединение"""
+    monkeypatch.setattr(settings.write_batch, "enabled", True)
+    monkeypatch.setattr(answer_write_batcher, "session_factory", session_factory)
+    create = answer_write_batcher.create
+    holds_connection = []
+
+    async def create_and_check(answer_data):
+        holds_connection.append(db_session.in_transaction())
+        return await create(answer_data=answer_data)
+
+    monkeypatch.setattr(answer_write_batcher, "create", create_and_check)
+    question_response = await client.post("/api/questions/", json={"text": "What is Python?"})
+    question_id = question_response.json()["id"]
+
+    response = await client.post(
+        f"/api/questions/{question_id}/answers/",
+        json={"text": "Answer", "user_id": "user-123"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["question_id"] == question_id
+    assert holds_connection == [False]
+
+
+@pytest.mark.asyncio
+async def test_get_answer_api(client: AsyncClient, max_queries):
     """Тест получения ответа через API"""
 
     # Создаем вопрос и ответ
@@ -58,7 +94,8 @@ async def test_get_answer_api(client: AsyncClient):
     answer_id = answer_response.json()["id"]
     
     # Получаем ответ
-    response = await client.get(f"/api/answers/{answer_id}")
+    with max_queries(1):
+        response = await client.get(f"/api/answers/{answer_id}")
     
     assert response.status_code == 200
     data = response.json()
@@ -69,16 +106,17 @@ async def test_get_answer_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_answer_not_found_api(client: AsyncClient):
+async def test_get_answer_not_found_api(client: AsyncClient, max_queries):
     """Тест получения несуществующего ответа через API"""
-    response = await client.get("/api/answers/999")
+    with max_queries(1):
+        response = await client.get("/api/answers/999")
     
     assert response.status_code == 404
     assert "Answer not found" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_delete_answer_api(client: AsyncClient):
+async def test_delete_answer_api(client: AsyncClient, max_queries):
     """Тест удаления ответа через API"""
     # Создаем вопрос и ответ
     question_response = await client.post(
@@ -93,8 +131,9 @@ async def test_delete_answer_api(client: AsyncClient):
     )
     answer_id = answer_response.json()["id"]
     
-    # Удаляем ответ
-    delete_response = await client.delete(f"/api/answers/{answer_id}")
+    # Удаляем ответ: DELETE, счётчики, задача outbox
+    with max_queries(3):
+        delete_response = await client.delete(f"/api/answers/{answer_id}")
     assert delete_response.status_code == 200
     
     # Проверяем, что ответ удален
@@ -103,7 +142,7 @@ async def test_delete_answer_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_multiple_answers_same_user_api(client: AsyncClient):
+async def test_multiple_answers_same_user_api(client: AsyncClient, max_queries):
     """Тест создания нескольких ответов от одного пользователя на один вопрос"""
 
     # Создаем вопрос
@@ -119,10 +158,11 @@ async def test_multiple_answers_same_user_api(client: AsyncClient):
         f"/api/questions/{question_id}/answers/",
         json={"text": "Answer 1", "user_id": user_id}
     )
-    answer2_response = await client.post(
-        f"/api/questions/{question_id}/answers/",
-        json={"text": "Answer 2", "user_id": user_id}
-    )
+    with max_queries(4):
+        answer2_response = await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={"text": "Answer 2", "user_id": user_id}
+        )
     
     assert answer1_response.status_code == 200
     assert answer2_response.status_code == 200
@@ -136,7 +176,7 @@ async def test_multiple_answers_same_user_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_question_with_answers_api(client: AsyncClient):
+async def test_get_question_with_answers_api(client: AsyncClient, max_queries):
     """Тест получения вопроса со всеми ответами через API"""
 
     # Создаем вопрос
@@ -157,7 +197,8 @@ async def test_get_question_with_answers_api(client: AsyncClient):
     )
     
     # Получаем вопрос со всеми ответами
-    response = await client.get(f"/api/questions/{question_id}")
+    with max_queries(3):
+        response = await client.get(f"/api/questions/{question_id}")
     
     assert response.status_code == 200
     data = response.json()
@@ -168,7 +209,105 @@ async def test_get_question_with_answers_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_create_answer_validation(client: AsyncClient):
+async def test_get_question_answers_preview_api(client: AsyncClient, monkeypatch, max_queries):
+    """Тест ограничения числа ответов в карточке вопроса"""
+    monkeypatch.setattr(settings.pagination, "answers_preview_limit", 2)
+
+    question_response = await client.post(
+        "/api/questions/",
+        json={"text": "What is Python?"}
+    )
+    question_id = question_response.json()["id"]
+
+    for i in range(3):
+        await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={"text": f"Answer {i}", "user_id": "user-123"}
+        )
+
+    with max_queries(3):
+        response = await client.get(f"/api/questions/{question_id}")
+    data = response.json()
+    assert [a["text"] for a in data["answers"]] == ["Answer 0", "Answer 1"]
+    assert data["next_answers_cursor"] is not None
+
+    # Остальные ответы забираем через отдельный эндпоинт
+    with max_queries(2):
+        response = await client.get(
+            f"/api/questions/{question_id}/answers/",
+            params={"cursor": data["next_answers_cursor"]},
+        )
+    assert response.status_code == 200
+    page = response.json()
+    assert [a["text"] for a in page["items"]] == ["Answer 2"]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_answers_pagination_api(client: AsyncClient, max_queries):
+    """Тест постраничного получения ответов на вопрос"""
+    question_response = await client.post(
+        "/api/questions/",
+        json={"text": "What is Python?"}
+    )
+    question_id = question_response.json()["id"]
+
+    for i in range(3):
+        await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={"text": f"Answer {i}", "user_id": "user-123"}
+        )
+
+    with max_queries(2):
+        response = await client.get(
+            f"/api/questions/{question_id}/answers/",
+            params={"limit": 2},
+        )
+    assert response.status_code == 200
+    page = response.json()
+    assert [a["text"] for a in page["items"]] == ["Answer 0", "Answer 1"]
+
+    with max_queries(2):
+        response = await client.get(
+            f"/api/questions/{question_id}/answers/",
+            params={"limit": 2, "cursor": page["next_cursor"]},
+        )
+    page = response.json()
+    assert [a["text"] for a in page["items"]] == ["Answer 2"]
+    assert page["prev_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_answers_nonexistent_question_api(client: AsyncClient, max_queries):
+    """Тест получения ответов несуществующего вопроса"""
+    with max_queries(1):
+        response = await client.get("/api/questions/999/answers/")
+
+    assert response.status_code == 404
+    assert "Question not found" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_get_answers_foreign_cursor_api(client: AsyncClient, max_queries):
+    """Тест передачи курсора от списка вопросов в список ответов"""
+    for i in range(2):
+        await client.post("/api/questions/", json={"text": f"Question {i}"})
+
+    questions_page = (
+        await client.get("/api/questions/", params={"limit": 1})
+    ).json()
+
+    with max_queries(1):
+        response = await client.get(
+            "/api/questions/1/answers/",
+            params={"cursor": questions_page["next_cursor"]},
+        )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_answer_validation(client: AsyncClient, max_queries):
     """Тест валидации при создании ответа"""
 
     # Создаем вопрос
@@ -179,12 +318,174 @@ async def test_create_answer_validation(client: AsyncClient):
     question_id = question_response.json()["id"]
     
     # Попытка создать ответ без обязательных полей
-    response = await client.post(
-        f"/api/questions/{question_id}/answers/",
-        json={}
-    )
+    with max_queries(0):
+        response = await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={}
+        )
     
     assert response.status_code == 422  # Validation error
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk_api(client: AsyncClient, max_queries):
+    """Тест пакетного создания ответов"""
+    question_response = await client.post(
+        "/api/questions/",
+        json={"text": "What is Python?"}
+    )
+    question_id = question_response.json()["id"]
+
+    # SQLite вставляет пачку построчно: проверка вопроса, 2 INSERT, счётчики, outbox
+    with max_queries(5):
+        response = await client.post(
+            f"/api/questions/{question_id}/answers/bulk",
+            json=[
+                {"text": "Answer 1", "user_id": "user-123"},
+                {"text": "", "user_id": "user-123"},
+                {"text": "Answer 3", "user_id": "user-456"},
+            ],
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [a["text"] for a in data["items"]] == ["Answer 1", "Answer 3"]
+    assert all(a["question_id"] == question_id for a in data["items"])
+    assert [error["index"] for error in data["errors"]] == [1]
+
+    answers = (
+        await client.get(f"/api/questions/{question_id}/answers/")
+    ).json()
+    assert len(answers["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_create_answers_bulk_nonexistent_question_api(client: AsyncClient, max_queries):
+    """Тест пакетного создания ответов к несуществующему вопросу"""
+    with max_queries(1):
+        response = await client.post(
+            "/api/questions/999/answers/bulk",
+            json=[{"text": "Answer", "user_id": "user-123"}],
+        )
+
+    assert response.status_code == 404
+    assert "Question not found" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_get_answer_conditional_api(client: AsyncClient, max_queries):
+    """Тест условного запроса ответа по ETag и Last-Modified"""
+    question_response = await client.post("/api/questions/", json={"text": "What is Python?"})
+    question_id = question_response.json()["id"]
+    answer_response = await client.post(
+        f"/api/questions/{question_id}/answers/",
+        json={"text": "A", "user_id": "user-123"},
+    )
+    answer_id = answer_response.json()["id"]
+
+    response = await client.get(f"/api/answers/{answer_id}")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    with max_queries(1):
+        by_etag = await client.get(
+            f"/api/answers/{answer_id}",
+            headers={"If-None-Match": etag},
+        )
+    assert by_etag.status_code == 304
+
+    by_date = await client.get(
+        f"/api/answers/{answer_id}",
+        headers={"If-Modified-Since": last_modified},
+    )
+    assert by_date.status_code == 304
+
+    # If-None-Match имеет приоритет над If-Modified-Since
+    mismatch = await client.get(
+        f"/api/answers/{answer_id}",
+        headers={"If-None-Match": 'W/"other"', "If-Modified-Since": last_modified},
+    )
+    assert mismatch.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_answers_etag_api(client: AsyncClient, max_queries):
+    """Тест условного запроса страницы ответов"""
+    question_response = await client.post("/api/questions/", json={"text": "What is Python?"})
+    question_id = question_response.json()["id"]
+    await client.post(
+        f"/api/questions/{question_id}/answers/",
+        json={"text": "A", "user_id": "user-123"},
+    )
+
+    response = await client.get(f"/api/questions/{question_id}/answers/")
+    etag = response.headers["etag"]
+
+    with max_queries(2):
+        not_modified = await client.get(
+            f"/api/questions/{question_id}/answers/",
+            headers={"If-None-Match": etag},
+        )
+    assert not_modified.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_answers_batch_api(client: AsyncClient, max_queries):
+    """Тест получения нескольких ответов одним запросом"""
+    question = (await client.post("/api/questions/", json={"text": "What is Python?"})).json()
+    answers = (
+        await client.post(
+            f"/api/questions/{question['id']}/answers/bulk",
+            json=[{"text": f"Answer {i}", "user_id": "user-123"} for i in range(3)],
+        )
+    ).json()["items"]
+
+    with max_queries(1):
+        response = await client.get(
+            "/api/answers/batch",
+            params={"ids": f"{answers[1]['id']},999,{answers[0]['id']}"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["items"] == [answers[1], answers[0]]
+    assert data["missing"] == [999]
+
+    with max_queries(1):
+        response = await client.get(
+            "/api/answers/batch",
+            params={"ids": f"{answers[1]['id']},999,{answers[0]['id']}"},
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_delete_answers_batch_api(client: AsyncClient, max_queries):
+    """Тест удаления нескольких ответов одним запросом"""
+    question = (await client.post("/api/questions/", json={"text": "What is Python?"})).json()
+    answers = (
+        await client.post(
+            f"/api/questions/{question['id']}/answers/bulk",
+            json=[{"text": f"Answer {i}", "user_id": "user-123"} for i in range(3)],
+        )
+    ).json()["items"]
+
+    with max_queries(3):
+        response = await client.delete(
+            "/api/answers/batch",
+            params={"ids": f"{answers[1]['id']},999,{answers[0]['id']}"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "deleted": [answers[1]["id"], answers[0]["id"]],
+        "missing": [999],
+        "purging": [],
+    }
+    question = (await client.get(f"/api/questions/{question['id']}")).json()
+    assert question["answer_count"] == 1
+    assert [answer["id"] for answer in question["answers"]] == [answers[2]["id"]]
@@ -27,6 +27,23 @@ async def test_create_answer(db_session):
     assert answer.created_at is not None
 
 
+@pytest.mark.asyncio
+async def test_create_many_answers(db_session):
+    """Тест пакетного создания ответов"""
+    question_repo = QuestionRepository(session=db_session)
+    question = await question_repo.create({"text": "What is Python?"})
+
+    answer_repo = AnswerRepository(session=db_session)
+    answers = await answer_repo.create_many([
+        {"question_id": question.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(3)
+    ])
+
+    assert [a.text for a in answers] == ["Answer 0", "Answer 1", "Answer 2"]
+    assert len({a.id for a in answers}) == 3
+    assert all(a.question_id == question.id for a in answers)
+
+
 @pytest.mark.asyncio
 async def test_get_answer(db_session):
     """Тест получения ответа по ID"""
@@ -61,6 +78,40 @@ async def test_get_answer_not_found(db_session):
     assert answer is None
 
 
+@pytest.mark.asyncio
+async def test_get_answers_page(db_session):
+    """Тест keyset-пагинации ответов на вопрос"""
+    question_repo = QuestionRepository(session=db_session)
+    question = await question_repo.create({"text": "What is Python?"})
+    other_question = await question_repo.create({"text": "What is Rust?"})
+
+    answer_repo = AnswerRepository(session=db_session)
+    answers = [
+        await answer_repo.create({
+            "question_id": question.id,
+            "user_id": "user-123",
+            "text": f"Answer {i}",
+        })
+        for i in range(3)
+    ]
+    await answer_repo.create({
+        "question_id": other_question.id,
+        "user_id": "user-123",
+        "text": "Other answer",
+    })
+
+    first_page = await answer_repo.get_page(q_id=question.id, limit=2)
+    assert [a.id for a in first_page.items] == [answers[0].id, answers[1].id]
+
+    second_page = await answer_repo.get_page(
+        q_id=question.id,
+        limit=2,
+        cursor=first_page.next_cursor,
+    )
+    assert [a.id for a in second_page.items] == [answers[2].id]
+    assert second_page.next_cursor is None
+
+
 @pytest.mark.asyncio
 async def test_delete_answer(db_session):
     """Тест удаления ответа"""
@@ -96,3 +147,111 @@ async def test_delete_nonexistent_answer(db_session):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_answer_writes_bump_question_version(db_session):
+    """Тест увеличения версии вопроса при изменении ответов"""
+    question_repo = QuestionRepository(session=db_session)
+    question = await question_repo.create({"text": "What is Python?"})
+    assert await question_repo.get_version(question.id) == 0
+
+    answer_repo = AnswerRepository(session=db_session)
+    answer = await answer_repo.create(
+        {"question_id": question.id, "user_id": "user-123", "text": "Answer"}
+    )
+    assert await question_repo.get_version(question.id) == 1
+
+    await answer_repo.create_many([
+        {"question_id": question.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(3)
+    ])
+    assert await question_repo.get_version(question.id) == 2
+
+    await answer_repo.delete(answer.id)
+    assert await question_repo.get_version(question.id) == 3
+
+
+@pytest.mark.asyncio
+async def test_answer_writes_update_question_counters(db_session):
+    """Тест поддержки answer_count и last_answer_at при изменении ответов"""
+    question_repo = QuestionRepository(session=db_session)
+    question = await question_repo.create({"text": "What is Python?"})
+    assert question.answer_count == 0
+    assert question.last_answer_at is None
+
+    answer_repo = AnswerRepository(session=db_session)
+    answer = await answer_repo.create(
+        {"question_id": question.id, "user_id": "user-123", "text": "Answer"}
+    )
+    await answer_repo.create_many([
+        {"question_id": question.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(3)
+    ])
+    await db_session.refresh(question)
+    assert question.answer_count == 4
+    assert question.last_answer_at == answer.created_at
+
+    await answer_repo.delete(answer.id)
+    await db_session.refresh(question)
+    assert question.answer_count == 3
+    assert question.last_answer_at is not None
+
+    page = await answer_repo.get_page(question.id, limit=10)
+    for remaining in page.items:
+        await answer_repo.delete(remaining.id)
+    await db_session.refresh(question)
+    assert question.answer_count == 0
+    assert question.last_answer_at is None
+
+
+@pytest.mark.asyncio
+async def test_get_many_answers(db_session):
+    """Тест получения нескольких ответов одним запросом"""
+    question = await QuestionRepository(session=db_session).create(
+        {"text": "What is Python?"}
+    )
+    answer_repo = AnswerRepository(session=db_session)
+    answers = await answer_repo.create_many([
+        {"question_id": question.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(3)
+    ])
+
+    rows = await answer_repo.get_many([answers[2].id, answers[0].id, 999])
+
+    assert sorted(row.id for row in rows) == [answers[0].id, answers[2].id]
+
+
+@pytest.mark.asyncio
+async def test_get_answer_previews(db_session):
+    """Тест первых ответов нескольких вопросов одним запросом"""
+    question_repo = QuestionRepository(session=db_session)
+    busy, quiet, empty = await question_repo.create_many([
+        {"text": "Busy question"},
+        {"text": "Quiet question"},
+        {"text": "Empty question"},
+    ])
+    answer_repo = AnswerRepository(session=db_session)
+    busy_answers = await answer_repo.create_many([
+        {"question_id": busy.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(5)
+    ])
+    quiet_answers = await answer_repo.create_many([
+        {"question_id": quiet.id, "user_id": "user-123", "text": "Only answer"},
+    ])
+
+    previews = await answer_repo.get_previews([busy.id, quiet.id, empty.id], limit=2)
+
+    assert [a.id for a in previews[busy.id].items] == [a.id for a in busy_answers[:2]]
+    assert previews[busy.id].next_cursor is not None
+    assert [a.id for a in previews[quiet.id].items] == [quiet_answers[0].id]
+    assert previews[quiet.id].next_cursor is None
+    assert previews[empty.id].items == []
+
+    # Курсор превью продолжает обычную страницу ответов
+    rest = await answer_repo.get_page(
+        q_id=busy.id,
+        limit=10,
+        cursor=previews[busy.id].next_cursor,
+    )
+    assert [a.id for a in rest.items] == [a.id for a in busy_answers[2:]]
@@ -1,5 +1,7 @@
 import pytest
 from fastapi import HTTPException
+from core.batching import answer_write_batcher
+from core.config import settings
 from core.services.answer_service import AnswerService
 from core.services.question_service import QuestionService
 from core.schemas.answer_schema import CreateAnswerSchema
@@ -53,6 +55,31 @@ async def test_create_answer_nonexistent_question(db_session):
     assert "Question not found" in exc_info.value.detail
 
 
+@pytest.mark.asyncio
+async def test_create_answer_question_deleted_concurrently(db_session, monkeypatch):
+    """Тест удаления вопроса между проверкой существования и вставкой ответа"""
+    answer_service = AnswerService(session=db_session)
+
+    async def exists(q_id: int) -> bool:
+        return True
+
+    monkeypatch.setattr(answer_service.question_repository, "exists", exists)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await answer_service.create_answer(
+            question_id=999,
+            answer_data=CreateAnswerSchema(text="Some answer", user_id="user-123"),
+        )
+
+    assert exc_info.value.status_code == 404
+
+    # Сессия остается рабочей после отката
+    question = await QuestionService(session=db_session).create_question(
+        CreateQuestionSchema(text="What is Python?")
+    )
+    assert question.id is not None
+
+
 @pytest.mark.asyncio
 async def test_get_answer_service(db_session):
     """Тест получения ответа через сервис"""
@@ -81,6 +108,17 @@ async def test_get_answer_service(db_session):
     assert retrieved_answer.user_id == "user-123"
 
 
+@pytest.mark.asyncio
+async def test_get_answers_nonexistent_question_service(db_session):
+    """Тест получения ответов несуществующего вопроса через сервис"""
+    answer_service = AnswerService(session=db_session)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await answer_service.get_answers(question_id=999, limit=10)
+
+    assert exc_info.value.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_get_answer_not_found_service(db_session):
     """Тест получения несуществующего ответа через сервис"""
@@ -154,3 +192,70 @@ async def test_multiple_answers_from_same_user(db_session):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_create_answer_with_write_batching(db_session, session_factory, monkeypatch):
+    """Тест создания ответа через слой пакетной записи"""
+    monkeypatch.setattr(settings.write_batch, "enabled", True)
+    monkeypatch.setattr(answer_write_batcher, "session_factory", session_factory)
+
+    question_service = QuestionService(session=db_session)
+    question = await question_service.create_question(
+        CreateQuestionSchema(text="What is Python?")
+    )
+
+    answer_service = AnswerService(session=db_session)
+    flushes = answer_write_batcher.stats.flushes
+    answer = await answer_service.create_answer(
+        question_id=question.id,
+        answer_data=CreateAnswerSchema(text="Answer", user_id="user-123"),
+    )
+
+    assert answer.id is not None
+    assert answer.question_id == question.id
+    assert answer_write_batcher.stats.flushes == flushes + 1
+
+
+@pytest.mark.asyncio
+async def test_answer_changes_invalidate_question_cache(db_session):
+    """Тест сброса кэша вопроса при создании и удалении ответа"""
+    question_service = QuestionService(session=db_session)
+    question = await question_service.create_question(
+        CreateQuestionSchema(text="What is Python?")
+    )
+    assert (await question_service.get_question(question_id=question.id)).answers == []
+
+    answer_service = AnswerService(session=db_session)
+    answer = await answer_service.create_answer(
+        question_id=question.id,
+        answer_data=CreateAnswerSchema(text="Answer", user_id="user-123"),
+    )
+    cached = await question_service.get_question(question_id=question.id)
+    assert [a.id for a in cached.answers] == [answer.id]
+
+    await answer_service.delete_answer(answer_id=answer.id)
+    assert (await question_service.get_question(question_id=question.id)).answers == []
+
+
+@pytest.mark.asyncio
+async def test_delete_question_invalidates_answer_cache(db_session):
+    """Тест сброса кэша ответов при каскадном удалении вопроса"""
+    question_service = QuestionService(session=db_session)
+    question = await question_service.create_question(
+        CreateQuestionSchema(text="What is Python?")
+    )
+
+    answer_service = AnswerService(session=db_session)
+    answer = await answer_service.create_answer(
+        question_id=question.id,
+        answer_data=CreateAnswerSchema(text="Answer", user_id="user-123"),
+    )
+    assert (await answer_service.get_answer(answer_id=answer.id)).id == answer.id
+
+    await question_service.delete_question(question_id=question.id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await answer_service.get_answer(answer_id=answer.id)
+
+    assert exc_info.value.status_code == 404
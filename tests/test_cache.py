@@ -0,0 +1,342 @@
+import asyncio
+import socket
+
+import pytest
+from pydantic import BaseModel
+
+from core.cache import (
+    CacheInvalidationListener,
+    MemoryBackend,
+    RedisBackend,
+    SharedCache,
+    TTLCache,
+)
+from core.cache.resp import RespClient, RespError
+from core.config import CacheConfig
+
+
+class Item(BaseModel):
+    value: str
+
+
+def make_worker(backend, config: CacheConfig) -> SharedCache[Item]:
+    return SharedCache(namespace="item", schema=Item, backend=backend, config=config)
+
+
+async def wait_for(predicate, timeout: float = 1.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_cache_lru_eviction():
+    """Тест вытеснения давно не использованных записей"""
+    cache = TTLCache(max_size=2, ttl=60)
+
+    cache.set(1, "one")
+    cache.set(2, "two")
+    assert cache.get(1) == "one"
+    cache.set(3, "three")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.get(3) == "three"
+    assert cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_ttl_expiration(clock):
+    """Тест устаревания записей по TTL"""
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+
+    cache.set(1, "one")
+    clock.now = 4
+    assert cache.get(1) == "one"
+    clock.now = 5
+    assert cache.get(1) is None
+    assert cache.expirations == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_single_flight():
+    """Тест одной загрузки на конкурентные промахи по одному ключу"""
+    cache = TTLCache(max_size=10, ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*[cache.get_or_load(1, loader) for _ in range(5)])
+
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert await cache.get_or_load(1, loader) == "value"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 5
+
+
+@pytest.mark.asyncio
+async def test_cache_loader_error_not_cached():
+    """Тест передачи ошибки загрузки всем ожидающим без кэширования"""
+    cache = TTLCache(max_size=10, ttl=60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise LookupError("not found")
+
+    results = await asyncio.gather(
+        *[cache.get_or_load(1, loader) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, LookupError) for result in results)
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidate_during_load():
+    """Тест: загрузка, начатая до инвалидации, не попадает в кэш"""
+    cache = TTLCache(max_size=10, ttl=60)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def loader():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    task = asyncio.create_task(cache.get_or_load(1, loader))
+    await started.wait()
+    cache.invalidate(1)
+    release.set()
+
+    assert await task == "stale"
+    assert cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_commands(redis_server):
+    """Тест базовых команд сетевого бэкенда"""
+    backend = RedisBackend(url=redis_server.url, timeout=1)
+
+    await backend.set("key", b"value", ttl=60)
+    assert await backend.get_many("key", "missing") == [b"value", None]
+
+    await backend.incr_many("ver", "ver", ttl=60)
+    assert await backend.get_many("ver") == [b"2"]
+
+    messages = backend.subscribe("channel")
+    receive = asyncio.create_task(anext(messages))
+    await wait_for(lambda: redis_server.subscribers.get(b"channel"))
+    await backend.publish("channel", b"hello")
+    assert await asyncio.wait_for(receive, 1) == b"hello"
+
+    await messages.aclose()
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_cancelled_call_does_not_leak_reply(redis_server):
+    """Тест: ответ на отменённый вызов не достаётся следующему"""
+    client = RespClient(url=redis_server.url, timeout=1, max_connections=1)
+    await client.execute("SET", "a", b"A")
+    await client.execute("SET", "b", b"B")
+
+    redis_server.delay = 0.05
+    call = asyncio.create_task(client.execute("GET", "a"))
+    await wait_for(lambda: redis_server.commands[-1] == b"GET")
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    redis_server.delay = 0
+    assert await client.execute("GET", "b") == b"B"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_runs_calls_concurrently(redis_server):
+    """Тест: медленный вызов не задерживает остальные"""
+    client = RespClient(url=redis_server.url, timeout=1, max_connections=4)
+    redis_server.delay = 0.05
+
+    started = asyncio.get_running_loop().time()
+    await asyncio.gather(*(client.execute("PING") for _ in range(4)))
+
+    assert asyncio.get_running_loop().time() - started < 0.15
+    assert redis_server.connections == 4
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_closes_connection_on_failed_auth(redis_server):
+    """Тест: при ошибке AUTH соединение закрывается"""
+    redis_server.password = b"secret"
+    url = redis_server.url.replace("redis://", "redis://:wrong@")
+    client = RespClient(url=url, timeout=1)
+
+    with pytest.raises(RespError):
+        await client.execute("PING")
+
+    await wait_for(lambda: redis_server.connections == 0)
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_between_workers(redis_server):
+    """Тест общего кэша и широковещательной инвалидации между воркерами"""
+    config = CacheConfig(ttl=60, local_ttl=60)
+    backend_a = RedisBackend(url=redis_server.url, timeout=1)
+    backend_b = RedisBackend(url=redis_server.url, timeout=1)
+    worker_a = make_worker(backend_a, config)
+    worker_b = make_worker(backend_b, config)
+    listener = CacheInvalidationListener(backend_b, config.channel, [worker_b])
+    listening = asyncio.create_task(listener.run())
+    await wait_for(lambda: redis_server.subscribers.get(config.channel.encode()))
+
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return Item(value=f"v{len(loads)}")
+
+    # Воркер B получает значение, загруженное воркером A, без запроса в БД
+    assert (await worker_a.get_or_load(1, loader)).value == "v1"
+    assert (await worker_b.get_or_load(1, loader)).value == "v1"
+    assert len(loads) == 1
+    assert worker_b.remote_hits == 1
+
+    # Запись на воркере A вытесняет локальную копию на воркере B
+    await worker_a.invalidate(1)
+    await wait_for(lambda: worker_b.local.get(1) is None)
+    assert (await worker_b.get_or_load(1, loader)).value == "v2"
+
+    listening.cancel()
+    await backend_a.close()
+    await backend_b.close()
+
+
+class ScopedItem(BaseModel):
+    value: str
+    group: int
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_invalidate_scopes(redis_server):
+    """Тест: сброс области вытесняет её значения у всех воркеров, не зная их ключей"""
+    config = CacheConfig(ttl=60, local_ttl=60)
+    backend_a = RedisBackend(url=redis_server.url, timeout=1)
+    backend_b = RedisBackend(url=redis_server.url, timeout=1)
+    worker_a, worker_b = (
+        SharedCache(
+            namespace="scoped",
+            schema=ScopedItem,
+            backend=backend,
+            config=config,
+            scope=lambda item: item.group,
+        )
+        for backend in (backend_a, backend_b)
+    )
+    listener = CacheInvalidationListener(backend_b, config.channel, [worker_b])
+    listening = asyncio.create_task(listener.run())
+    await wait_for(lambda: redis_server.subscribers.get(config.channel.encode()))
+
+    def loader(key: int):
+        async def load():
+            return ScopedItem(value=f"v{key}", group=key // 10)
+
+        return load
+
+    for key in (1, 2, 11):
+        await worker_a.get_or_load(key, loader(key))
+        await worker_b.get_or_load(key, loader(key))
+
+    await worker_a.invalidate_scopes(0)
+    await wait_for(lambda: worker_b.local.get(1) is None)
+    assert worker_b.local.get(2) is None
+    assert worker_b.local.get(11) is not None
+
+    # Общий кэш тоже не отдаёт значения сброшенной области
+    remote_hits = worker_b.remote_hits
+    await worker_b.get_or_load(1, loader(1))
+    await worker_b.get_or_load(11, loader(11))
+    worker_b.local.clear()
+    await worker_b.get_or_load(11, loader(11))
+    assert worker_b.remote_hits == remote_hits + 1
+
+    listening.cancel()
+    await backend_a.close()
+    await backend_b.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_no_stale_resurrection(redis_server):
+    """Тест: данные, загруженные до инвалидации, не воскресают в общем кэше"""
+    config = CacheConfig(ttl=60, local_ttl=60)
+    backend = RedisBackend(url=redis_server.url, timeout=1)
+    writer = make_worker(backend, config)
+    reader = make_worker(backend, config)
+    loaded = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        loaded.set()
+        await release.wait()
+        return Item(value="stale")
+
+    task = asyncio.create_task(reader.get_or_load(1, slow_loader))
+    await loaded.wait()
+    await writer.invalidate(1)
+    release.set()
+    assert (await task).value == "stale"
+
+    async def fresh_loader():
+        return Item(value="fresh")
+
+    other = make_worker(backend, config)
+    assert (await other.get_or_load(1, fresh_loader)).value == "fresh"
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_backend_unavailable():
+    """Тест чтения в обход кэша при недоступном бэкенде"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    backend = RedisBackend(url=f"redis://127.0.0.1:{port}/0", timeout=0.2)
+    cache = make_worker(backend, CacheConfig())
+
+    async def loader():
+        return Item(value="from db")
+
+    assert (await cache.get_or_load(1, loader)).value == "from db"
+    await cache.invalidate(1)
+    assert cache.backend_errors >= 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_memory_backend():
+    """Тест кэша с локальным бэкендом в памяти"""
+    config = CacheConfig(ttl=60, local_ttl=60)
+    backend = MemoryBackend()
+    cache = make_worker(backend, config)
+    listener = CacheInvalidationListener(backend, config.channel, [cache])
+    listening = asyncio.create_task(listener.run())
+    await asyncio.sleep(0)
+
+    async def loader():
+        return Item(value="value")
+
+    await cache.get_or_load(1, loader)
+    cache.local.clear()
+    await cache.get_or_load(1, loader)
+    assert cache.remote_hits == 1
+
+    await cache.invalidate(1)
+    assert await backend.get_many("item:ver:1") == [b"1"]
+    listening.cancel()
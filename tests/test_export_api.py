@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from core.config import settings
+
+
+async def read_ndjson(client: AsyncClient, params: dict | None = None) -> list[dict]:
+    records = []
+    async with client.stream("GET", "/api/export/questions", params=params) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        async for line in response.aiter_lines():
+            if line:
+                records.append(json.loads(line))
+    return records
+
+
+@pytest.mark.asyncio
+async def test_export_questions_api(client: AsyncClient, monkeypatch, max_queries):
+    """Тест потоковой выгрузки вопросов с ответами"""
+    # Маленький буфер, чтобы ответ пришел несколькими кусками
+    monkeypatch.setattr(settings.export, "chunk_size", 64)
+    monkeypatch.setattr(settings.export, "yield_per", 2)
+
+    question1_id = (
+        await client.post("/api/questions/", json={"text": "Question 1"})
+    ).json()["id"]
+    question2_id = (
+        await client.post("/api/questions/", json={"text": "Question 2"})
+    ).json()["id"]
+
+    for i in range(3):
+        await client.post(
+            f"/api/questions/{question1_id}/answers/",
+            json={"text": f"Answer {i}", "user_id": "user-123"}
+        )
+
+    # Вся выгрузка — один потоковый запрос, независимо от yield_per
+    with max_queries(1):
+        records = await read_ndjson(client)
+
+    assert [record["type"] for record in records] == [
+        "question", "answer", "answer", "answer", "question",
+    ]
+    assert records[0]["data"]["id"] == question1_id
+    assert [record["data"]["text"] for record in records[1:4]] == [
+        "Answer 0", "Answer 1", "Answer 2",
+    ]
+    assert all(
+        record["data"]["question_id"] == question1_id for record in records[1:4]
+    )
+    assert records[4]["data"]["id"] == question2_id
+
+
+@pytest.mark.asyncio
+async def test_export_questions_created_filter_api(client: AsyncClient, max_queries):
+    """Тест фильтрации выгрузки по дате создания"""
+    question = (
+        await client.post("/api/questions/", json={"text": "Question 1"})
+    ).json()
+
+    with max_queries(1):
+        records = await read_ndjson(
+            client,
+            params={"created_from": question["created_at"]},
+        )
+    assert [record["data"]["id"] for record in records] == [question["id"]]
+
+    records = await read_ndjson(
+        client,
+        params={"created_to": question["created_at"]},
+    )
+    assert records == []
+
+
+@pytest.mark.asyncio
+async def test_export_empty_api(client: AsyncClient, max_queries):
+    """Тест выгрузки пустой базы"""
+    with max_queries(1):
+        records = await read_ndjson(client)
+
+    assert records == []
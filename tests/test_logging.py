@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+from httpx import AsyncClient
+
+from core.config import LoggingConfig
+from core.logging import (
+    HOT_PATH,
+    DroppingQueueHandler,
+    HotPathFilter,
+    JsonFormatter,
+    LoggingPipeline,
+)
+
+
+def make_record(msg: str = "Answer created, answer_id=%s", **extra) -> logging.LogRecord:
+    record = logging.LogRecord("qa.test", logging.INFO, __file__, 1, msg, (7,), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extra_fields():
+    """Тест: запись — одна JSON-строка с сообщением и полями из extra"""
+    line = JsonFormatter().format(make_record(request_id="abc", hot_path=True))
+
+    payload = json.loads(line)
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "qa.test"
+    assert payload["message"] == "Answer created, answer_id=7"
+    assert payload["request_id"] == "abc"
+    assert "hot_path" not in payload
+
+
+def test_dropping_queue_handler_counts_dropped_records():
+    """Тест: при полной очереди запись отбрасывается без ожидания"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+
+    for _ in range(5):
+        handler.handle(make_record())
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+
+
+def test_hot_path_filter_limits_rate_per_message(monkeypatch):
+    """Тест: горячие записи ограничены по частоте, остальные проходят все"""
+    now = [100.0]
+    monkeypatch.setattr("core.logging.time.monotonic", lambda: now[0])
+    hot_path_filter = HotPathFilter(rate=2)
+
+    passed = [hot_path_filter.filter(make_record(**HOT_PATH)) for _ in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert hot_path_filter.suppressed == 3
+    assert all(hot_path_filter.filter(make_record()) for _ in range(5))
+    # Другое сообщение считается отдельно
+    assert hot_path_filter.filter(make_record("Other", **HOT_PATH))
+
+    now[0] += 1.0
+    record = make_record(**HOT_PATH)
+    assert hot_path_filter.filter(record)
+    assert record.suppressed == 3
+
+
+def test_pipeline_writes_from_listener_thread(monkeypatch):
+    """Тест: записи доходят до вывода через поток-слушатель"""
+    stream = io.StringIO()
+    monkeypatch.setattr("sys.stderr", stream)
+    pipeline = LoggingPipeline(LoggingConfig(format="json", queue_size=10))
+    logger = logging.getLogger("qa.test.pipeline")
+    logger.addHandler(pipeline.handler)
+    logger.propagate = False
+    pipeline.listener.start()
+    try:
+        logger.warning("Hello, user_id=%s", 42)
+    finally:
+        pipeline.listener.stop()
+        logger.removeHandler(pipeline.handler)
+
+    (line,) = stream.getvalue().splitlines()
+    assert json.loads(line)["message"] == "Hello, user_id=42"
+    assert pipeline.stats() == {
+        "queued": 0,
+        "queue_capacity": 10,
+        "dropped": 0,
+        "suppressed": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_question_does_not_log_text(client: AsyncClient, caplog):
+    """Тест: текст пользователя не попадает в лог"""
+    with caplog.at_level(logging.INFO):
+        response = await client.post(
+            "/api/questions/",
+            json={"text": "My secret question text"},
+        )
+
+    assert response.status_code == 200
+    assert "Creating question" in caplog.text
+    assert "secret" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_logging_counters(client: AsyncClient):
+    """Тест: /metrics показывает очередь и отброшенные записи логов"""
+    response = await client.get("/metrics")
+
+    assert "qa_logging_dropped 0" in response.text
+    assert "qa_logging_suppressed" in response.text
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from core.metrics import (
+    Histogram,
+    MetricsMiddleware,
+    QueryStats,
+    RequestMetrics,
+    current_query_stats,
+    render_gauges,
+    request_metrics,
+)
+
+
+def test_histogram_buckets():
+    """Тест раскладки значений по границам гистограммы (le)"""
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(3.65)
+
+
+def test_render_gauges_groups_families():
+    """Тест: одно семейство метрик на поле, по строке на источник"""
+    lines = render_gauges(
+        "qa_cache",
+        [
+            ({"cache": "question"}, {"hits": 3, "enabled": True, "nested": {}}),
+            ({"cache": "answer"}, {"hits": 1}),
+        ],
+    )
+
+    assert lines == [
+        "# TYPE qa_cache_hits gauge",
+        'qa_cache_hits{cache="question"} 3',
+        'qa_cache_hits{cache="answer"} 1',
+    ]
+
+
+def test_request_metrics_render():
+    """Тест экспорта гистограммы и счётчиков маршрута"""
+    metrics = RequestMetrics()
+    stats = QueryStats()
+    stats.queries = 2
+    stats.db_seconds = 0.25
+
+    metrics.observe("GET", "/api/questions/{id}", 200, 0.02, stats)
+    lines = metrics.render()
+
+    labels = 'method="GET",route="/api/questions/{id}"'
+    assert f'qa_http_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in lines
+    assert f'qa_http_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in lines
+    assert f'qa_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f'qa_http_requests_total{{{labels},status="200"}} 1' in lines
+    assert f"qa_db_queries_total{{{labels}}} 2" in lines
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_counts_queries_api(client: AsyncClient):
+    """Тест учёта SQL-запросов и задержки по шаблону маршрута"""
+    create_response = await client.post("/api/questions/", json={"text": "What is Python?"})
+    question_id = create_response.json()["id"]
+
+    route_stats = request_metrics.routes.get(("GET", "/api/questions/{id}"))
+    requests_before = route_stats.latency.count if route_stats else 0
+    queries_before = route_stats.queries if route_stats else 0
+
+    await client.get(f"/api/questions/{question_id}")
+
+    route_stats = request_metrics.routes[("GET", "/api/questions/{id}")]
+    assert route_stats.latency.count == requests_before + 1
+    assert route_stats.queries > queries_before
+    assert route_stats.db_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_api(client: AsyncClient):
+    """Тест эндпоинта /metrics в текстовом формате Prometheus"""
+    await client.get("/health")
+
+    response = await client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE qa_http_request_duration_seconds histogram" in body
+    assert 'qa_http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'qa_db_pool_checked_out{engine="primary"}' in body
+    assert 'qa_cache_hits{cache="question"}' in body
+    assert "qa_write_batch_flushes" in body
+    assert "# TYPE qa_write_batch_size histogram" in body
+    assert 'qa_write_batch_size_bucket{le="+Inf"}' in body
+    type_lines = [line for line in body.splitlines() if line.startswith("# TYPE")]
+    assert len(type_lines) == len(set(type_lines))
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_logs_slow_requests(caplog):
+    """Тест журнала медленных запросов"""
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    metrics = RequestMetrics()
+    middleware = MetricsMiddleware(app, metrics=metrics, slow_request_seconds=0.0)
+
+    with caplog.at_level(logging.WARNING, logger="core.metrics"):
+        await middleware({"type": "http", "method": "POST", "path": "/x"}, None, send)
+
+    assert metrics.slow_requests == 1
+    assert metrics.routes[("POST", "unmatched")].statuses == {201: 1}
+    assert "Slow request POST unmatched status=201" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_streaming_latency_until_response_start():
+    """Тест: у потокового ответа задержка считается до начала ответа"""
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"1", "more_body": True})
+        await asyncio.sleep(0.05)
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    metrics = RequestMetrics()
+    middleware = MetricsMiddleware(app, metrics=metrics, slow_request_seconds=0.05)
+    await middleware({"type": "http", "method": "GET", "path": "/x"}, None, send)
+
+    assert metrics.slow_requests == 0
+    assert metrics.routes[("GET", "unmatched")].latency.sum < 0.05
+
+
+@pytest.mark.asyncio
+async def test_max_queries_over_budget(db_session, max_queries):
+    """Тест: превышение бюджета SQL-запросов роняет тест"""
+    with max_queries(1) as stats:
+        await db_session.execute(text("SELECT 1"))
+    assert stats.queries == 1
+    assert stats.db_seconds > 0
+
+    with pytest.raises(AssertionError, match="at most 1 SQL statements, got 2"):
+        with max_queries(1):
+            await db_session.execute(text("SELECT 1"))
+            await db_session.execute(text("SELECT 2"))
+
+
+@pytest.mark.asyncio
+async def test_metrics_middleware_debug_headers():
+    """Тест отладочных заголовков X-Query-Count и X-DB-Time"""
+
+    async def app(scope, receive, send):
+        stats = current_query_stats.get()
+        stats.queries += 2
+        stats.db_seconds += 0.0015
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    middleware = MetricsMiddleware(
+        app,
+        metrics=RequestMetrics(),
+        slow_request_seconds=10.0,
+        debug_headers=True,
+    )
+    await middleware({"type": "http", "method": "GET", "path": "/x"}, None, send)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-query-count"] == b"2"
+    assert headers[b"x-db-time"] == b"1.500ms"
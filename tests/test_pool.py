@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.pool import InstrumentedAsyncQueuePool, PoolWaitStats, pool_stats
+
+
+@pytest_asyncio.fixture
+async def pool_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_checked_out_and_overflow(pool_engine):
+    """Тест счетчиков занятых соединений и переполнения пула"""
+    async with pool_engine.connect() as conn1:
+        await conn1.execute(text("SELECT 1"))
+        async with pool_engine.connect() as conn2:
+            await conn2.execute(text("SELECT 1"))
+
+            stats = pool_stats(pool_engine)
+            assert stats["size"] == 1
+            assert stats["checked_out"] == 2
+            assert stats["overflow"] == 1
+
+    stats = pool_stats(pool_engine)
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_wait_and_timeout(pool_engine):
+    """Тест учета ожидания соединения и таймаутов пула"""
+    async with pool_engine.connect() as conn1, pool_engine.connect() as conn2:
+        await conn1.execute(text("SELECT 1"))
+        await conn2.execute(text("SELECT 1"))
+
+        # Пул исчерпан: третье соединение ждет pool_timeout и падает
+        with pytest.raises(exc.TimeoutError):
+            async with pool_engine.connect():
+                pass
+
+    stats = pool_stats(pool_engine)
+    assert stats["timeouts"] == 1
+
+    # Ожидание освобождения соединения попадает в статистику
+    async def hold_connection():
+        async with pool_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(hold_connection(), hold_connection(), hold_connection())
+
+    stats = pool_stats(pool_engine)
+    assert stats["wait_seconds_max"] > 0.01
+    assert stats["wait_seconds_avg"] > 0
+
+
+@pytest.mark.asyncio
+async def test_pool_health_api(client: AsyncClient):
+    """Тест эндпоинта статистики пула"""
+    response = await client.get("/health/pool")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {"size", "checked_out", "overflow", "wait_seconds_avg"} <= data.keys()
+
+
+def test_pool_recent_wait_decays_without_checkouts():
+    """Тест: недавнее ожидание пула затухает, когда соединения не берут"""
+    now = 0.0
+    wait_stats = PoolWaitStats(clock=lambda: now)
+
+    wait_stats.record_timeout(1.0)
+    assert wait_stats.recent_wait() == 1.0
+
+    now += PoolWaitStats.half_life
+    assert wait_stats.recent_wait() == pytest.approx(0.5)
+
+    wait_stats.record(0.0)
+    assert wait_stats.recent_wait() == pytest.approx(0.4)
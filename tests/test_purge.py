@@ -0,0 +1,126 @@
+import pytest
+from httpx import AsyncClient
+
+from core.config import settings
+from core.purge import QuestionPurger
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+
+
+async def create_question_with_answers(db_session, answers: int):
+    question_repo = QuestionRepository(session=db_session)
+    answer_repo = AnswerRepository(session=db_session)
+    question = await question_repo.create({"text": "What is Python?"})
+    created = await answer_repo.create_many([
+        {"question_id": question.id, "user_id": "user-123", "text": f"Answer {i}"}
+        for i in range(answers)
+    ])
+    return question, created
+
+
+@pytest.mark.asyncio
+async def test_soft_deleted_question_hidden_from_reads(db_session):
+    """Тест: мягко удалённый вопрос и его ответы сразу не видны чтениям"""
+    question_repo = QuestionRepository(session=db_session)
+    answer_repo = AnswerRepository(session=db_session)
+    question, answers = await create_question_with_answers(db_session, answers=3)
+    other, _ = await create_question_with_answers(db_session, answers=1)
+
+    assert await question_repo.soft_delete_many([question.id, other.id], min_answers=2) == [
+        question.id
+    ]
+
+    assert await question_repo.get(q_id=question.id) is None
+    assert await question_repo.get_version(q_id=question.id) is None
+    assert not await question_repo.exists(q_id=question.id)
+    assert await question_repo.get_many([question.id]) == []
+    assert [row.id for row in (await question_repo.get_page(limit=10)).items] == [other.id]
+    assert await answer_repo.get(a_id=answers[0].id) is None
+    assert await answer_repo.get_many([answer.id for answer in answers]) == []
+    # Ответ мягко удалённого вопроса удалить отдельно уже нельзя
+    assert await answer_repo.delete_many([answers[0].id]) == {}
+
+
+@pytest.mark.asyncio
+async def test_purge_resumes_after_interrupted_run(db_session, session_factory):
+    """Тест: очистка идёт пачками и продолжается после прерванного прохода"""
+    question_repo = QuestionRepository(session=db_session)
+    question, _ = await create_question_with_answers(db_session, answers=5)
+    await question_repo.soft_delete_many([question.id], min_answers=1)
+
+    # Процесс упал после первой пачки
+    answer_ids, finished = await question_repo.purge_answers(q_id=question.id, limit=2)
+    assert len(answer_ids) == 2
+    assert not finished
+    (pending,) = await question_repo.get_purge_pending(limit=10)
+    assert (pending.id, pending.answer_count) == (question.id, 3)
+
+    purger = QuestionPurger(session_factory, chunk_size=2, poll_interval=1.0)
+    assert await purger.run_once() == 1
+
+    assert await question_repo.get_purge_pending(limit=10) == []
+    assert purger.stats() == {
+        "purged_answers": 3,
+        "purged_questions": 1,
+        "chunks": 2,
+        "failures": 0,
+        "pending_questions": 0,
+        "pending_answers": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_delete_questions_batch_api(
+    client: AsyncClient,
+    db_session,
+    session_factory,
+    monkeypatch,
+    max_queries,
+):
+    """Тест пакетного удаления: большие вопросы удаляются мягко и дочищаются в фоне"""
+    monkeypatch.setattr(settings.purge, "soft_delete_min_answers", 3)
+    large, answers = await create_question_with_answers(db_session, answers=3)
+    small, _ = await create_question_with_answers(db_session, answers=1)
+    # Ответ большого вопроса уже в кэше
+    cached = await client.get(f"/api/answers/{answers[0].id}")
+    assert cached.status_code == 200
+
+    # Пометка и удаление — две транзакции, в каждой своя задача outbox
+    with max_queries(5):
+        response = await client.delete(
+            "/api/questions/batch",
+            params={"ids": f"{large.id},999,{small.id}"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "deleted": [large.id, small.id],
+        "missing": [999],
+        "purging": [large.id],
+    }
+    for path in (
+        f"/api/questions/{large.id}",
+        f"/api/questions/{small.id}",
+        f"/api/questions/{large.id}/answers/",
+        f"/api/answers/{answers[0].id}",
+    ):
+        assert (await client.get(path)).status_code == 404
+    response = await client.get(
+        f"/api/answers/{answers[0].id}",
+        headers={"If-None-Match": cached.headers["ETag"]},
+    )
+    assert response.status_code == 404
+    search = await client.get("/api/search", params={"q": "python"})
+    assert search.json()["items"] == []
+
+    purger = QuestionPurger(session_factory, chunk_size=2, poll_interval=1.0)
+    assert await purger.run_once() == 1
+    assert purger.purged_answers == 3
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_purge_counters(client: AsyncClient):
+    """Тест: /metrics показывает прогресс фоновой очистки"""
+    response = await client.get("/metrics")
+
+    assert "qa_purge_pending_answers" in response.text
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, text
+
+from core.models.answer import Answer
+from core.models.question import Question
+from core.pagination import Cursor
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+
+
+async def explain(session, query) -> str:
+    compiled = query.compile(
+        dialect=session.bind.dialect,
+        compile_kwargs={"literal_binds": True},
+    )
+    result = await session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return "\n".join(row[-1] for row in result.all())
+
+
+@pytest.mark.asyncio
+async def test_questions_page_uses_index(db_session):
+    """Тест использования индекса при keyset-пагинации вопросов"""
+    query = QuestionRepository.keyset.apply(
+        select(Question),
+        20,
+        Cursor(values=(datetime(2025, 1, 1), 10)),
+    )
+
+    plan = await explain(db_session, query)
+
+    assert "ix_questions_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_answers_page_uses_index(db_session):
+    """Тест использования индекса при keyset-пагинации ответов вопроса"""
+    query = AnswerRepository.keyset.apply(
+        select(Answer).where(Answer.question_id == 1),
+        20,
+        Cursor(values=(datetime(2025, 1, 1), 10)),
+    )
+
+    plan = await explain(db_session, query)
+
+    assert "ix_answers_question_id_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_answers_by_question_lookup_uses_index(db_session):
+    """Тест поиска ответов по вопросу (каскадное удаление) через индекс"""
+    query = select(Answer.id).where(Answer.question_id == 1)
+
+    plan = await explain(db_session, query)
+
+    assert "ix_answers_question_id_created_at_id" in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("sort", "index"),
+    [
+        ("answer_count", "ix_questions_answer_count_id"),
+        ("last_answer_at", "ix_questions_last_answer_at_id"),
+    ],
+)
+async def test_sorted_questions_page_uses_index(db_session, sort, index):
+    """Тест сортировки по денормализованным счётчикам без GROUP BY по ответам"""
+    keyset = QuestionRepository.keysets[sort]
+    value = 5 if sort == "answer_count" else datetime(2025, 1, 1)
+    query = keyset.apply(select(Question), 20, Cursor(values=(value, 10)))
+
+    plan = await explain(db_session, query)
+
+    assert index in plan
+    assert "TEMP B-TREE" not in plan
+    assert "answers" not in plan
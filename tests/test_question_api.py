@@ -1,14 +1,21 @@
+from datetime import datetime, timezone
+
 import pytest
 from httpx import AsyncClient
 
+from core.config import settings
+from core.pagination import Cursor
+from core.repositories.question_repository import QuestionRepository
+
 
 @pytest.mark.asyncio
-async def test_create_question_api(client: AsyncClient):
+async def test_create_question_api(client: AsyncClient, max_queries):
     """Тест создания вопроса через API"""
-    response = await client.post(
-        "/api/questions/",
-        json={"text": "What is Python?"}
-    )
+    with max_queries(1):
+        response = await client.post(
+            "/api/questions/",
+            json={"text": "What is Python?"}
+        )
     
     assert response.status_code == 200
     data = response.json()
@@ -18,7 +25,7 @@ async def test_create_question_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_question_api(client: AsyncClient):
+async def test_get_question_api(client: AsyncClient, max_queries):
     """Тест получения вопроса через API"""
 
     # Создаем вопрос
@@ -29,7 +36,8 @@ async def test_get_question_api(client: AsyncClient):
     question_id = create_response.json()["id"]
     
     # Получаем вопрос
-    response = await client.get(f"/api/questions/{question_id}")
+    with max_queries(3):
+        response = await client.get(f"/api/questions/{question_id}")
     
     assert response.status_code == 200
     data = response.json()
@@ -40,16 +48,17 @@ async def test_get_question_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_question_not_found_api(client: AsyncClient):
+async def test_get_question_not_found_api(client: AsyncClient, max_queries):
     """Тест получения несуществующего вопроса через API"""
-    response = await client.get("/api/questions/999")
+    with max_queries(1):
+        response = await client.get("/api/questions/999")
     
     assert response.status_code == 404
     assert "Question not found" in response.json()["detail"]
 
 
 @pytest.mark.asyncio
-async def test_get_all_questions_api(client: AsyncClient):
+async def test_get_all_questions_api(client: AsyncClient, max_queries):
     """Тест получения всех вопросов через API"""
 
     # Создаем несколько вопросов
@@ -57,16 +66,109 @@ async def test_get_all_questions_api(client: AsyncClient):
     await client.post("/api/questions/", json={"text": "Question 2"})
     
     # Получаем все вопросы
-    response = await client.get("/api/questions/")
+    with max_queries(1):
+        response = await client.get("/api/questions/")
     
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 2
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 2
+
+
+@pytest.mark.asyncio
+async def test_get_questions_pagination_api(client: AsyncClient, max_queries):
+    """Тест постраничного получения вопросов через курсоры"""
+
+    for i in range(5):
+        await client.post("/api/questions/", json={"text": f"Question {i}"})
+
+    # Первая страница
+    with max_queries(1):
+        response = await client.get("/api/questions/", params={"limit": 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [q["text"] for q in first_page["items"]] == ["Question 0", "Question 1"]
+    assert first_page["prev_cursor"] is None
+    assert first_page["next_cursor"] is not None
+
+    # Идем вперед до последней страницы
+    texts = [q["text"] for q in first_page["items"]]
+    page = first_page
+    while page["next_cursor"]:
+        with max_queries(1):
+            response = await client.get(
+                "/api/questions/",
+                params={"limit": 2, "cursor": page["next_cursor"]},
+            )
+        page = response.json()
+        texts.extend(q["text"] for q in page["items"])
+
+    assert texts == [f"Question {i}" for i in range(5)]
+
+    # Возвращаемся назад с последней страницы
+    with max_queries(1):
+        response = await client.get(
+            "/api/questions/",
+            params={"limit": 2, "cursor": page["prev_cursor"]},
+        )
+    prev_page = response.json()
+    assert [q["text"] for q in prev_page["items"]] == ["Question 2", "Question 3"]
+    assert prev_page["next_cursor"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_questions_invalid_cursor_api(client: AsyncClient, max_queries):
+    """Тест передачи некорректного курсора"""
+    with max_queries(0):
+        response = await client.get("/api/questions/", params={"cursor": "garbage"})
+
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("sort", "values"),
+    [
+        ("created_at", ["2026-01-01", 1]),
+        ("created_at", [{"dt": "2026-01-01T00:00:00"}, "1"]),
+        ("answer_count", ["many", 1]),
+        ("answer_count", [True, 1]),
+        ("answer_count", [1, 2**31]),
+        ("answer_count", [-(2**63) - 1, 1]),
+        ("created_at", [datetime(2026, 1, 1, tzinfo=timezone.utc), 10**30]),
+    ],
+)
+async def test_get_questions_tampered_cursor_api(
+    client: AsyncClient,
+    max_queries,
+    sort,
+    values,
+):
+    """Тест курсора с подменёнными типами значений: 400, а не ошибка БД"""
+    keyset = QuestionRepository.keysets[sort]
+    token = keyset.encode(Cursor(values=tuple(values)))
+
+    with max_queries(0):
+        response = await client.get(
+            "/api/questions/",
+            params={"sort": sort, "cursor": token},
+        )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_questions_limit_validation_api(client: AsyncClient, max_queries):
+    """Тест ограничения размера страницы"""
+    with max_queries(0):
+        response = await client.get("/api/questions/", params={"limit": 100000})
+
+    assert response.status_code == 422
 
 
 @pytest.mark.asyncio
-async def test_delete_question_api(client: AsyncClient):
+async def test_delete_question_api(client: AsyncClient, max_queries):
     """Тест удаления вопроса через API"""
 
     # Создаем вопрос
@@ -76,8 +178,9 @@ async def test_delete_question_api(client: AsyncClient):
     )
     question_id = create_response.json()["id"]
     
-    # Удаляем вопрос
-    delete_response = await client.delete(f"/api/questions/{question_id}")
+    # Удаляем вопрос: пометка больших вопросов, ответы, сам вопрос, outbox
+    with max_queries(4):
+        delete_response = await client.delete(f"/api/questions/{question_id}")
     assert delete_response.status_code == 200
     
     # Проверяем, что вопрос удален
@@ -86,7 +189,7 @@ async def test_delete_question_api(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_delete_question_with_answers_cascade(client: AsyncClient):
+async def test_delete_question_with_answers_cascade(client: AsyncClient, max_queries):
     """Тест каскадного удаления ответов при удалении вопроса"""
 
     # Создаем вопрос
@@ -108,8 +211,9 @@ async def test_delete_question_with_answers_cascade(client: AsyncClient):
     answer1_id = answer1_response.json()["id"]
     answer2_id = answer2_response.json()["id"]
     
-    # Удаляем вопрос
-    delete_response = await client.delete(f"/api/questions/{question_id}")
+    # Удаляем вопрос: пометка больших вопросов, ответы, сам вопрос, outbox
+    with max_queries(4):
+        delete_response = await client.delete(f"/api/questions/{question_id}")
     assert delete_response.status_code == 200
     
     # Проверяем, что ответы тоже удалены
@@ -121,12 +225,273 @@ async def test_delete_question_with_answers_cascade(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_create_question_validation(client: AsyncClient):
+async def test_create_question_validation(client: AsyncClient, max_queries):
     """Тест валидации при создании вопроса"""
 
     # Попытка создать вопрос без текста
-    response = await client.post("/api/questions/", json={})
+    with max_queries(0):
+        response = await client.post("/api/questions/", json={})
     
     assert response.status_code == 422  # Validation error
 
 
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_api(client: AsyncClient, max_queries):
+    """Тест пакетного создания вопросов с ошибками валидации отдельных элементов"""
+    with max_queries(2):
+        response = await client.post(
+            "/api/questions/bulk",
+            json=[
+                {"text": "Question 1"},
+                {"text": "Q"},
+                {"text": "Question 3"},
+                {},
+                "Question 5",
+                None,
+            ],
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [q["text"] for q in data["items"]] == ["Question 1", "Question 3"]
+    assert all("id" in q for q in data["items"])
+    assert [error["index"] for error in data["errors"]] == [1, 3, 4, 5]
+    assert data["errors"][0]["errors"][0]["loc"] == ["text"]
+    # Не-объект — ошибка только своего элемента
+    assert data["errors"][2]["errors"][0]["type"] == "model_type"
+
+    # Созданные вопросы доступны по отдельности
+    question_id = data["items"][0]["id"]
+    get_response = await client.get(f"/api/questions/{question_id}")
+    assert get_response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_create_questions_bulk_limit_api(client: AsyncClient, max_queries):
+    """Тест ограничения размера пачки при пакетном создании вопросов"""
+    with max_queries(0):
+        response = await client.post(
+            "/api/questions/bulk",
+            json=[{"text": "Question"}] * (settings.bulk.max_batch_size + 1),
+        )
+    assert response.status_code == 422
+
+    with max_queries(0):
+        response = await client.post("/api/questions/bulk", json=[])
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_question_etag_api(client: AsyncClient, max_queries):
+    """Тест условного запроса вопроса по ETag"""
+    create_response = await client.post("/api/questions/", json={"text": "What is Python?"})
+    question_id = create_response.json()["id"]
+
+    response = await client.get(f"/api/questions/{question_id}")
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    # На 304 проверяется только версия вопроса, ответы не загружаются
+    with max_queries(1):
+        not_modified = await client.get(
+            f"/api/questions/{question_id}",
+            headers={"If-None-Match": etag},
+        )
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    # Новый ответ меняет версию вопроса
+    await client.post(
+        f"/api/questions/{question_id}/answers/",
+        json={"text": "A", "user_id": "user-123"},
+    )
+    modified = await client.get(
+        f"/api/questions/{question_id}",
+        headers={"If-None-Match": etag},
+    )
+    assert modified.status_code == 200
+    assert modified.headers["etag"] != etag
+    assert modified.json()["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_question_etag_not_found_api(client: AsyncClient, max_queries):
+    """Тест условного запроса несуществующего вопроса"""
+    with max_queries(1):
+        response = await client.get("/api/questions/999", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_questions_etag_api(client: AsyncClient, max_queries):
+    """Тест условного запроса страницы вопросов"""
+    await client.post("/api/questions/", json={"text": "Question 1"})
+
+    response = await client.get("/api/questions/")
+    etag = response.headers["etag"]
+
+    with max_queries(1):
+        not_modified = await client.get("/api/questions/", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    await client.post("/api/questions/", json={"text": "Question 2"})
+    modified = await client.get("/api/questions/", headers={"If-None-Match": etag})
+    assert modified.status_code == 200
+    assert len(modified.json()["items"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_get_questions_sorted_by_answer_count_api(client: AsyncClient, max_queries):
+    """Тест сортировки вопросов по числу ответов"""
+    question_ids = []
+    for i in range(3):
+        response = await client.post("/api/questions/", json={"text": f"Question {i}"})
+        question_ids.append(response.json()["id"])
+    for question_id, answers in zip(question_ids, [1, 3, 0]):
+        for j in range(answers):
+            await client.post(
+                f"/api/questions/{question_id}/answers/",
+                json={"text": f"Answer {j}", "user_id": "user-123"},
+            )
+
+    with max_queries(1):
+        first = await client.get("/api/questions/", params={"sort": "answer_count", "limit": 2})
+    assert first.status_code == 200
+    first_data = first.json()
+    assert [q["answer_count"] for q in first_data["items"]] == [3, 1]
+
+    second = await client.get(
+        "/api/questions/",
+        params={"sort": "answer_count", "limit": 2, "cursor": first_data["next_cursor"]},
+    )
+    assert [q["id"] for q in second.json()["items"]] == [question_ids[2]]
+
+    # Курсор другой сортировки отклоняется
+    foreign = await client.get(
+        "/api/questions/",
+        params={"cursor": first_data["next_cursor"]},
+    )
+    assert foreign.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_questions_sorted_by_last_answer_at_api(client: AsyncClient, max_queries):
+    """Тест ленты активности: только вопросы с ответами"""
+    answered = await client.post("/api/questions/", json={"text": "Answered"})
+    await client.post("/api/questions/", json={"text": "Unanswered"})
+    answered_id = answered.json()["id"]
+    await client.post(
+        f"/api/questions/{answered_id}/answers/",
+        json={"text": "Answer", "user_id": "user-123"},
+    )
+
+    with max_queries(1):
+        response = await client.get("/api/questions/", params={"sort": "last_answer_at"})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [q["id"] for q in items] == [answered_id]
+    assert items[0]["last_answer_at"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_questions_invalid_sort_api(client: AsyncClient, max_queries):
+    """Тест валидации параметра сортировки"""
+    with max_queries(0):
+        response = await client.get("/api/questions/", params={"sort": "text"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_questions_batch_api(client: AsyncClient, max_queries):
+    """Тест получения нескольких вопросов одним запросом"""
+    ids = [
+        (await client.post("/api/questions/", json={"text": f"Question {i}"})).json()["id"]
+        for i in range(3)
+    ]
+
+    with max_queries(1):
+        response = await client.get(
+            "/api/questions/batch",
+            params={"ids": f"{ids[2]},999,{ids[0]},{ids[2]}"},
+        )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [q["id"] for q in data["items"]] == [ids[2], ids[0]]
+    assert data["items"][0]["answers"] is None
+    assert data["missing"] == [999]
+    assert response.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_get_questions_batch_preview_api(client: AsyncClient, max_queries):
+    """Тест превью ответов в пакетном получении вопросов"""
+    first = (await client.post("/api/questions/", json={"text": "Question 1"})).json()
+    second = (await client.post("/api/questions/", json={"text": "Question 2"})).json()
+    for i in range(3):
+        await client.post(
+            f"/api/questions/{first['id']}/answers/",
+            json={"text": f"Answer {i}", "user_id": "user-123"},
+        )
+
+    with max_queries(2):
+        response = await client.get(
+            "/api/questions/batch",
+            params=[("ids", first["id"]), ("ids", second["id"]), ("preview", 2)],
+        )
+
+    assert response.status_code == 200
+    first_item, second_item = response.json()["items"]
+    assert [a["text"] for a in first_item["answers"]] == ["Answer 0", "Answer 1"]
+    assert first_item["next_answers_cursor"] is not None
+    assert second_item["answers"] == []
+    assert second_item["next_answers_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_questions_batch_etag_api(client: AsyncClient, max_queries):
+    """Тест: ETag пакета меняется вместе с версией любого вопроса"""
+    question = (await client.post("/api/questions/", json={"text": "Question 1"})).json()
+    params = {"ids": str(question["id"])}
+    etag = (await client.get("/api/questions/batch", params=params)).headers["ETag"]
+
+    with max_queries(1):
+        response = await client.get(
+            "/api/questions/batch",
+            params=params,
+            headers={"If-None-Match": etag},
+        )
+    assert response.status_code == 304
+
+    await client.post(
+        f"/api/questions/{question['id']}/answers/",
+        json={"text": "Answer", "user_id": "user-123"},
+    )
+    with max_queries(1):
+        response = await client.get(
+            "/api/questions/batch",
+            params=params,
+            headers={"If-None-Match": etag},
+        )
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_questions_batch_validation_api(client: AsyncClient, max_queries, monkeypatch):
+    """Тест проверки списка id пакетного запроса"""
+    monkeypatch.setattr(settings.bulk, "max_get_ids", 2)
+
+    with max_queries(0):
+        not_numbers = await client.get("/api/questions/batch", params={"ids": "1,abc"})
+        too_many = await client.get("/api/questions/batch", params={"ids": "1,2,3"})
+        no_ids = await client.get("/api/questions/batch")
+
+    assert not_numbers.status_code == 422
+    assert too_many.status_code == 422
+    assert no_ids.status_code == 422
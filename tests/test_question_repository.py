@@ -14,6 +14,21 @@ async def test_create_question(db_session):
     assert question.created_at is not None
 
 
+@pytest.mark.asyncio
+async def test_create_many_questions(db_session):
+    """Тест пакетного создания вопросов"""
+    repository = QuestionRepository(session=db_session)
+
+    questions = await repository.create_many(
+        [{"text": f"Question {i}"} for i in range(3)]
+    )
+
+    assert [q.text for q in questions] == ["Question 0", "Question 1", "Question 2"]
+    assert all(q.id is not None for q in questions)
+    assert all(q.created_at is not None for q in questions)
+    assert await repository.create_many([]) == []
+
+
 @pytest.mark.asyncio
 async def test_get_question(db_session):
     """Тест получения вопроса по ID"""
@@ -41,6 +56,17 @@ async def test_get_question_not_found(db_session):
     assert question is None
 
 
+@pytest.mark.asyncio
+async def test_question_exists(db_session):
+    """Тест проверки существования вопроса"""
+    repository = QuestionRepository(session=db_session)
+
+    question = await repository.create({"text": "What is Python?"})
+
+    assert await repository.exists(q_id=question.id) is True
+    assert await repository.exists(q_id=999) is False
+
+
 @pytest.mark.asyncio
 async def test_get_all_questions(db_session):
     """Тест получения всех вопросов"""
@@ -59,6 +85,28 @@ async def test_get_all_questions(db_session):
     assert question2.id in question_ids
 
 
+@pytest.mark.asyncio
+async def test_get_questions_page(db_session):
+    """Тест keyset-пагинации вопросов"""
+    repository = QuestionRepository(session=db_session)
+
+    questions = [
+        await repository.create({"text": f"Question {i}"}) for i in range(3)
+    ]
+
+    first_page = await repository.get_page(limit=2)
+    assert [q.id for q in first_page.items] == [questions[0].id, questions[1].id]
+    assert first_page.prev_cursor is None
+
+    second_page = await repository.get_page(limit=2, cursor=first_page.next_cursor)
+    assert [q.id for q in second_page.items] == [questions[2].id]
+    assert second_page.next_cursor is None
+
+    back_page = await repository.get_page(limit=2, cursor=second_page.prev_cursor)
+    assert [q.id for q in back_page.items] == [questions[0].id, questions[1].id]
+    assert back_page.prev_cursor is None
+
+
 @pytest.mark.asyncio
 async def test_delete_question(db_session):
     """Тест удаления вопроса"""
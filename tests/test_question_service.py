@@ -1,5 +1,6 @@
 import pytest
 from fastapi import HTTPException
+from core.cache import question_cache
 from core.services.question_service import QuestionService
 from core.schemas.question_schema import CreateQuestionSchema
 
@@ -56,10 +57,10 @@ async def test_get_all_questions_service(db_session):
     question2 = await service.create_question(CreateQuestionSchema(text="Question 2"))
     
     # Получаем все вопросы
-    questions = await service.get_questions()
+    questions = await service.get_questions(limit=10)
     
-    assert len(questions) >= 2
-    question_ids = [q.id for q in questions]
+    assert len(questions.items) >= 2
+    question_ids = [q.id for q in questions.items]
     assert question1.id in question_ids
     assert question2.id in question_ids
 
@@ -84,3 +85,22 @@ async def test_delete_question_service(db_session):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_get_question_cached_service(db_session, monkeypatch):
+    """Тест повторного получения вопроса из кэша без запроса в БД"""
+    service = QuestionService(session=db_session)
+    question = await service.create_question(CreateQuestionSchema(text="What is Python?"))
+
+    first = await service.get_question(question_id=question.id)
+    hits = question_cache.local.hits
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("database must not be queried")
+
+    monkeypatch.setattr(service.question_repository, "get", fail)
+    second = await service.get_question(question_id=question.id)
+
+    assert second == first
+    assert question_cache.local.hits == hits + 1
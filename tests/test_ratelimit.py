@@ -0,0 +1,253 @@
+import asyncio
+import os
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient
+
+from core.cache.resp import RespClient
+from core.config import AdmissionConfig, RateLimitConfig
+from core.pool import PoolWaitStats
+from core.ratelimit import (
+    AdmissionController,
+    BucketStoreError,
+    RateLimiter,
+    RateLimitMiddleware,
+    RedisBuckets,
+    take_tokens,
+)
+
+
+def fake_engine(wait_stats: PoolWaitStats) -> SimpleNamespace:
+    return SimpleNamespace(pool=SimpleNamespace(wait_stats=wait_stats))
+
+
+def limited_app(
+    limiter: RateLimiter = RateLimiter(RateLimitConfig(enabled=False)),
+    admission: AdmissionController = AdmissionController(
+        AdmissionConfig(enabled=False), engines=[]
+    ),
+    key_header: str | None = None,
+) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    def health():
+        return {}
+
+    @app.api_route("/items", methods=["GET", "POST"])
+    def items():
+        return {}
+
+    async def chunks(entered: asyncio.Event, release: asyncio.Event):
+        yield b"first\n"
+        entered.set()
+        await release.wait()
+        yield b"last\n"
+
+    @app.get("/stream/{media_type}")
+    def stream(media_type: str):
+        return StreamingResponse(
+            chunks(app.state.entered, app.state.release),
+            media_type={"sse": "text/event-stream", "ndjson": "application/x-ndjson"}[
+                media_type
+            ],
+        )
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=limiter,
+        admission=admission,
+        exempt_paths=["/health"],
+        key_header=key_header,
+    )
+    return app
+
+
+def test_take_tokens_refills_up_to_capacity():
+    """Тест шага token bucket: всплеск до capacity, затем пополнение по rate"""
+    tokens, wait = take_tokens(tokens=1.0, updated=0.0, now=0.0, rate=2.0, capacity=5.0)
+    assert (tokens, wait) == (0.0, 0.0)
+
+    tokens, wait = take_tokens(tokens=0.0, updated=0.0, now=0.0, rate=2.0, capacity=5.0)
+    assert (tokens, wait) == (0.0, 0.5)
+
+    tokens, wait = take_tokens(tokens=0.0, updated=0.0, now=100.0, rate=2.0, capacity=5.0)
+    assert (tokens, wait) == (4.0, 0.0)
+
+
+@pytest.mark.asyncio
+async def test_redis_buckets_shared_between_clients(redis_server):
+    """Тест: бакет в Redis общий для воркеров с разными соединениями"""
+    first = RedisBuckets(RespClient(url=redis_server.url, timeout=1))
+    second = RedisBuckets(RespClient(url=redis_server.url, timeout=1))
+
+    waits = [
+        await store.take("ratelimit:k", rate=1.0, capacity=2, ttl=2.0)
+        for store in (first, second, first)
+    ]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0 < waits[2] <= 1.0
+    assert redis_server.commands.count(b"EVAL") == 3
+    await first.client.close()
+    await second.client.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif("TEST_REDIS_URL" not in os.environ, reason="TEST_REDIS_URL is not set")
+async def test_token_bucket_script_on_real_redis():
+    """Тест Lua-скрипта token bucket на настоящем Redis"""
+    store = RedisBuckets(RespClient(url=os.environ["TEST_REDIS_URL"], timeout=1))
+    key = f"ratelimit:test:{uuid.uuid4()}"
+
+    waits = [await store.take(key, rate=1.0, capacity=2, ttl=2.0) for _ in range(3)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0 < waits[2] <= 1.0
+    await store.client.close()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_separates_read_and_write_budgets():
+    """Тест: записи расходуют свой бюджет и не отнимают чтения"""
+    limiter = RateLimiter(
+        RateLimitConfig(read_rate=1.0, read_burst=3, write_rate=1.0, write_burst=1)
+    )
+
+    assert await limiter.check("ip:1", "POST") == 0
+    assert await limiter.check("ip:1", "DELETE") > 0
+    assert [await limiter.check("ip:1", "GET") for _ in range(3)] == [0, 0, 0]
+    # Другой клиент — свой бюджет
+    assert await limiter.check("ip:2", "POST") == 0
+
+    stats = dict((labels.get("budget"), values) for labels, values in limiter.stats())
+    assert stats["read"] == {"allowed": 3, "limited": 0}
+    assert stats["write"] == {"allowed": 2, "limited": 1}
+    assert stats[None]["keys"] == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_falls_back_to_local_buckets():
+    """Тест: при недоступном общем хранилище бакеты считаются в памяти"""
+
+    class BrokenStore:
+        async def take(self, *args, **kwargs):
+            raise BucketStoreError("connection refused")
+
+    limiter = RateLimiter(
+        RateLimitConfig(write_rate=1.0, write_burst=1),
+        store=BrokenStore(),
+    )
+
+    assert await limiter.check("ip:1", "POST") == 0
+    assert await limiter.check("ip:1", "POST") > 0
+    assert limiter.backend_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_429_with_retry_after():
+    """Тест: сверх бюджета клиент получает 429 с Retry-After, служебные пути не считаются"""
+    limiter = RateLimiter(RateLimitConfig(write_rate=0.5, write_burst=1))
+    app = limited_app(limiter=limiter)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.post("/items")).status_code == 200
+        response = await client.post("/items")
+        assert (await client.get("/items")).status_code == 200
+        for _ in range(5):
+            assert (await client.get("/health")).status_code == 200
+
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Too many requests"}
+    assert response.headers["Retry-After"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_middleware_keys_clients_by_header():
+    """Тест: с key_header у каждого ключа свой бюджет"""
+    limiter = RateLimiter(RateLimitConfig(write_rate=1.0, write_burst=1))
+    app = limited_app(limiter=limiter, key_header="X-API-Key")
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        first = await client.post("/items", headers={"X-API-Key": "a"})
+        second = await client.post("/items", headers={"X-API-Key": "b"})
+        third = await client.post("/items", headers={"X-API-Key": "a"})
+
+    assert [first.status_code, second.status_code, third.status_code] == [200, 200, 429]
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_when_too_many_in_flight():
+    """Тест: сверх max_in_flight запросы получают 503, слот освобождается с ответом"""
+    admission = AdmissionController(
+        AdmissionConfig(max_in_flight=1, retry_after=3),
+        engines=[],
+    )
+    app = limited_app(admission=admission)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        assert (await client.get("/items")).status_code == 200
+        assert admission.in_flight == 0
+
+        admission.in_flight = 1
+        response = await client.get("/items")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert admission.stats()["shed_in_flight"] == 1
+    assert admission.stats()["admitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_admission_holds_slot_for_ndjson_but_not_sse():
+    """Тест: выгрузка держит слот до конца тела, поток SSE — только до начала ответа"""
+    admission = AdmissionController(AdmissionConfig(max_in_flight=10), engines=[])
+    app = limited_app(admission=admission)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        for media_type, in_flight in (("ndjson", 1), ("sse", 0)):
+            app.state.entered = asyncio.Event()
+            app.state.release = asyncio.Event()
+            request = asyncio.create_task(client.get(f"/stream/{media_type}"))
+            await app.state.entered.wait()
+
+            assert admission.in_flight == in_flight
+            app.state.release.set()
+            assert (await request).status_code == 200
+            assert admission.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_while_pool_wait_is_high(clock):
+    """Тест: 503, пока недавнее ожидание пула выше порога; после затухания — снова 200"""
+    wait_stats = PoolWaitStats(clock=clock)
+    wait_stats.record_timeout(2.0)
+    admission = AdmissionController(
+        AdmissionConfig(max_pool_wait=0.5),
+        engines=[fake_engine(wait_stats)],
+    )
+    app = limited_app(admission=admission)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        shed = await client.get("/items")
+        clock.now += 3 * PoolWaitStats.half_life
+        admitted = await client.get("/items")
+
+    assert shed.status_code == 503
+    assert admitted.status_code == 200
+    assert admission.stats()["shed_pool_wait"] == 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_rate_limit_counters(client: AsyncClient):
+    """Тест: /metrics показывает счётчики лимитов и admission control"""
+    response = await client.get("/metrics")
+
+    assert 'qa_rate_limit_allowed{budget="read"}' in response.text
+    assert "qa_rate_limit_backend_errors" in response.text
+    assert "qa_admission_in_flight" in response.text
+    assert "qa_admission_shed_pool_wait" in response.text
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import Request
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from core import database
+from core.cache import question_cache
+from core.database import ReplicaRouter, create_engine
+from core.models.base import Base
+from core.repositories.question_repository import QuestionRepository
+from core.schemas.question_schema import QuestionSchemaWithAnswers
+from main import app
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path):
+    primary = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    yield primary, replica
+
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.fixture
+def router(engines, monkeypatch) -> ReplicaRouter:
+    primary, replica = engines
+    router = ReplicaRouter(primary=primary, replicas=[replica], health_interval=1)
+    monkeypatch.setattr(database, "replica_router", router)
+    monkeypatch.setattr(
+        database,
+        "async_session",
+        async_sessionmaker(bind=primary, expire_on_commit=False),
+    )
+    return router
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(router, engines):
+    """Тест чтения с реплики и записи в primary"""
+    primary, replica = engines
+
+    async with AsyncClient(app=app, base_url="http://test") as writer:
+        response = await writer.post("/api/questions/", json={"text": "What is Python?"})
+        question_id = response.json()["id"]
+
+    # Клиент без cookie читает с реплики, где вопроса еще нет
+    async with AsyncClient(app=app, base_url="http://test") as reader:
+        response = await reader.get("/api/questions/batch", params={"ids": question_id})
+        assert response.json()["missing"] == [question_id]
+
+        async with async_sessionmaker(bind=replica)() as session:
+            await QuestionRepository(session=session).create({"text": "What is Python?"})
+
+        response = await reader.get("/api/questions/batch", params={"ids": question_id})
+        assert response.json()["missing"] == []
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_after_post(router):
+    """Тест чтения с primary сразу после записи тем же клиентом"""
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.post("/api/questions/", json={"text": "What is Python?"})
+        question_id = response.json()["id"]
+        assert database.PRIMARY_PIN_COOKIE in response.cookies
+
+        response = await client.get(f"/api/questions/{question_id}")
+        assert response.status_code == 200
+
+
+def pin_request(value: str) -> Request:
+    cookie = f"{database.PRIMARY_PIN_COOKIE}={value}".encode()
+    return Request({"type": "http", "headers": [(b"cookie", cookie)]})
+
+
+@pytest.mark.parametrize(
+    "value, pinned",
+    [
+        (lambda now: str(now + 1), True),
+        (lambda now: str(now - 1), False),
+        (lambda now: "1e18", False),
+        (lambda now: "inf", False),
+        (lambda now: "nan", False),
+        (lambda now: "soon", False),
+    ],
+)
+def test_primary_pin_cookie_is_bounded(router, value, pinned):
+    """Тест: cookie закрепления действует не дольше read_your_writes_seconds"""
+    assert database.is_primary_pinned(pin_request(value(time.time()))) is pinned
+
+
+def test_primary_pin_cookie_ignored_without_replicas(router, monkeypatch):
+    """Тест: без реплик cookie закрепления не действует"""
+    monkeypatch.setattr(router, "replicas", [])
+    assert database.is_primary_pinned(pin_request(str(time.time() + 1))) is False
+
+
+@pytest.mark.asyncio
+async def test_cache_filled_from_primary_with_replicas(router, engines):
+    """Тест: с репликами кэш работает, но промах читается с primary, а не с отстающей реплики"""
+    primary, replica = engines
+
+    async with AsyncClient(app=app, base_url="http://test") as writer:
+        response = await writer.post("/api/questions/", json={"text": "Fresh"})
+        question_id = response.json()["id"]
+    # Реплика отстаёт: у неё старая версия вопроса
+    async with async_sessionmaker(bind=replica)() as session:
+        await QuestionRepository(session=session).create({"text": "Stale"})
+
+    before = question_cache.stats()
+    async with AsyncClient(app=app, base_url="http://test") as reader:
+        texts = [
+            (await reader.get(f"/api/questions/{question_id}")).json()["text"]
+            for _ in range(5)
+        ]
+
+    assert texts == ["Fresh"] * 5
+    stats = question_cache.stats()
+    assert [
+        stats[name] - before[name] for name in ("hits", "misses", "remote_misses")
+    ] == [4, 1, 1]
+
+
+@pytest.mark.asyncio
+async def test_pinned_client_reads_shared_cache_not_local(router):
+    """Тест: только что писавший клиент читает общий кэш, минуя локальные копии"""
+    async with AsyncClient(app=app, base_url="http://test") as writer:
+        response = await writer.post("/api/questions/", json={"text": "Fresh"})
+        question_id = response.json()["id"]
+        fresh = (await writer.get(f"/api/questions/{question_id}")).json()
+        # Локальная копия, ещё не сброшенная по pub/sub
+        question_cache.local.set(
+            question_id,
+            QuestionSchemaWithAnswers(**{**fresh, "text": "Stale"}),
+        )
+        remote_hits = question_cache.remote_hits
+
+        response = await writer.get(f"/api/questions/{question_id}")
+
+    assert response.json()["text"] == "Fresh"
+    assert question_cache.remote_hits == remote_hits + 1
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_replica_falls_back_to_primary(engines, tmp_path):
+    """Тест исключения недоступной реплики из ротации"""
+    primary, replica = engines
+    broken = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    router = ReplicaRouter(primary=primary, replicas=[broken], health_interval=1)
+
+    await router.check_health()
+
+    assert router.healthy_replicas == []
+    assert router.choose() is primary
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_round_robin_between_replicas(engines, tmp_path):
+    """Тест равномерного распределения чтений между репликами"""
+    primary, replica = engines
+    second = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'second.db'}")
+    router = ReplicaRouter(primary=primary, replicas=[replica, second], health_interval=1)
+
+    await router.check_health()
+
+    chosen = [router.choose() for _ in range(4)]
+    assert chosen == [replica, second, replica, second]
+    await second.dispose()
+
+
+@pytest.mark.asyncio
+async def test_hung_replica_does_not_stall_health_check(engines):
+    """Тест: зависшая реплика исключается по таймауту, остальные проверяются"""
+    primary, replica = engines
+
+    @asynccontextmanager
+    async def connect():
+        await asyncio.Event().wait()
+        yield
+
+    hung = SimpleNamespace(url="sqlite+aiosqlite:///hung.db", connect=connect)
+    router = ReplicaRouter(
+        primary=primary,
+        replicas=[hung, replica],
+        health_interval=1,
+        health_timeout=0.05,
+    )
+
+    await asyncio.wait_for(router.check_health(), timeout=1)
+
+    assert router.healthy_replicas == [replica]
@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import update
+
+from core.models.question import Question
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+from reconcile import reconcile_question_counters
+
+
+@pytest.mark.asyncio
+async def test_reconcile_question_counters(db_session, session_factory):
+    """Тест исправления разошедшихся счётчиков ответов"""
+    question_repo = QuestionRepository(session=db_session)
+    answer_repo = AnswerRepository(session=db_session)
+    questions = await question_repo.create_many(
+        [{"text": f"Question {i}"} for i in range(3)]
+    )
+    answers = await answer_repo.create_many([
+        {"question_id": questions[0].id, "user_id": "user-123", "text": "Answer"},
+        {"question_id": questions[1].id, "user_id": "user-123", "text": "Answer"},
+    ])
+
+    # Ломаем счётчики в обход репозитория
+    await db_session.execute(
+        update(Question)
+        .where(Question.id.in_([questions[0].id, questions[2].id]))
+        .values(answer_count=7, last_answer_at=None)
+    )
+    await db_session.commit()
+
+    fixed_ids = await reconcile_question_counters(session_factory, batch_size=2)
+
+    assert fixed_ids == [questions[0].id, questions[2].id]
+    for question, count, last_answer_at in [
+        (questions[0], 1, answers[0].created_at),
+        (questions[1], 1, answers[1].created_at),
+        (questions[2], 0, None),
+    ]:
+        await db_session.refresh(question)
+        assert question.answer_count == count
+        assert question.last_answer_at == last_answer_at
+
+    assert await reconcile_question_counters(session_factory, batch_size=2) == []
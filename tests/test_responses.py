@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi import Response
+
+from api.responses import PydanticJSONResponse, json_response
+from core.schemas.answer_schema import AnswerSchema
+from core.schemas.page_schema import Page
+
+
+def make_page() -> Page[AnswerSchema]:
+    return Page[AnswerSchema](
+        items=[
+            AnswerSchema(
+                id=1,
+                question_id=2,
+                user_id="user-123",
+                text="Ответ",
+                created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            )
+        ],
+        next_cursor="abc",
+    )
+
+
+def test_pydantic_json_response_matches_model_dump():
+    """Тест: ответ совпадает с model_dump в режиме JSON"""
+    page = make_page()
+
+    response = PydanticJSONResponse(page)
+
+    assert json.loads(response.body) == page.model_dump(mode="json")
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["content-length"] == str(len(response.body))
+
+
+def test_json_response_keeps_dependency_headers():
+    """Тест переноса заголовков и кук, выставленных на Response зависимостями"""
+    sub_response = Response()
+    sub_response.headers["ETag"] = 'W/"abc"'
+    sub_response.set_cookie("pin", "1")
+
+    response = json_response(make_page(), sub_response, status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["etag"] == 'W/"abc"'
+    assert "pin=1" in response.headers["set-cookie"]
+    assert response.headers.getlist("content-length") == [str(len(response.body))]
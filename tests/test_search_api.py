@@ -0,0 +1,150 @@
+import pytest
+from httpx import AsyncClient
+
+from core.config import settings
+
+
+async def create_question(client: AsyncClient, text: str, answers: list[str]) -> int:
+    response = await client.post("/api/questions/", json={"text": text})
+    question_id = response.json()["id"]
+    for answer in answers:
+        await client.post(
+            f"/api/questions/{question_id}/answers/",
+            json={"text": answer, "user_id": "user-123"},
+        )
+    return question_id
+
+
+@pytest.mark.asyncio
+async def test_search_questions_and_answers_api(client: AsyncClient, max_queries):
+    """Тест поиска по тексту вопросов и ответов"""
+    python_id = await create_question(
+        client,
+        "What is Python?",
+        ["Python is a programming language", "A snake"],
+    )
+    await create_question(client, "What is Rust?", ["A systems language"])
+
+    with max_queries(1):
+        response = await client.get("/api/search", params={"q": "python"})
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert {(item["kind"], item["question_id"]) for item in items} == {
+        ("question", python_id),
+        ("answer", python_id),
+    }
+    ranks = [item["rank"] for item in items]
+    assert ranks == sorted(ranks, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_search_ranking_api(client: AsyncClient, max_queries):
+    """Тест ранжирования: больше совпадений — выше в выдаче"""
+    await create_question(client, "Language of choice", [])
+    frequent_id = await create_question(
+        client,
+        "Language after language after language",
+        [],
+    )
+
+    with max_queries(1):
+        response = await client.get("/api/search", params={"q": "language"})
+
+    items = response.json()["items"]
+    assert len(items) == 2
+    assert items[0]["id"] == frequent_id
+
+
+@pytest.mark.asyncio
+async def test_search_pagination_api(client: AsyncClient, max_queries):
+    """Тест keyset-пагинации результатов поиска"""
+    await create_question(
+        client,
+        "Common question",
+        [f"Common answer {i}" for i in range(4)],
+    )
+
+    with max_queries(1):
+        first = await client.get("/api/search", params={"q": "common", "limit": 3})
+    first_data = first.json()
+    assert len(first_data["items"]) == 3
+    assert first_data["next_cursor"] is not None
+
+    second = await client.get(
+        "/api/search",
+        params={"q": "common", "limit": 3, "cursor": first_data["next_cursor"]},
+    )
+    second_data = second.json()
+    assert len(second_data["items"]) == 2
+    assert second_data["next_cursor"] is None
+
+    seen = [
+        (item["kind"], item["id"])
+        for item in first_data["items"] + second_data["items"]
+    ]
+    assert len(set(seen)) == 5
+
+    back = await client.get(
+        "/api/search",
+        params={"q": "common", "limit": 3, "cursor": second_data["prev_cursor"]},
+    )
+    assert back.json()["items"] == first_data["items"]
+
+
+@pytest.mark.asyncio
+async def test_search_deleted_rows_api(client: AsyncClient, max_queries):
+    """Тест: удалённые вопросы и ответы не находятся"""
+    question_id = await create_question(client, "Temporary question", ["Temporary answer"])
+
+    await client.delete(f"/api/questions/{question_id}")
+    with max_queries(1):
+        response = await client.get("/api/search", params={"q": "temporary"})
+
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_query_syntax_is_escaped_api(client: AsyncClient, max_queries):
+    """Тест: спецсимволы запроса не ломают поиск"""
+    await create_question(client, "What is Python?", [])
+
+    response = await client.get("/api/search", params={"q": 'python" (*'})
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
+
+    with max_queries(0):
+        empty = await client.get("/api/search", params={"q": "?!"})
+    assert empty.status_code == 200
+    assert empty.json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_search_invalid_cursor_api(client: AsyncClient, max_queries):
+    """Тест некорректного курсора поиска"""
+    with max_queries(0):
+        response = await client.get(
+            "/api/search",
+            params={"q": "python", "cursor": "not-a-cursor"},
+        )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_only_newest_candidates_api(
+    client: AsyncClient,
+    max_queries,
+    monkeypatch,
+):
+    """Тест: ранжируются не больше max_candidates самых новых совпадений каждого вида"""
+    monkeypatch.setattr(settings.search, "max_candidates", 2)
+    await create_question(client, "Language after language after language", [])
+    newer_ids = [
+        await create_question(client, f"Language number {n}", []) for n in range(2)
+    ]
+
+    with max_queries(1):
+        response = await client.get("/api/search", params={"q": "language"})
+
+    assert {item["id"] for item in response.json()["items"]} == set(newer_ids)
@@ -0,0 +1,156 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from core.config import settings
+from core.pubsub import (
+    RESYNC,
+    Event,
+    MemoryBroker,
+    PostgresBroker,
+    broker,
+    question_channel,
+)
+from core.services.stream_service import StreamService, encode_sse
+from core.tasks import TaskWorker
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(
+            line.split(": ", 1) for line in block.splitlines() if not line.startswith(":")
+        )
+        if "event" in fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_memory_broker_fans_out_to_channel_subscribers():
+    """Тест: событие получают все подписчики канала и только они"""
+    memory_broker = MemoryBroker(queue_size=10, max_connections=10)
+
+    async with memory_broker.subscribe("question:1") as first, \
+            memory_broker.subscribe("question:1") as second, \
+            memory_broker.subscribe("question:2") as other:
+        assert memory_broker.stats()["connections"] == 3
+        await memory_broker.publish("question:1", Event("answer_created", id=5))
+
+        assert (await first.get()).id == 5
+        assert (await second.get()).id == 5
+        assert other.queue.empty()
+
+    stats = memory_broker.stats()
+    assert stats["connections"] == 0
+    assert stats["connections_total"] == 3
+    assert stats["channels"] == 0
+    assert stats["delivered"] == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_resync_instead_of_unbounded_queue():
+    """Тест: переполненная очередь соединения заменяется одним resync"""
+    memory_broker = MemoryBroker(queue_size=3, max_connections=10)
+
+    async with memory_broker.subscribe("question:1") as subscription:
+        for answer_id in range(5):
+            await memory_broker.publish("question:1", Event("answer_created", id=answer_id))
+
+        assert subscription.queue.qsize() == 2
+        assert await subscription.get() == RESYNC
+        assert (await subscription.get()).id == 4
+        assert memory_broker.stats()["overflows"] == 1
+
+
+def test_broker_admits_up_to_max_connections():
+    """Тест: сверх лимита соединения не принимаются и считаются"""
+    memory_broker = MemoryBroker(queue_size=1, max_connections=0)
+
+    assert not memory_broker.admit()
+    assert memory_broker.stats()["rejected_connections"] == 1
+
+
+def test_postgres_broker_payload_roundtrip():
+    """Тест: события проходят через payload NOTIFY, слишком большие — как resync"""
+    postgres_broker = PostgresBroker(
+        engine=None,
+        channel="qa_events",
+        queue_size=10,
+        max_connections=10,
+    )
+    subscription_queue = []
+    postgres_broker.deliver = lambda channel, events: subscription_queue.append(
+        (channel, events)
+    )
+
+    event = Event("answer_created", id=1, data=b'{"id":1}')
+    postgres_broker.handle(postgres_broker.encode("question:7", (event,)))
+    huge = Event("answer_created", id=2, data=b'"' + b"x" * 10_000 + b'"')
+    postgres_broker.handle(postgres_broker.encode("question:7", (huge,)))
+
+    assert subscription_queue == [("question:7", [event]), ("question:7", [RESYNC])]
+
+
+def test_encode_sse():
+    """Тест формата события text/event-stream"""
+    assert encode_sse(Event("answer_created", id=3, data=b'{"id":3}')) == (
+        b'event: answer_created\nid: 3\ndata: {"id":3}\n\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_heartbeats():
+    """Тест: без событий поток шлёт комментарии-пинги"""
+    memory_broker = MemoryBroker(queue_size=10, max_connections=10)
+    events = StreamService(event_broker=memory_broker, heartbeat=0.01).question_events(1)
+
+    assert b"event: ready" in await anext(events)
+    assert await anext(events) == b": ping\n\n"
+    await events.aclose()
+    assert memory_broker.stats()["connections"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_question_not_found(client: AsyncClient):
+    """Тест потока для несуществующего вопроса"""
+    response = await client.get("/api/questions/999/stream")
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_question_pushes_answer_events(client: AsyncClient, session_factory):
+    """Тест: создание и удаление ответов приходят в поток, удаление вопроса его закрывает"""
+    question = (await client.post("/api/questions/", json={"text": "What is Python?"})).json()
+    channel = question_channel(question["id"])
+
+    stream = asyncio.create_task(client.get(f"/api/questions/{question['id']}/stream"))
+    while not broker.has_subscribers(channel):
+        await asyncio.sleep(0)
+
+    answer = (
+        await client.post(
+            f"/api/questions/{question['id']}/answers/",
+            json={"text": "A language", "user_id": "user-1"},
+        )
+    ).json()
+    # События уходят в поток через outbox
+    worker = TaskWorker(session_factory, settings.tasks)
+    await worker.run_once()
+    await client.delete(f"/api/answers/{answer['id']}")
+    await client.delete(f"/api/questions/{question['id']}")
+    await worker.run_once()
+    response = await asyncio.wait_for(stream, timeout=5)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert parse_sse(response.text) == [
+        ("ready", {}),
+        ("answer_created", answer),
+        ("answer_deleted", {"id": answer["id"], "question_id": question["id"]}),
+        ("question_deleted", {"id": question["id"]}),
+    ]
+    assert not broker.has_subscribers(channel)
@@ -0,0 +1,194 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from core.config import TasksConfig
+from core.models.task import OutboxTask
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+from core.repositories.task_repository import TaskRepository
+from core.tasks import TaskWorker, backoff
+
+
+async def add_tasks(db_session, kind: str, tasks: list[tuple[str | None, dict]]) -> None:
+    await TaskRepository(session=db_session).add(kind, tasks)
+    await db_session.commit()
+
+
+async def outbox(db_session) -> list[OutboxTask]:
+    db_session.expire_all()
+    result = await db_session.execute(select(OutboxTask).order_by(OutboxTask.id))
+    return list(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_outbox_task_written_in_write_transaction(db_session):
+    """Тест: задача появляется вместе с ответом и откатывается вместе с ним"""
+    question = await QuestionRepository(session=db_session).create({"text": "What is Python?"})
+    answer_repo = AnswerRepository(session=db_session)
+
+    answer = await answer_repo.create(
+        {"question_id": question.id, "user_id": "user-123", "text": "Answer"}
+    )
+    question_id, answer_id = question.id, answer.id
+    with pytest.raises(IntegrityError):
+        await answer_repo.create({"question_id": 999, "user_id": "user-123", "text": "Answer"})
+
+    (task,) = await outbox(db_session)
+    assert (task.kind, task.key, task.payload) == (
+        "answer_created",
+        f"question:{question_id}",
+        {"id": answer_id},
+    )
+
+
+def test_backoff_grows_exponentially_up_to_max():
+    """Тест паузы перед повтором"""
+    assert [backoff(attempt, 1.0, 5.0) for attempt in range(1, 6)] == [1, 2, 4, 5, 5]
+
+
+@pytest.mark.asyncio
+async def test_failed_task_retried_then_dead(db_session, session_factory):
+    """Тест: упавшая задача повторяется и после max_attempts остаётся мёртвой"""
+    calls = []
+
+    async def handler(session, payload):
+        calls.append(payload)
+        raise RuntimeError("boom")
+
+    await add_tasks(db_session, "flaky", [(None, {"n": 1})])
+    worker = TaskWorker(
+        session_factory,
+        TasksConfig(max_attempts=2, backoff_base=0.0),
+        handlers={"flaky": handler},
+    )
+
+    assert await worker.run_once() == 0
+
+    assert len(calls) == 2
+    (task,) = await outbox(db_session)
+    assert task.attempts == 2
+    assert task.dead_at is not None
+    assert "boom" in task.last_error
+    assert worker.stats()["failed"] == 2
+    assert worker.stats()["dead"] == 1
+    # Мёртвая задача в очередь не возвращается
+    assert await worker.run_once() == 0
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_tasks_with_same_key_keep_order_across_retries(db_session, session_factory):
+    """Тест: задачи одного ключа не обгоняют упавшую, остальные выполняются"""
+    done = []
+    failed_once = set()
+
+    async def handler(session, payload):
+        if payload["n"] == 1 and 1 not in failed_once:
+            failed_once.add(1)
+            raise RuntimeError("retry me")
+        done.append(payload["n"])
+
+    await add_tasks(
+        db_session,
+        "ordered",
+        [("question:1", {"n": 1}), ("question:1", {"n": 2}), ("question:2", {"n": 3})],
+    )
+    worker = TaskWorker(
+        session_factory,
+        TasksConfig(backoff_base=0.0),
+        handlers={"ordered": handler},
+    )
+
+    assert await worker.run_once() == 3
+
+    assert done == [3, 1, 2]
+    assert await outbox(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_takes_only_oldest_task_per_key(db_session):
+    """Тест: из задач одного ключа в аренду берётся только самая ранняя"""
+    await add_tasks(
+        db_session,
+        "ordered",
+        [("question:1", {"n": 1}), ("question:1", {"n": 2}), (None, {"n": 3})],
+    )
+    repository = TaskRepository(session=db_session)
+    now = datetime.now(timezone.utc)
+    lease_until = now + timedelta(hours=1)
+
+    first = await repository.claim(10, now, lease_until=lease_until)
+    # Первая задача ключа в аренде: вторая не берётся, пока её не удалят
+    assert await repository.claim(10, now, lease_until=lease_until) == []
+    await repository.complete([first[0].id])
+    (second,) = await repository.claim(10, now, lease_until=lease_until)
+
+    assert [task.payload["n"] for task in first] == [1, 3]
+    assert second.payload["n"] == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_limits_concurrency(db_session, session_factory):
+    """Тест: одновременно выполняется не больше concurrency задач"""
+    running = 0
+    max_running = 0
+
+    async def handler(session, payload):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await add_tasks(db_session, "slow", [(None, {"n": n}) for n in range(6)])
+    worker = TaskWorker(
+        session_factory,
+        TasksConfig(concurrency=2),
+        handlers={"slow": handler},
+    )
+
+    assert await worker.run_once() == 6
+    assert max_running == 2
+    assert worker.stats()["processed"] == 6
+
+
+@pytest.mark.asyncio
+async def test_leased_task_returns_after_worker_crash(db_session, session_factory):
+    """Тест: задача, взятая упавшим воркером, выполняется после конца аренды"""
+    done = []
+
+    async def handler(session, payload):
+        done.append(payload["n"])
+
+    await add_tasks(db_session, "lease", [(None, {"n": 1})])
+    worker = TaskWorker(session_factory, TasksConfig(), handlers={"lease": handler})
+    repository = TaskRepository(session=db_session)
+    now = datetime.now(timezone.utc)
+
+    # Другой воркер взял задачу и упал
+    assert len(await repository.claim(10, now, lease_until=now + timedelta(hours=1))) == 1
+    assert await worker.run_once() == 0
+    await worker.update_depth()
+    assert worker.stats()["pending"] == 1
+
+    # Аренда истекла
+    await db_session.execute(
+        update(OutboxTask).values(available_at=now - timedelta(seconds=1))
+    )
+    await db_session.commit()
+    assert await worker.run_once() == 1
+    assert done == [1]
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_task_counters(client: AsyncClient):
+    """Тест: /metrics показывает пропускную способность и отставание задач"""
+    response = await client.get("/metrics")
+
+    assert "qa_tasks_processed" in response.text
+    assert "qa_tasks_oldest_pending_seconds" in response.text
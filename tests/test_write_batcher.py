@@ -0,0 +1,137 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from core.batching import AnswerWriteBatcher
+from core.metrics import render_histograms
+from core.repositories.answer_repository import AnswerRepository
+from core.repositories.question_repository import QuestionRepository
+
+
+@pytest.mark.asyncio
+async def test_concurrent_answers_flushed_in_one_batch(db_session, session_factory):
+    """Тест объединения конкурентных вставок ответов в одну пачку"""
+    question = await QuestionRepository(session=db_session).create(
+        {"text": "What is Python?"}
+    )
+    batcher = AnswerWriteBatcher(
+        session_factory=session_factory,
+        window_ms=20,
+        max_size=100,
+    )
+
+    answers = await asyncio.gather(*[
+        batcher.create({
+            "question_id": question.id,
+            "user_id": "user-123",
+            "text": f"Answer {i}",
+        })
+        for i in range(10)
+    ])
+
+    # Каждый запрос получил свою строку
+    assert [answer.text for answer in answers] == [f"Answer {i}" for i in range(10)]
+    assert len({answer.id for answer in answers}) == 10
+    assert batcher.stats.flushes == 1
+    assert batcher.stats.snapshot()["max_batch_size"] == 10
+    lines = render_histograms("batch_size", [({}, batcher.stats.batch_size)])
+    assert 'batch_size_bucket{le="5"} 0' in lines
+    assert 'batch_size_bucket{le="10"} 1' in lines
+    assert 'batch_size_bucket{le="+Inf"} 1' in lines
+    assert "batch_size_sum 10.0" in lines
+    assert "batch_size_count 1" in lines
+
+    answer = await AnswerRepository(session=db_session).get(a_id=answers[0].id)
+    assert answer is not None
+
+
+@pytest.mark.asyncio
+async def test_batch_flushed_when_full(db_session, session_factory):
+    """Тест досрочной записи пачки при достижении максимального размера"""
+    question = await QuestionRepository(session=db_session).create(
+        {"text": "What is Python?"}
+    )
+    batcher = AnswerWriteBatcher(
+        session_factory=session_factory,
+        window_ms=10_000,
+        max_size=3,
+    )
+
+    answers = await asyncio.wait_for(
+        asyncio.gather(*[
+            batcher.create({
+                "question_id": question.id,
+                "user_id": "user-123",
+                "text": f"Answer {i}",
+            })
+            for i in range(3)
+        ]),
+        timeout=5,
+    )
+
+    assert len(answers) == 3
+    assert batcher.stats.flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_error_goes_to_failed_item_only(db_session, session_factory):
+    """Тест передачи ошибки только тому запросу, который её вызвал"""
+    question = await QuestionRepository(session=db_session).create(
+        {"text": "What is Python?"}
+    )
+    batcher = AnswerWriteBatcher(
+        session_factory=session_factory,
+        window_ms=20,
+        max_size=100,
+    )
+
+    results = await asyncio.gather(
+        batcher.create({
+            "question_id": question.id,
+            "user_id": "user-123",
+            "text": "Answer 1",
+        }),
+        batcher.create({
+            "question_id": 999,
+            "user_id": "user-123",
+            "text": "Orphan answer",
+        }),
+        batcher.create({
+            "question_id": question.id,
+            "user_id": "user-123",
+            "text": "Answer 2",
+        }),
+        return_exceptions=True,
+    )
+
+    assert results[0].text == "Answer 1"
+    assert isinstance(results[1], IntegrityError)
+    assert results[2].text == "Answer 2"
+    assert batcher.stats.failed_flushes == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_close_flushes_pending(db_session, session_factory):
+    """Тест записи накопленных ответов при остановке"""
+    question = await QuestionRepository(session=db_session).create(
+        {"text": "What is Python?"}
+    )
+    batcher = AnswerWriteBatcher(
+        session_factory=session_factory,
+        window_ms=10_000,
+        max_size=100,
+    )
+
+    task = asyncio.create_task(
+        batcher.create({
+            "question_id": question.id,
+            "user_id": "user-123",
+            "text": "Answer",
+        })
+    )
+    await asyncio.sleep(0)
+    await batcher.close()
+
+    answer = await asyncio.wait_for(task, timeout=5)
+    assert answer.id is not None
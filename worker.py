@@ -0,0 +1,59 @@
+import argparse
+import asyncio
+import logging
+
+from core.cache import cache_backend
+from core.config import settings
+from core.database import async_session, dispose
+from core.logging import setup_logging
+from core.tasks import TaskWorker
+
+logger = logging.getLogger(__name__)
+
+
+async def report_stats(worker: TaskWorker, interval: float) -> None:
+    # У процесса воркера нет /metrics: пропускная способность и отставание — в лог
+    while True:
+        await asyncio.sleep(interval)
+        await worker.update_depth()
+        logger.info("Task worker stats: %s", worker.stats())
+
+
+async def main(stats_interval: float) -> None:
+    if settings.stream.backend == "memory":
+        logger.warning(
+            "STREAM__BACKEND=memory: stream events from this worker "
+            "will not reach API processes",
+        )
+    worker = TaskWorker(session_factory=async_session, config=settings.tasks)
+    reporter = asyncio.create_task(report_stats(worker, stats_interval))
+    logger.info(
+        "Task worker started, concurrency=%s, batch_size=%s",
+        settings.tasks.concurrency,
+        settings.tasks.batch_size,
+    )
+    try:
+        await worker.run()
+    finally:
+        reporter.cancel()
+        logger.info("Task worker stopped: %s", worker.stats())
+        await cache_backend.close()
+        await dispose()
+
+
+if __name__ == "__main__":
+    setup_logging(settings.logging)
+    parser = argparse.ArgumentParser(
+        description="Выполнение задач из outbox (события потоков и другие побочные эффекты записи)",
+    )
+    parser.add_argument(
+        "--stats-interval",
+        type=float,
+        default=60.0,
+        help="Как часто писать счётчики воркера в лог, секунд",
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(stats_interval=args.stats_interval))
+    except KeyboardInterrupt:
+        pass